@@ -0,0 +1,95 @@
+
+from __future__ import annotations
+from typing import Any, Callable, List
+
+import json
+import ast
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def decode_json(value: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(value)
+
+    return json.loads(value)
+
+def string(value: str) -> str:
+    if value[:1] not in ('"', "'"):
+        return value
+
+    try:
+        # Client sent a quoted string
+        result = ast.literal_eval(value)
+    except (SyntaxError, TypeError, MemoryError, RecursionError) as e:
+        raise ValueError(f'Invalid string: {value[:50]}') from e
+
+    if not isinstance(result, str):
+        raise ValueError(f'Expected a string: {value[:50]}')
+
+    return result
+
+def number(value: str) -> int | float:
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+def JSON(value: str) -> Any:
+    """Consumes the remaining arguments as a single json object"""
+    return decode_json(value)
+
+class ArgumentSchema:
+    """
+    Describes the arguments of a command, as a list of converters (e.g. `int`, `float`, `string`).
+    If the last converter is `JSON`, it will receive the rest of the line.
+    """
+
+    def __init__(self, *converters: Callable[[str], Any]) -> None:
+        self.converters = converters
+        self.has_tail = bool(converters) and converters[-1] is JSON
+
+    def __repr__(self) -> str:
+        return f'<ArgumentSchema ({len(self.converters)})>'
+
+    def parse(self, data: str) -> List[Any]:
+        if not self.converters:
+            if data.strip():
+                raise ValueError('Command does not take any arguments')
+
+            return []
+
+        if self.has_tail:
+            arguments = data.split(maxsplit=len(self.converters) - 1)
+        else:
+            arguments = data.split()
+
+        if len(arguments) != len(self.converters):
+            raise ValueError(
+                f'Expected {len(self.converters)} arguments, got {len(arguments)}'
+            )
+
+        return [
+            convert(argument)
+            for convert, argument in zip(self.converters, arguments)
+        ]
+
+def parse_arguments(data: str) -> List[Any]:
+    """Parse arguments of a command without a schema, by guessing their types"""
+    args: List[Any] = data.split()
+
+    for index, argument in enumerate(args):
+        try:
+            if argument.startswith('{'):
+                # We received a json string
+                args = [decode_json(' '.join(args))]
+                break
+
+            # Try to convert the argument to a Python object
+            args[index] = ast.literal_eval(argument)
+        except (ValueError, SyntaxError):
+            pass
+
+    return args
@@ -0,0 +1,96 @@
+
+from __future__ import annotations
+
+from typing import Any, Dict, Generic, List, Tuple, Type, TypeVar
+from importlib import import_module
+from sqlalchemy.orm import Session
+from threading import Lock
+
+from .objects import Card, Stamp, Item
+
+import logging
+import config
+import time
+
+T = TypeVar('T')
+
+class CatalogTable(Generic[T]):
+    """
+    An in-memory copy of a table, that doesn't change while the server is running.
+    Rows are loaded on first use, and reloaded after they have expired.
+    """
+
+    def __init__(self, model: Type[T], ttl: float) -> None:
+        self.model = model
+        self.ttl = ttl
+        self.lock = Lock()
+        self.reload_lock = Lock()
+        self.rows: Dict[int, T] = {}
+        self.groups: Dict[Tuple[str, Any], List[T]] = {}
+        self.loaded_at = 0.0
+        self.logger = logging.getLogger('Catalog')
+
+    @property
+    def expired(self) -> bool:
+        return time.time() - self.loaded_at >= self.ttl
+
+    def load(self, session: Session | None = None) -> None:
+        if session is None:
+            database = import_module('app.session').database
+
+            with database.managed_session() as session:
+                return self.load(session)
+
+        rows = {row.id: row for row in session.query(self.model).all()}
+
+        with self.lock:
+            self.rows = rows
+            self.groups = {}
+            self.loaded_at = time.time()
+
+        self.logger.debug(f'Loaded {len(rows)} rows from "{self.model.__tablename__}"')
+
+    def ensure_loaded(self) -> None:
+        if not self.expired:
+            return
+
+        with self.reload_lock:
+            if self.expired:
+                # Table was not reloaded by another thread in the meantime
+                self.load()
+
+    def get(self, id: int) -> T | None:
+        self.ensure_loaded()
+        return self.rows.get(id)
+
+    def all(self) -> List[T]:
+        self.ensure_loaded()
+        return list(self.rows.values())
+
+    def filter(self, attribute: str, value: Any) -> List[T]:
+        """Get all rows, where the attribute matches the value"""
+        self.ensure_loaded()
+        key = (attribute, value)
+
+        if (rows := self.groups.get(key)) is not None:
+            return list(rows)
+
+        with self.lock:
+            # Group the same rows, that the load method has swapped in
+            if (rows := self.groups.get(key)) is None:
+                rows = [row for row in self.rows.values() if getattr(row, attribute) == value]
+                self.groups[key] = rows
+
+        return list(rows)
+
+cards = CatalogTable(Card, config.CATALOG_TTL)
+stamps = CatalogTable(Stamp, config.CATALOG_TTL)
+items = CatalogTable(Item, config.CATALOG_TTL)
+
+def reload() -> None:
+    """Load every catalog from the database, e.g. after the tables were changed"""
+    database = import_module('app.session').database
+
+    with database.managed_session() as session:
+        for table in (cards, stamps, items):
+            table.load(session)
@@ -34,6 +34,7 @@ __all__ = [
     "PenguinStamp",
     "Item",
     "PenguinItem",
+    "WriterEntry",
 ]
 
 
@@ -589,3 +590,12 @@ class PenguinItem(Base):
     def __init__(self, penguin_id: int, item_id: int) -> None:
         self.penguin_id = penguin_id
         self.item_id = item_id
+
+
+class WriterEntry(Base):
+    """Journal entries of the write-behind writer, that were applied to the database"""
+    __tablename__ = "writer_entry"
+
+    id: Mapped[str] = mapped_column(
+        String(32), primary_key=True, nullable=False
+    )
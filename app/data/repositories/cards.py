@@ -3,33 +3,23 @@ from __future__ import annotations
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
+from typing import List, Tuple
 
 from .wrapper import SessionProvider, session_wrapper
+from .. import catalog
 from ..objects import Card, PenguinCard
 
-@session_wrapper
 def fetch_one(id: int, session: Session = SessionProvider) -> Card | None:
-    return session.query(Card) \
-        .filter(Card.id == id) \
-        .first()
+    return catalog.cards.get(id)
 
-@session_wrapper
 def fetch_all(session: Session = SessionProvider) -> List[Card]:
-    return session.query(Card) \
-        .all()
+    return catalog.cards.all()
 
-@session_wrapper
 def fetch_by_element(element: str, session: Session = SessionProvider) -> List[Card]:
-    return session.query(Card) \
-        .filter(Card.element == element) \
-        .all()
+    return catalog.cards.filter('element', element)
 
-@session_wrapper
 def fetch_power_cards(session: Session = SessionProvider) -> List[Card]:
-    return session.query(Card) \
-        .filter(Card.power_id > 0) \
-        .all()
+    return [card for card in catalog.cards.all() if card.power_id > 0]
 
 @session_wrapper
 def fetch_by_penguin_id(
@@ -63,6 +53,17 @@ def fetch_power_cards_by_penguin_id(
         .filter(Card.power_id > 0) \
         .all()
 
+@session_wrapper
+def fetch_power_card_quantities_by_penguin_ids(
+    penguin_ids: List[int],
+    session: Session = SessionProvider
+) -> List[Tuple[int, int, int]]:
+    return session.query(PenguinCard.penguin_id, PenguinCard.card_id, PenguinCard.quantity) \
+        .join(Card) \
+        .filter(PenguinCard.penguin_id.in_(penguin_ids)) \
+        .filter(Card.power_id > 0) \
+        .all()
+
 @session_wrapper
 def fetch_count(
     penguin_id: int,
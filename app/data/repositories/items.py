@@ -5,13 +5,11 @@ from sqlalchemy.orm import Session
 from typing import List
 
 from .wrapper import SessionProvider, session_wrapper
+from .. import catalog
 from ..objects import Item, PenguinItem
 
-@session_wrapper
 def fetch_one(id: int, session: Session = SessionProvider) -> Item | None:
-    return session.query(Item) \
-        .filter(Item.id == id) \
-        .first()
+    return catalog.items.get(id)
 
 @session_wrapper
 def fetch_by_penguin_id(penguin_id: int, session: Session = SessionProvider) -> List[Item]:
@@ -2,22 +2,17 @@
 from __future__ import annotations
 
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Tuple
 
 from .wrapper import SessionProvider, session_wrapper
+from .. import catalog
 from ..objects import Stamp, PenguinStamp
 
-@session_wrapper
 def fetch_one(id: int, session: Session = SessionProvider) -> Stamp | None:
-    return session.query(Stamp) \
-        .filter(Stamp.id == id) \
-        .first()
+    return catalog.stamps.get(id)
 
-@session_wrapper
 def fetch_all_by_group(group_id: int, session: Session = SessionProvider) -> List[Stamp]:
-    return session.query(Stamp) \
-        .filter(Stamp.group_id == group_id) \
-        .all()
+    return catalog.stamps.filter('group_id', group_id)
 
 @session_wrapper
 def fetch_by_penguin_id(
@@ -57,6 +52,18 @@ def remove(
     session.commit()
     return rows
 
+@session_wrapper
+def fetch_ids_by_penguin_ids(
+    penguin_ids: List[int],
+    group_id: int,
+    session: Session = SessionProvider
+) -> List[Tuple[int, int]]:
+    return session.query(PenguinStamp.penguin_id, PenguinStamp.stamp_id) \
+        .join(Stamp, Stamp.id == PenguinStamp.stamp_id) \
+        .filter(PenguinStamp.penguin_id.in_(penguin_ids)) \
+        .filter(Stamp.group_id == group_id) \
+        .all()
+
 @session_wrapper
 def exists(
     id: int,
@@ -73,9 +80,7 @@ def completed_group(
     group_id: int,
     session: Session = SessionProvider
 ) -> bool:
-    total = session.query(Stamp) \
-        .filter(Stamp.group_id == group_id) \
-        .count()
+    total = len(catalog.stamps.filter('group_id', group_id))
 
     collected = session.query(Stamp) \
         .join(PenguinStamp, Stamp.id == PenguinStamp.stamp_id) \
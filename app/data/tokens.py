@@ -0,0 +1,93 @@
+
+from __future__ import annotations
+
+from twisted.internet.defer import Deferred, succeed
+from twisted.python.failure import Failure
+from twisted.internet import reactor, threads
+from typing import TYPE_CHECKING, Dict, List, Tuple
+from collections import defaultdict
+
+if TYPE_CHECKING:
+    from twisted.internet.interfaces import IDelayedCall
+    from redis import Redis
+
+import logging
+import time
+
+class SessionTokens:
+    """
+    Looks up the session tokens of players, without blocking the reactor.
+    Lookups that arrive within the same reactor iteration are sent as a single MGET.
+    Fetched tokens are cached for a short time, until a login has used them,
+    so a revoked or rotated token can't be reused from the cache.
+    """
+
+    def __init__(self, redis: "Redis", ttl: float = 10) -> None:
+        self.redis = redis
+        self.ttl = ttl
+        self.cache: Dict[int, Tuple[str, float]] = {}
+        self.pending: Dict[int, List[Deferred]] = defaultdict(list)
+        self.flush_call: "IDelayedCall" | None = None
+        self.logger = logging.getLogger('Tokens')
+
+    def fetch(self, pid: int, expected: str | None = None) -> Deferred:
+        """Get the session token of a player. Cached tokens are only used, if they match the expected token."""
+        if cached := self.cache.get(pid):
+            token, expiry = cached
+
+            if token == expected and expiry > time.time():
+                return succeed(token)
+
+        deferred = Deferred()
+        self.pending[pid].append(deferred)
+
+        if self.flush_call is None:
+            self.flush_call = reactor.callLater(0, self.flush)  # type: ignore
+
+        return deferred
+
+    def invalidate(self, pid: int) -> None:
+        """Forget the cached token of a player, e.g. after it was used or revoked"""
+        self.cache.pop(pid, None)
+
+    def flush(self) -> None:
+        self.flush_call = None
+        pending, self.pending = self.pending, defaultdict(list)
+        pids = list(pending)
+
+        deferred = threads.deferToThread(
+            self.redis.mget,
+            [f'{pid}.mpsession' for pid in pids]
+        )
+        deferred.addCallbacks(
+            self.resolve, self.reject,
+            callbackArgs=(pending, pids),
+            errbackArgs=(pending,)
+        )
+
+    def resolve(self, tokens: List[bytes | None], pending: Dict[int, List[Deferred]], pids: List[int]) -> None:
+        expiry = time.time() + self.ttl
+        self.prune()
+
+        for pid, token in zip(pids, tokens):
+            if token is not None:
+                token = token.decode()
+                self.cache[pid] = (token, expiry)
+
+            for deferred in pending[pid]:
+                deferred.callback(token)
+
+    def reject(self, failure: Failure, pending: Dict[int, List[Deferred]]) -> None:
+        self.logger.error(f'Failed to fetch session tokens: {failure.getErrorMessage()}')
+
+        for deferreds in pending.values():
+            for deferred in deferreds:
+                deferred.errback(failure)
+
+    def prune(self) -> None:
+        now = time.time()
+
+        self.cache = {
+            pid: entry for pid, entry in self.cache.items()
+            if entry[1] > now
+        }
@@ -0,0 +1,297 @@
+
+from __future__ import annotations
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy import update, select, delete
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple
+from threading import Thread, Lock
+from queue import Queue, Empty
+
+if TYPE_CHECKING:
+    from .postgres import Postgres
+
+from .objects import Penguin, PenguinStamp, PenguinItem, WriterEntry
+
+import logging
+import json
+import uuid
+import time
+import os
+
+Entry = Tuple[str, int, Any]
+
+class WriteBehind:
+    """
+    Collects penguin updates, stamp unlocks & item grants, and writes them in batches on a dedicated thread.
+    Every entry is appended to a local journal first, which is replayed on startup,
+    in case the server stopped before the entry was written to the database.
+    The journal is compacted after every batch, so that it only contains unwritten entries.
+    Increments are recorded by their id in the same transaction, so that they are never applied twice.
+    """
+
+    def __init__(
+        self,
+        database: "Postgres",
+        journal_path: str,
+        interval: float = 0.5,
+        batch_size: int = 500,
+        retries: int = 5
+    ) -> None:
+        self.database = database
+        self.journal_path = journal_path
+        self.interval = interval
+        self.batch_size = batch_size
+        self.retries = retries
+
+        self.queue: Queue[Tuple[str, Entry] | None] = Queue()
+        self.lock = Lock()
+        self.journal = None
+        self.thread: Thread | None = None
+
+        # Entries that are part of the journal, by id
+        self.unwritten: Dict[str, Entry] = {}
+        self.failed: Dict[str, Entry] = {}
+
+        self.logger = logging.getLogger('Writer')
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, journal_path: str | None = None) -> None:
+        if journal_path:
+            self.journal_path = journal_path
+
+        entries = self.read_journal()
+
+        if entries:
+            self.logger.warning(f'Replaying {len(entries)} unwritten entries from journal')
+
+        # Entries keep their id, so that applied increments can be recognized
+        self.unwritten.update(entries)
+
+        # Start a new journal with the remaining entries
+        self.compact()
+        self.journal = open(self.journal_path, 'a', encoding='utf-8')
+
+        for id, entry in self.unwritten.items():
+            self.queue.put((id, entry))
+
+        self.thread = Thread(target=self.run, name='Writer', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Write all remaining entries, before the server stops"""
+        if not self.running:
+            return
+
+        self.queue.put(None)
+        self.thread.join()
+        self.journal.close()
+
+    def update_penguin(self, penguin_id: int, updates: Dict[str, Any]) -> None:
+        """Set columns of a penguin to absolute values, e.g. the rank"""
+        self.submit(('penguin', penguin_id, updates))
+
+    def increment_penguin(self, penguin_id: int, increments: Dict[str, int]) -> None:
+        """Add to columns of a penguin, e.g. the coins, without overwriting changes from elsewhere"""
+        self.submit(('increment', penguin_id, increments))
+
+    def add_stamp(self, penguin_id: int, stamp_id: int) -> None:
+        self.submit(('stamp', penguin_id, stamp_id))
+
+    def add_item(self, penguin_id: int, item_id: int) -> None:
+        self.submit(('item', penguin_id, item_id))
+
+    def submit(self, entry: Entry) -> None:
+        id = uuid.uuid4().hex
+
+        if not self.running:
+            # Nothing is writing in the background, e.g. in a script
+            self.write([(id, entry)])
+            self.forget([id] if entry[0] == 'increment' else [])
+            return
+
+        with self.lock:
+            self.unwritten[id] = entry
+            self.journal.write(json.dumps([id, *entry]) + '\n')
+            self.journal.flush()
+
+        self.queue.put((id, entry))
+
+    def read_journal(self) -> List[Tuple[str, Entry]]:
+        if not os.path.exists(self.journal_path):
+            return []
+
+        with open(self.journal_path, 'r', encoding='utf-8') as journal:
+            lines = [json.loads(line) for line in journal if line.strip()]
+
+        return [(str(id), tuple(entry)) for id, *entry in lines]
+
+    def compact(self) -> None:
+        """Rewrite the journal, so that it only contains entries that were not written yet"""
+        temporary_path = f'{self.journal_path}.tmp'
+
+        with open(temporary_path, 'w', encoding='utf-8') as journal:
+            for id, entry in self.unwritten.items():
+                journal.write(json.dumps([id, *entry]) + '\n')
+
+        os.replace(temporary_path, self.journal_path)
+
+    def run(self) -> None:
+        running = True
+
+        while running:
+            if (item := self.queue.get()) is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.interval
+
+            # Collect the writes of every game, that finished in the meantime
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(0, deadline - time.monotonic()))
+                except Empty:
+                    break
+
+                if item is None:
+                    running = False
+                    break
+
+                batch.append(item)
+
+            self.commit(batch)
+
+    def commit(self, batch: List[Tuple[str, Entry]]) -> None:
+        with self.lock:
+            # Retry the entries of batches, that have failed before
+            batch = [*self.failed.items(), *batch]
+            self.failed.clear()
+
+        for attempt in range(1, self.retries + 1):
+            try:
+                self.write(batch)
+                break
+            except Exception as e:
+                self.logger.warning(f'Failed to write {len(batch)} entries ({attempt}/{self.retries}): {e}')
+
+                if attempt < self.retries:
+                    time.sleep(min(2 ** attempt, 30))
+        else:
+            # Entries stay inside of the journal, and are retried with the next batch
+            self.logger.error(f'Giving up on {len(batch)} entries')
+
+            with self.lock:
+                self.failed.update(batch)
+            return
+
+        with self.lock:
+            for id, _ in batch:
+                self.unwritten.pop(id, None)
+
+            # Drop the written entries from the journal, so that they can't be replayed
+            self.journal.close()
+            self.compact()
+            self.journal = open(self.journal_path, 'a', encoding='utf-8')
+
+        self.forget([id for id, (type, _, _) in batch if type == 'increment'])
+
+    def forget(self, ids: List[str]) -> None:
+        """Remove the records of applied increments, once they are no longer in the journal"""
+        if not ids:
+            return
+
+        session: Session = self.database.session
+
+        try:
+            session.execute(delete(WriterEntry).where(WriterEntry.id.in_(ids)))
+            session.commit()
+        except Exception as e:
+            # Leftover records only take up space
+            self.logger.warning(f'Failed to remove {len(ids)} applied entries: {e}')
+            session.rollback()
+        finally:
+            session.close()
+
+    def write(self, batch: List[Tuple[str, Entry]]) -> None:
+        session: Session = self.database.session
+
+        try:
+            if increment_ids := [id for id, entry in batch if entry[0] == 'increment']:
+                # Increments of a replayed journal might have been applied already
+                applied = self.applied(session, increment_ids)
+                batch = [(id, entry) for id, entry in batch if id not in applied]
+
+            self.apply(session, [entry for _, entry in batch])
+
+            # Recorded in the same transaction as the increments themselves
+            self.record(session, [id for id, entry in batch if entry[0] == 'increment'])
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def applied(self, session: Session, ids: List[str]) -> Set[str]:
+        """Get the ids of increments, that were already applied to the database"""
+        return set(session.scalars(select(WriterEntry.id).where(WriterEntry.id.in_(ids))))
+
+    def record(self, session: Session, ids: List[str]) -> None:
+        if ids:
+            session.execute(insert(WriterEntry).values([{'id': id} for id in ids]))
+
+    def apply(self, session: Session, batch: List[Entry]) -> None:
+        penguin_updates: Dict[int, Dict[str, Any]] = {}
+        penguin_increments: Dict[int, Dict[str, int]] = {}
+        stamps: Set[Tuple[int, int]] = set()
+        items: Set[Tuple[int, int]] = set()
+
+        for type, penguin_id, value in batch:
+            if type == 'penguin':
+                # Updates contain absolute values, so later ones take precedence
+                penguin_updates.setdefault(penguin_id, {}).update(value)
+
+            elif type == 'increment':
+                increments = penguin_increments.setdefault(penguin_id, {})
+
+                for column, amount in value.items():
+                    increments[column] = increments.get(column, 0) + amount
+
+            elif type == 'stamp':
+                stamps.add((penguin_id, value))
+
+            elif type == 'item':
+                items.add((penguin_id, value))
+
+        if stamps:
+            session.execute(
+                insert(PenguinStamp)
+                    .values([{'penguin_id': p, 'stamp_id': s} for p, s in stamps])
+                    .on_conflict_do_nothing()
+            )
+
+        if items:
+            session.execute(
+                insert(PenguinItem)
+                    .values([{'penguin_id': p, 'item_id': i} for p, i in items])
+                    .on_conflict_do_nothing()
+            )
+
+        if penguin_updates:
+            session.execute(
+                update(Penguin),
+                [{'id': id, **values} for id, values in penguin_updates.items()]
+            )
+
+        for id, increments in penguin_increments.items():
+            session.execute(
+                update(Penguin)
+                    .where(Penguin.id == id)
+                    .values({
+                        column: getattr(Penguin, column) + amount
+                        for column, amount in increments.items()
+                    })
+            )
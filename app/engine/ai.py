@@ -1,15 +1,17 @@
 
 from __future__ import annotations
-from typing import Callable, Iterable
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+
+if TYPE_CHECKING:
+    from app.engine.game import Game
 
 from twisted.internet.address import IPv4Address
-from twisted.internet import reactor
 
 from app.engine.penguin import Penguin
 from app.objects.ninjas import Ninja
 from app.objects import GameObject
 from app.objects.enemies import Enemy
-from app.data import penguins
+from app.data import penguins, Penguin as PenguinObject
 
 import logging
 import random
@@ -18,9 +20,9 @@ import config
 
 def delay(minimum: int, maximum: int) -> Callable:
     def decorator(func: Callable) -> Callable:
-        return lambda *args, **kwargs: reactor.callLater(
+        return lambda self, *args, **kwargs: self.game.call_later(
             random.uniform(minimum, maximum),
-            func, *args, **kwargs
+            func, self, *args, **kwargs
         )
     return decorator
 
@@ -28,16 +30,69 @@ def manhatten_distance(x1: int, y1: int, x2: int, y2: int) -> int:
     return abs(x1 - x2) + abs(y1 - y2)
 
 
+class BoardEvaluation:
+    """
+    Tactical information about the board, that is shared by all bots during a turn.
+    Enemies don't move while the players select their moves, so this only
+    needs to be computed once per turn.
+    """
+
+    def __init__(self, game: "Game") -> None:
+        self.game = game
+        self.turn = game.turn
+        self.enemies = [enemy for enemy in game.enemies if enemy.hp > 0]
+        self.enemy_distances: Dict[Tuple[int, int], int] = {}
+        self.attackable: Dict[Tuple[int, int, int], List[GameObject]] = {}
+        self.healable: Dict[Tuple[Ninja, int, int], List[GameObject]] = {}
+
+    @classmethod
+    def for_game(cls, game: "Game") -> "BoardEvaluation":
+        evaluation = getattr(game, 'board_evaluation', None)
+
+        if evaluation is None or evaluation.turn != game.turn:
+            evaluation = game.board_evaluation = cls(game)
+
+        return evaluation
+
+    def nearest_enemy_distance(self, tile: GameObject) -> int:
+        key = (tile.x, tile.y)
+
+        if key not in self.enemy_distances:
+            self.enemy_distances[key] = min(
+                manhatten_distance(tile.x, tile.y, enemy.x, enemy.y)
+                for enemy in self.enemies
+            )
+
+        return self.enemy_distances[key]
+
+    def attackable_tiles(self, ninja: Ninja, tile: GameObject) -> List[GameObject]:
+        key = (tile.x, tile.y, ninja.range)
+
+        if key not in self.attackable:
+            self.attackable[key] = list(ninja.attackable_tiles(tile.x, tile.y))
+
+        return self.attackable[key]
+
+    def healable_tiles(self, ninja: Ninja, tile: GameObject) -> List[GameObject]:
+        key = (ninja, tile.x, tile.y)
+
+        if key not in self.healable:
+            self.healable[key] = list(ninja.healable_tiles(tile.x, tile.y))
+
+        return self.healable[key]
+
+
 class PenguinAI(Penguin):
     def __init__(
         self,
         server,
         element: str,
-        battle_mode: int
+        battle_mode: int,
+        object: PenguinObject | None = None
     ) -> None:
         super().__init__(server, IPv4Address('TCP', '127.0.0.1', 69420))
         self.logger = logging.getLogger(f'AI ({element.capitalize()})')
-        self.object = penguins.fetch_random()
+        self.object = object or penguins.fetch_random()
         self.name = self.object.nickname
         self.element = element
         self.battle_mode = battle_mode
@@ -53,6 +108,10 @@ class PenguinAI(Penguin):
 
         self.logger.info(message)
 
+    @property
+    def evaluation(self) -> BoardEvaluation:
+        return BoardEvaluation.for_game(self.game)
+
     def tile_debug(self, tile: GameObject | None) -> str:
         if tile is None:
             return 'None'
@@ -294,7 +353,7 @@ class PenguinAI(Penguin):
         self.ninja.place_ghost(tile.x, tile.y)
 
     def living_enemies(self) -> list[Enemy]:
-        return [enemy for enemy in self.game.enemies if enemy.hp > 0]
+        return list(self.evaluation.enemies)
 
     def available_tiles(self) -> list[GameObject]:
         current_tile = self.game.grid[self.ninja.x, self.ninja.y]
@@ -305,11 +364,8 @@ class PenguinAI(Penguin):
 
         return tiles
 
-    def nearest_enemy_distance(self, tile: GameObject, enemies: Iterable[Enemy]) -> int:
-        return min(
-            manhatten_distance(tile.x, tile.y, enemy.x, enemy.y)
-            for enemy in enemies
-        )
+    def nearest_enemy_distance(self, tile: GameObject) -> int:
+        return self.evaluation.nearest_enemy_distance(tile)
 
     def best_enemy_target(
         self,
@@ -354,12 +410,12 @@ class PenguinAI(Penguin):
         attack_candidates = []
 
         for tile in self.available_tiles():
-            targets = list(self.ninja.attackable_tiles(tile.x, tile.y))
+            targets = self.evaluation.attackable_tiles(self.ninja, tile)
 
             if not targets:
                 continue
 
-            nearest_enemy = self.nearest_enemy_distance(tile, enemies)
+            nearest_enemy = self.nearest_enemy_distance(tile)
             attack_count = len(targets)
 
             score = (
@@ -426,8 +482,8 @@ class PenguinAI(Penguin):
         best_tile = min(
             tiles,
             key=lambda tile: (
-                abs(self.nearest_enemy_distance(tile, enemies) - target_distance),
-                -self.nearest_enemy_distance(tile, enemies),
+                abs(self.nearest_enemy_distance(tile) - target_distance),
+                -self.nearest_enemy_distance(tile),
                 0 if (current_tile and tile != current_tile) else 1
             )
         )
@@ -436,7 +492,7 @@ class PenguinAI(Penguin):
             'standoff eval: '
             f'target_distance={target_distance} '
             f'chosen_tile={self.tile_debug(best_tile)} '
-            f'chosen_distance={self.nearest_enemy_distance(best_tile, enemies)}'
+            f'chosen_distance={self.nearest_enemy_distance(best_tile)}'
         )
 
         return best_tile
@@ -448,7 +504,7 @@ class PenguinAI(Penguin):
         heal_candidates = []
 
         for tile in self.available_tiles():
-            heal_tiles = list(self.ninja.healable_tiles(tile.x, tile.y))
+            heal_tiles = self.evaluation.healable_tiles(self.ninja, tile)
 
             if not heal_tiles:
                 continue
@@ -503,8 +559,8 @@ class PenguinAI(Penguin):
             return None
 
         key = (
-            (lambda tile: self.nearest_enemy_distance(tile, enemies)) if prefer_far else
-            (lambda tile: -self.nearest_enemy_distance(tile, enemies))
+            (lambda tile: self.nearest_enemy_distance(tile)) if prefer_far else
+            (lambda tile: -self.nearest_enemy_distance(tile))
         )
         best_tile = max(tiles, key=key)
 
@@ -512,7 +568,7 @@ class PenguinAI(Penguin):
             'positioning eval: '
             f'prefer_far={prefer_far} '
             f'best_tile={self.tile_debug(best_tile)} '
-            f'distance={self.nearest_enemy_distance(best_tile, enemies)}'
+            f'distance={self.nearest_enemy_distance(best_tile)}'
         )
         return best_tile
 
@@ -528,20 +584,22 @@ class PenguinAI(Penguin):
 
         current_tile = self.game.grid[self.ninja.x, self.ninja.y]
 
+        distances = {
+            tile: sum(manhatten_distance(tile.x, tile.y, ally.x, ally.y) for ally in allies) / len(allies)
+            for tile in tiles
+        }
+
         # Prefer tiles that reduce average distance to allies
         # On ties, prefer moving over staying
         best_tile = min(
             tiles,
             key=lambda tile: (
-                sum(manhatten_distance(tile.x, tile.y, ally.x, ally.y) for ally in allies) / len(allies),
+                distances[tile],
                 0 if (current_tile and tile != current_tile) else 1
             )
         )
 
-        avg_distance = sum(
-            manhatten_distance(best_tile.x, best_tile.y, ally.x, ally.y)
-            for ally in allies
-        ) / len(allies)
+        avg_distance = distances[best_tile]
 
         self.debug(
             'ally proximity eval: '
@@ -3,12 +3,12 @@ from __future__ import annotations
 
 from typing import Callable, Dict, List, Any, TYPE_CHECKING
 from twisted.internet import reactor
+from threading import Condition, Event
 from collections import defaultdict
 from dataclasses import dataclass
+from itertools import count
 from enum import IntEnum
 
-import time
-
 if TYPE_CHECKING:
     from app.engine.game import Game
     from app.engine import Penguin
@@ -38,7 +38,9 @@ class CallbackHandler:
 
     def __init__(self, game: "Game"):
         self.pending_actions: Dict[int, List[Action]] = defaultdict(list)
-        self.pending_events: Dict[Any, List[str]] = defaultdict(list)
+        self.pending_events: Dict[Any, Dict[str, Event]] = defaultdict(dict)
+        self.condition = Condition()
+        self.handle_ids = count(1)
         self.game = game
 
     @property
@@ -80,11 +82,12 @@ class CallbackHandler:
         return next((action for action in self.actions if action.name == name), None)
 
     def remove(self, object_id: int) -> None:
-        if object_id in self.pending_actions:
-            self.pending_actions.pop(object_id, None)
+        with self.condition:
+            if self.pending_actions.pop(object_id, None):
+                self.condition.notify_all()
 
     def next_id(self) -> int:
-        return max(self.ids or [0]) + 1
+        return next(self.handle_ids)
 
     def register_action(
         self,
@@ -101,70 +104,87 @@ class CallbackHandler:
             callback
         )
 
-        self.pending_actions[object_id].append(action)
+        with self.condition:
+            self.pending_actions[object_id].append(action)
+
         return action.handle_id
 
     def action_done(self, id: int, object_id: int):
         target_object = self.game.objects.by_id(object_id)
 
-        for action in self.pending_actions[object_id]:
-            if action.handle_id != id:
-                continue
+        with self.condition:
+            for action in self.pending_actions.get(object_id, []):
+                if action.handle_id != id:
+                    continue
+
+                if action.callback is not None:
+                    reactor.callInThread(  # type: ignore
+                        action.callback,
+                        target_object
+                    )
 
-            if action.callback is not None:
-                reactor.callInThread(  # type: ignore
-                    action.callback,
-                    target_object
-                )
+                self.pending_actions[object_id].remove(action)
+                self.condition.notify_all()
+                break
 
-            self.pending_actions[object_id].remove(action)
-            break
+    def register_event(self, target: Any, event: str) -> Event:
+        with self.condition:
+            if event not in self.pending_events[target]:
+                self.pending_events[target][event] = Event()
 
-    def register_event(self, target: Any, event: str) -> None:
-        self.pending_events[target].append(event)
+            return self.pending_events[target][event]
 
     def event_done(self, event: str, target: Any) -> None:
-        if event in self.pending_events.get(target, []):
-            self.pending_events[target].remove(event)
+        with self.condition:
+            if target not in self.pending_events:
+                return
+
+            if waiter := self.pending_events[target].pop(event, None):
+                waiter.set()
 
     def remove_events(self, target: Any) -> None:
-        if target in self.pending_events:
-            self.pending_events.pop(target, None)
+        with self.condition:
+            for waiter in self.pending_events.pop(target, {}).values():
+                waiter.set()
 
     def wait_for_client(self, event: str, client: "Penguin", timeout=8) -> None:
         """Wait for an event to be called by the client"""
-        self.register_event(client, event)
+        waiter = self.register_event(client, event)
 
-        start_time = time.time()
+        if client.disconnected:
+            self.remove_events(client)
+            return
 
-        while event in self.pending_events.get(client, []):
-            if client.disconnected:
-                self.remove_events(client)
-                break
-
-            if time.time() - start_time > timeout:
-                self.game.logger.warning(f"Event Timeout: {event}")
-                self.remove_events(client)
-                break
-
-            time.sleep(0.05)
+        if not waiter.wait(timeout):
+            self.game.logger.warning(f"Event Timeout: {event}")
+            self.remove_events(client)
 
     def wait_for_event(self, event: str, timeout=8) -> None:
         """Wait for an event to be called by any of the clients"""
-        self.register_event(self.game, event)
+        waiter = self.register_event(self.game, event)
 
-        start_time = time.time()
+        if not waiter.wait(timeout):
+            self.game.logger.warning(f"Event Timeout: {event}")
+            self.reset_events()
 
-        while event in self.pending_events.get(self.game, []):
-            if time.time() - start_time > timeout:
-                self.game.logger.warning(f"Event Timeout: {event}")
-                self.reset_events()
-                break
+    def wait_for_animations(self, timeout=8) -> None:
+        """Wait for all pending animations to finish"""
+        with self.condition:
+            if self.condition.wait_for(lambda: not self.pending_animations, timeout):
+                return
 
-            time.sleep(0.05)
+            self.game.logger.warning(f'Animation Timeout: {self.pending_animations}')
+            self.reset_animations()
 
     def reset_animations(self) -> None:
-        self.pending_actions.clear()
+        with self.condition:
+            self.pending_actions.clear()
+            self.condition.notify_all()
 
     def reset_events(self) -> None:
-        self.pending_events.clear()
+        with self.condition:
+            for waiters in self.pending_events.values():
+                for waiter in waiters.values():
+                    waiter.set()
+
+            self.pending_events.clear()
@@ -1,6 +1,6 @@
 
 from __future__ import annotations
-from typing import Iterable, List, Tuple, TYPE_CHECKING
+from typing import Dict, Iterable, List, Tuple, TYPE_CHECKING
 
 from app.data import Card, TipPhase
 from app.objects import GameObject, LocalGameObject
@@ -20,11 +20,61 @@ from app.objects.effects import (
     Rage
 )
 
-import time
-
 if TYPE_CHECKING:
     from app.engine import Penguin
 
+import random
+
+class Deck:
+    """
+    The remaining power cards of a client, stored as card id & number of copies.
+    Cards are only turned into a `CardObject`, once they get drawn.
+    """
+
+    def __init__(self, cards: Iterable[Tuple[Card, int]] = ()) -> None:
+        self.cards: Dict[int, Card] = {}
+        self.counts: Dict[int, int] = {}
+        self.size = 0
+
+        for card, count in cards:
+            self.add(card, count)
+
+    def __repr__(self) -> str:
+        return f'<Deck ({self.size} cards)>'
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, card: Card, count: int = 1) -> None:
+        if count <= 0:
+            return
+
+        self.cards[card.id] = card
+        self.counts[card.id] = self.counts.get(card.id, 0) + count
+        self.size += count
+
+    def draw(self) -> Card | None:
+        """Remove a random card, weighted by the number of copies"""
+        if not self.size:
+            return None
+
+        index = random.randrange(self.size)
+
+        for card_id, count in self.counts.items():
+            if index < count:
+                break
+
+            index -= count
+
+        self.size -= 1
+        self.counts[card_id] -= 1
+
+        if not self.counts[card_id]:
+            del self.counts[card_id]
+            return self.cards.pop(card_id)
+
+        return self.cards[card_id]
+
 class CardObject(Card):
     def __init__(self, card: Card, client: "Penguin") -> None:
         self.__dict__.update(card.__dict__)
@@ -175,7 +225,7 @@ class CardObject(Card):
         )
 
         # Wait for card animation
-        time.sleep(1.2)
+        self.game.sleep(1.2)
 
         self.attack_animation()
         self.apply_health()
@@ -219,22 +269,22 @@ class CardObject(Card):
 
         if self.element != 's':
             # Wait for attack animation
-            time.sleep(0.2)
+            self.game.sleep(0.2)
 
         impact = impact_class(self.game, self.x, self.y)
         impact.play()
 
         if self.element == 'f':
-            time.sleep(impact.duration)
+            self.game.sleep(impact.duration)
             impact.remove_object()
-            time.sleep(beam.duration - impact.duration)
+            self.game.sleep(beam.duration - impact.duration)
             beam.remove_object()
             return
 
         beam_delay = 0.85
-        time.sleep(impact.duration - beam_delay)
+        self.game.sleep(impact.duration - beam_delay)
         beam.remove_object()
-        time.sleep(beam_delay)
+        self.game.sleep(beam_delay)
         impact.remove_object()
 
     def apply_health(self) -> None:
@@ -404,7 +454,7 @@ class MemberCard(GameObject):
             snow_ui.send_payload(payload_name)
 
         # Wait for card animation
-        time.sleep(2)
+        self.game.sleep(2)
 
         beam = MemberReviveBeam(self.game, self.client.ninja.x, self.client.ninja.y)
         beam.play()
@@ -414,6 +464,6 @@ class MemberCard(GameObject):
         self.client.ninja.revive_membercard_animation()
         self.client.member_card = None
 
-        time.sleep(1.2)
+        self.game.sleep(1.2)
         self.client.ninja.play_sound('SFX_MG_CJSnow_PowercardReviveEnd')
         beam.remove_object()
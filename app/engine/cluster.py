@@ -0,0 +1,458 @@
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+from twisted.internet.defer import Deferred
+from twisted.python.failure import Failure
+from twisted.internet import reactor
+from threading import Lock, Thread
+from collections import defaultdict
+from fnmatch import fnmatchcase
+from itertools import count
+from queue import Queue
+
+if TYPE_CHECKING:
+    from app.server import SnowflakeWorld
+    from redis import Redis
+
+from app.arguments import decode_json
+
+from .shards import ShardWorker, ShardHost, client_state, encode_json
+from .penguin import Penguin
+
+import logging
+
+PREFIX = 'snowflake'
+STATES_KEY = f'{PREFIX}:matchmaking:states'
+
+# KEYS: queue of the claiming player, queues of the other two elements, player states
+# ARGV: member of the claiming player, rank, rank window
+CLAIM_SCRIPT = """
+local states = KEYS[#KEYS]
+local rank = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return nil
+end
+
+local claimed = {}
+
+for index = 2, #KEYS - 1 do
+    local candidates = redis.call('ZRANGEBYSCORE', KEYS[index], rank - window, rank + window, 'WITHSCORES')
+    local best, best_distance = nil, nil
+
+    for i = 1, #candidates, 2 do
+        local distance = math.abs(tonumber(candidates[i + 1]) - rank)
+
+        if best == nil or distance < best_distance then
+            best, best_distance = candidates[i], distance
+        end
+    end
+
+    if best == nil then
+        return nil
+    end
+
+    claimed[#claimed + 1] = {KEYS[index], best}
+end
+
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', states, ARGV[1])
+
+local result = {}
+
+for _, entry in ipairs(claimed) do
+    redis.call('ZREM', entry[1], entry[2])
+    result[#result + 1] = entry[2]
+    result[#result + 1] = redis.call('HGET', states, entry[2])
+    redis.call('HDEL', states, entry[2])
+end
+
+return result
+"""
+
+class SerialWorker:
+    """
+    Runs blocking calls one after another on a dedicated thread, so that a slow redis
+    can't stall the reactor. Calls keep their order, and report their results to the reactor.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.queue: Queue[Tuple[Deferred, Callable, tuple] | None] = Queue()
+        self.thread = Thread(target=self.run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Finish all queued calls, before the thread exits"""
+        if not self.thread.is_alive():
+            return
+
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+    def call(self, func: Callable, *args) -> Deferred:
+        deferred = Deferred()
+        self.queue.put((deferred, func, args))
+        return deferred
+
+    def run(self) -> None:
+        while (task := self.queue.get()) is not None:
+            deferred, func, args = task
+
+            try:
+                result = func(*args)
+            except Exception:
+                reactor.callFromThread(deferred.errback, Failure())  # type: ignore
+                continue
+
+            reactor.callFromThread(deferred.callback, result)  # type: ignore
+
+class RedisBackend:
+    """Keeps the shared queues inside of sorted sets, ranked by snow ninja rank"""
+
+    def __init__(self, redis: "Redis") -> None:
+        self.redis = redis
+        self.claim_script = redis.register_script(CLAIM_SCRIPT)
+        self.publisher = SerialWorker('Publisher')
+        self.publisher.start()
+        self.logger = logging.getLogger('Cluster')
+        self.pubsub = None
+        self.thread = None
+
+    def push(self, queue: str, member: str, rank: int, state: bytes) -> None:
+        with self.redis.pipeline() as pipeline:
+            pipeline.zadd(queue, {member: rank})
+            pipeline.hset(STATES_KEY, member, state)
+            pipeline.execute()
+
+    def withdraw(self, queue: str, member: str) -> bool:
+        with self.redis.pipeline() as pipeline:
+            pipeline.zrem(queue, member)
+            pipeline.hdel(STATES_KEY, member)
+            removed, _ = pipeline.execute()
+
+        return removed > 0
+
+    def claim(
+        self,
+        queue: str,
+        others: List[str],
+        member: str,
+        rank: int,
+        window: float
+    ) -> List[Tuple[str, bytes]] | None:
+        result = self.claim_script(
+            keys=[queue, *others, STATES_KEY],
+            args=[member, rank, window]
+        )
+
+        if result is None:
+            return None
+
+        return [
+            (result[index].decode(), result[index + 1])
+            for index in range(0, len(result), 2)
+        ]
+
+    def publish(self, channel: str, data: bytes) -> None:
+        # Relayed traffic is published in order, without waiting for redis
+        deferred = self.publisher.call(self.redis.publish, channel, data)
+        deferred.addErrback(self.publish_failed, channel)
+
+    def publish_failed(self, failure: Failure, channel: str) -> None:
+        self.logger.error(f'Failed to publish to "{channel}": {failure.getErrorMessage()}')
+
+    def subscribe(self, pattern: str, callback: Callable[[str, bytes], None]) -> None:
+        def on_message(message: dict) -> None:
+            reactor.callFromThread(  # type: ignore
+                callback,
+                message['channel'].decode(),
+                message['data']
+            )
+
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.psubscribe(**{pattern: on_message})
+        self.thread = self.pubsub.run_in_thread(sleep_time=0.01, daemon=True)
+
+    def close(self) -> None:
+        self.publisher.stop()
+
+        if self.thread is not None:
+            self.thread.stop()
+
+        if self.pubsub is not None:
+            self.pubsub.close()
+
+class MemoryBackend:
+    """
+    Stands in for redis, by keeping the queues inside of this process.
+    Multiple nodes can share one instance, e.g. for testing.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.queues: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.states: Dict[str, bytes] = {}
+        self.subscribers: List[Tuple[str, Callable[[str, bytes], None]]] = []
+
+    def push(self, queue: str, member: str, rank: int, state: bytes) -> None:
+        with self.lock:
+            self.queues[queue][member] = rank
+            self.states[member] = state
+
+    def withdraw(self, queue: str, member: str) -> bool:
+        with self.lock:
+            self.states.pop(member, None)
+            return self.queues[queue].pop(member, None) is not None
+
+    def claim(
+        self,
+        queue: str,
+        others: List[str],
+        member: str,
+        rank: int,
+        window: float
+    ) -> List[Tuple[str, bytes]] | None:
+        with self.lock:
+            if member not in self.queues[queue]:
+                return None
+
+            claimed = []
+
+            for other in others:
+                candidates = sorted(
+                    (score, candidate)
+                    for candidate, score in self.queues[other].items()
+                    if abs(score - rank) <= window
+                )
+
+                if not candidates:
+                    return None
+
+                # Same order as the lua script: lowest distance, then lowest score
+                _, best = min(candidates, key=lambda entry: abs(entry[0] - rank))
+                claimed.append((other, best))
+
+            del self.queues[queue][member]
+            self.states.pop(member, None)
+
+            for other, best in claimed:
+                del self.queues[other][best]
+
+            return [(best, self.states.pop(best)) for _, best in claimed]
+
+    def publish(self, channel: str, data: bytes) -> None:
+        for pattern, callback in self.subscribers:
+            if fnmatchcase(channel, pattern):
+                reactor.callFromThread(callback, channel, data)  # type: ignore
+
+    def subscribe(self, pattern: str, callback: Callable[[str, bytes], None]) -> None:
+        self.subscribers.append((pattern, callback))
+
+    def close(self) -> None:
+        ...
+
+class RelayTransport:
+    """Carries the messages of a channel between two nodes"""
+
+    def __init__(self, backend: RedisBackend | MemoryBackend, channel: str) -> None:
+        self.backend = backend
+        self.channel = channel
+        self.disconnecting = False
+
+    def write(self, data: bytes) -> None:
+        self.backend.publish(self.channel, data)
+
+    def writeSequence(self, data: List[bytes]) -> None:
+        # Lines have to be published as a whole, to arrive as a whole
+        self.write(b''.join(data))
+
+    def loseConnection(self) -> None:
+        ...
+
+class RemoteHost(ShardWorker):
+    """Another node, that is hosting a game for some of our players"""
+
+    def __init__(self, cluster: "Cluster", peer: str) -> None:
+        super().__init__(cluster.server.shards)
+        self.cluster = cluster
+        self.index = peer
+
+    def on_attach(self, client: int, pid: int) -> None:
+        matchmaking = self.cluster.server.matchmaking
+        player = matchmaking.players.by_id(pid)
+
+        if player is None or player.in_game or player.shard is not None:
+            # Player has left while the match was claimed
+            self.send_message('disconnect', client=client)
+            return
+
+        matchmaking.remove(player)
+        player.relay_id = client
+        player.shard = self
+        self.clients[client] = player
+
+class RemotePlayers(ShardHost):
+    """Players of another node, that are playing inside of a game on this node"""
+
+    def __init__(self, cluster: "Cluster", peer: str) -> None:
+        super().__init__(cluster.server, -1)
+        self.cluster = cluster
+        self.peer = peer
+
+    def connectionMade(self) -> None:
+        ...
+
+    def connectionLost(self, reason=None) -> None:
+        ...
+
+    def create_client(self, state: Dict[str, Any]) -> Penguin:
+        state['id'] = next(self.cluster.relay_ids)
+        client = super().create_client(state)
+
+        # Let the other node relay the traffic of this client
+        self.send_message('attach', client=client.relay_id, pid=client.pid)
+        return client
+
+class Cluster:
+    """
+    Shares the matchmaking queue between multiple nodes. Every node pushes its
+    waiting players into the shared queue, and matches are claimed atomically,
+    so that a player can only be part of a single match. The node that claims
+    a match will host it, while the other nodes relay the traffic of their players.
+    """
+
+    def __init__(
+        self,
+        server: "SnowflakeWorld",
+        backend: RedisBackend | MemoryBackend,
+        node_id: str
+    ) -> None:
+        self.server = server
+        self.backend = backend
+        self.node_id = node_id
+        self.relay_ids = count(1)
+        self.hosts: Dict[str, RemoteHost] = {}
+        self.players: Dict[str, RemotePlayers] = {}
+        self.worker = SerialWorker('Cluster')
+        self.logger = logging.getLogger('Cluster')
+
+    def start(self) -> None:
+        self.worker.start()
+        self.backend.subscribe(f'{PREFIX}:relay:{self.node_id}:*', self.message_received)
+        self.logger.info(f'Joined matchmaking cluster as "{self.node_id}"')
+
+    def stop(self) -> None:
+        self.worker.stop()
+
+        for player in self.server.matchmaking.players:
+            # The reactor is stopping, so there is nothing left to block
+            self.backend.withdraw(
+                self.queue(player.battle_mode, player.element),
+                self.member(player)
+            )
+
+        self.backend.close()
+
+    def call(self, func: Callable, *args) -> Deferred:
+        """Call the backend on the cluster thread. Failed calls are logged, and resolve to None."""
+        deferred = self.worker.call(func, *args)
+        deferred.addErrback(self.call_failed, func.__name__)
+        return deferred
+
+    def call_failed(self, failure: Failure, name: str) -> None:
+        self.logger.error(f'Failed to {name}: {failure.getErrorMessage()}')
+        return None
+
+    def member(self, player: Penguin) -> str:
+        return f'{self.node_id}|{player.pid}'
+
+    def queue(self, battle_mode: int, element: str) -> str:
+        return f'{PREFIX}:matchmaking:{battle_mode}:{element}'
+
+    def push(self, player: Penguin) -> Deferred:
+        return self.call(
+            self.backend.push,
+            self.queue(player.battle_mode, player.element),
+            self.member(player),
+            player.object.snow_ninja_rank,
+            encode_json(client_state(player))
+        )
+
+    def withdraw(self, player: Penguin) -> Deferred:
+        """Remove a player from the shared queue, unless another node has claimed it first"""
+        return self.call(
+            self.backend.withdraw,
+            self.queue(player.battle_mode, player.element),
+            self.member(player)
+        )
+
+    def claim(self, player: Penguin, rank_window: float) -> Deferred:
+        """Claim the closest ranked players of the other elements, across all nodes"""
+        elements = [element for element in ('snow', 'water', 'fire') if element != player.element]
+
+        deferred = self.call(
+            self.backend.claim,
+            self.queue(player.battle_mode, player.element),
+            [self.queue(player.battle_mode, element) for element in elements],
+            self.member(player),
+            player.object.snow_ninja_rank,
+            rank_window
+        )
+        deferred.addCallback(self.claimed, player)
+        return deferred
+
+    def claimed(self, claimed: List[Tuple[str, bytes]] | None, player: Penguin) -> List[Penguin] | None:
+        if claimed is None:
+            return None
+
+        # The claiming player might have left, while the match was claimed
+        players = [player] if player in self.server.matchmaking.players else []
+
+        for member, state in claimed:
+            node, _, pid = member.rpartition('|')
+
+            if node != self.node_id:
+                players.append(self.remote_players(node).create_client(decode_json(state)))
+                continue
+
+            if local_player := self.server.matchmaking.players.by_id(int(pid)):
+                players.append(local_player)
+
+        return players
+
+    def channel(self, peer: str, role: str) -> str:
+        return f'{PREFIX}:relay:{peer}:{role}:{self.node_id}'
+
+    def remote_host(self, peer: str) -> RemoteHost:
+        if peer not in self.hosts:
+            host = RemoteHost(self, peer)
+            host.makeConnection(RelayTransport(self.backend, self.channel(peer, 'players')))
+            self.hosts[peer] = host
+
+        return self.hosts[peer]
+
+    def remote_players(self, peer: str) -> RemotePlayers:
+        if peer not in self.players:
+            players = RemotePlayers(self, peer)
+            players.makeConnection(RelayTransport(self.backend, self.channel(peer, 'host')))
+            self.players[peer] = players
+
+        return self.players[peer]
+
+    def message_received(self, channel: str, data: bytes) -> None:
+        role, _, peer = channel.removeprefix(f'{PREFIX}:relay:{self.node_id}:').partition(':')
+
+        links = {
+            'host': self.remote_host,
+            'players': self.remote_players
+        }
+
+        if role not in links:
+            self.logger.warning(f'Invalid relay channel: "{channel}"')
+            return
+
+        links[role](peer).dataReceived(data)
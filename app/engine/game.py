@@ -2,13 +2,16 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Callable, List
 from twisted.internet import reactor
+from concurrent.futures import Future
+from threading import Condition
 
 if TYPE_CHECKING:
     from .penguin import Penguin
 
-from app.data.repositories import stamps, penguins, items
+from app.data.repositories import stamps, cards
 from app.data import (
     ExpRequirements,
+    Stamp,
     SnowRewards,
     MirrorMode,
     TipPhase
@@ -19,16 +22,20 @@ from app.objects.enemies import Sly, Scrap, Tank, Enemy
 from app.objects.collections import ObjectCollection
 from app.objects.gameobject import GameObject
 from app.objects.sound import Sound
+from app.protocols.metaplace import WindowBroadcast, WindowStates, WindowState
+from app.protocols import MetaplaceProtocol
 
 from .callbacks import CallbackHandler
-from .cards import MemberCard
+from .cards import MemberCard, Deck
 from .timer import Timer
+from .pathfinding import Pathfinder
 from .grid import Grid
 
 import app.session
 import logging
 import random
 import config
+import json
 import time
 
 class Game:
@@ -39,17 +46,21 @@ class Game:
         self.id = -1
 
         self.bonus_criteria = random.choice(['no_ko', 'under_time', 'full_health'])
-        self.game_start = time.time()
+        self.game_start = self.now()
 
         self.map = random.randint(1, 3)
         self.total_combos = 0
+        self.turn = 0
         self.round = 0
         self.coins = 0
         self.exp = 0
 
+        self.player_data: Future | None = None
+        self.condition = Condition()
         self.callbacks = CallbackHandler(self)
         self.objects = ObjectCollection(offset=1000)
         self.grid = Grid(9, 5, self)
+        self.pathfinder = Pathfinder(self.grid)
         self.timer = Timer(self)
 
         self.server = self.clients[0].server
@@ -93,22 +104,15 @@ class Game:
         return {
             'no_ko': all(not player.was_ko for player in self.clients if not player.disconnected),
             'full_health': all(ninja.hp == ninja.max_hp for ninja in self.ninjas if not ninja.client.disconnected),
-            'under_time': (time.time() < self.game_start + 300)
+            'under_time': (self.now() < self.game_start + 300)
         }[self.bonus_criteria]
 
     def start(self) -> None:
-        with app.session.database.managed_session() as session:
-            for client in self.clients:
-                client.game = self
-
-                # Initialize member card
-                client.member_card = MemberCard(client)
-
-                # Initialize power cards
-                client.initialize_power_cards(session=session)
+        self.initialize_clients()
 
         # Wait for "prepare to battle" screen to end
-        time.sleep(3)
+        self.sleep(3)
+        self.initialize_players()
 
         # Close player select window
         for client in self.clients:
@@ -123,7 +127,7 @@ class Game:
 
         # Wait for loading screen to finish
         self.callbacks.wait_for_event('roomToRoomMinTime')
-        time.sleep(1)
+        self.sleep(1)
 
         # Wait for players to finish loading assets
         self.wait_for_players(lambda player: player.is_ready, timeout=20)
@@ -135,29 +139,28 @@ class Game:
         self.show_environment()
         self.spawn_ninjas()
 
-        for client in self.clients:
-            # Close loading screen
-            player_select = client.get_window(config.PLAYERSELECT_SWF)
-            player_select.send_action('closeCjsnowRoomToRoom')
-
-            # Load exit button
-            close_button = client.get_window('cardjitsu_snowclose.swf')
-            close_button.layer = 'bottomLayer'
-            close_button.load(
-                loadDescription="",
-                assetPath="",
-                xPercent=1,
-                yPercent=0
-            )
+        # Close loading screen
+        player_select = self.get_windows(config.PLAYERSELECT_SWF)
+        player_select.send_action('closeCjsnowRoomToRoom')
+
+        # Load exit button
+        close_button = self.get_windows('cardjitsu_snowclose.swf')
+        close_button.layer = 'bottomLayer'
+        close_button.load(
+            loadDescription="",
+            assetPath="",
+            xPercent=1,
+            yPercent=0
+        )
 
         # Wait for windows
-        time.sleep(1)
+        self.sleep(1)
 
         # Reset game time
-        self.game_start = time.time() + 1
+        self.game_start = self.now() + 1
 
         self.display_round_title()
-        time.sleep(1.6)
+        self.sleep(1.6)
 
         self.spawn_enemies()
         self.wait_for_window('cardjitsu_snowrounds.swf', loaded=False)
@@ -202,6 +205,72 @@ class Game:
         self.remove_objects()
         self.close()
 
+    def initialize_clients(self) -> None:
+        # Power cards & stamps are loaded in the background, during the "prepare to battle" screen
+        self.load_players()
+
+        for client in self.clients:
+            client.game = self
+
+            # Initialize member card
+            client.member_card = MemberCard(client)
+
+    def load_players(self) -> None:
+        """Start loading the power cards & stamps of all players, if that didn't happen already"""
+        if self.player_data is not None:
+            return
+
+        self.player_data = Future()
+        reactor.callInThread(self.fetch_players, self.player_data)  # type: ignore
+
+    def fetch_players(self, future: Future) -> None:
+        players = {
+            client.pid: client for client in self.clients
+            if not client.is_bot
+        }
+        decks = {pid: Deck() for pid in players}
+        owned_stamps = {pid: set() for pid in players}
+
+        if not players:
+            future.set_result((decks, owned_stamps))
+            return
+
+        try:
+            with app.session.database.managed_session() as session:
+                card_rows = cards.fetch_power_card_quantities_by_penguin_ids(list(players), session=session)
+                stamp_rows = stamps.fetch_ids_by_penguin_ids(list(players), 60, session=session)
+        except Exception as e:
+            future.set_exception(e)
+            return
+
+        for penguin_id, card_id, quantity in card_rows:
+            card = cards.fetch_one(card_id)
+
+            if card is None or card.element != players[penguin_id].card_element:
+                continue
+
+            decks[penguin_id].add(card, quantity)
+
+        for penguin_id, stamp_id in stamp_rows:
+            owned_stamps[penguin_id].add(stamp_id)
+
+        future.set_result((decks, owned_stamps))
+
+    def initialize_players(self) -> None:
+        self.load_players()
+
+        try:
+            decks, owned_stamps = self.player_data.result(timeout=10)
+        except Exception as e:
+            self.logger.error(f'Failed to load players: {e}', exc_info=e)
+            decks, owned_stamps = {}, {}
+
+        for client in self.clients:
+            client.power_cards = decks.get(client.pid, Deck())
+
+            # Stamps will be looked up one by one, if they couldn't be loaded
+            client.owned_stamps = owned_stamps.get(client.pid)
+
     def close(self) -> None:
         self.logger.info('Game closed')
         self.server.games.remove(self)
@@ -263,7 +332,7 @@ class Game:
             self.remove_enemies()
 
             self.display_round_title()
-            time.sleep(1.6)
+            self.sleep(1.6)
 
             # Create new enemies
             self.create_enemies()
@@ -272,6 +341,8 @@ class Game:
 
     def run_until_next_round(self) -> None:
         while True:
+            self.turn += 1
+
             for client in self.clients:
                 client.selected_card = None
                 client.is_ready = False
@@ -291,7 +362,7 @@ class Game:
             self.hide_ghosts()
             self.remove_ui()
             self.hide_targets()
-            time.sleep(1.25)
+            self.sleep(1.25)
 
             # Sometimes the targets are still visible?
             self.hide_targets()
@@ -358,58 +429,77 @@ class Game:
 
         return False
 
-    def send_tag(self, tag: str, *args) -> None:
-        for player in self.clients:
-            player.send_tag(tag, *args)
+    def get_windows(self, name: str) -> WindowBroadcast:
+        """Get a window of every client, to send the same events to all of them"""
+        return WindowBroadcast([client.get_window(name) for client in self.clients])
 
-    def wait_for_players(self, condition: Callable, timeout=8) -> None:
-        """Wait for all players to finish a condition"""
-        start_time = time.time()
+    def send_tag(self, tag: str, *args) -> None:
+        self.send_encoded_tag(tag, MetaplaceProtocol.encode_tag(tag, *args))
 
+    def send_encoded_tag(self, tag: str, data: bytes) -> None:
         for player in self.clients:
-            if player.disconnected:
-                continue
+            player.send_encoded_tag(tag, data)
 
-            if player.is_bot:
-                continue
+    def now(self) -> float:
+        """Get the current time of the game"""
+        return time.time()
 
-            while not condition(player) and not self.server.shutting_down:
-                if time.time() - start_time > timeout:
-                    self.logger.warning(f'Player Timeout: {player}')
-                    return
+    def sleep(self, seconds: float) -> None:
+        """Block the game thread, e.g. while an animation is playing"""
+        time.sleep(seconds)
 
-                time.sleep(0.05)
+    def call_later(self, seconds: float, func: Callable, *args, **kwargs) -> None:
+        """Call a function after a delay, without blocking the game thread"""
+        reactor.callLater(seconds, func, *args, **kwargs)  # type: ignore
 
-    def wait_for_animations(self, timeout=8) -> None:
-        """Wait for all animations to finish"""
-        start_time = time.time()
+    def notify(self) -> None:
+        """Wake up the game thread, if it is waiting for a state change"""
+        with self.condition:
+            self.condition.notify_all()
 
-        while self.callbacks.pending_animations:
-            if time.time() - start_time > timeout:
-                self.logger.warning(f'Animation Timeout: {self.callbacks.pending_animations}')
-                self.callbacks.reset_animations()
-                break
+    def wait_until(self, predicate: Callable[[], bool], timeout: float) -> bool:
+        """Block the game thread until the predicate is met or the timeout expires"""
+        with self.condition:
+            return self.condition.wait_for(predicate, timeout)
 
-            time.sleep(0.05)
+    def wait_for_players(self, condition: Callable, timeout=8) -> None:
+        """Wait for all players to finish a condition"""
+        players = [
+            player for player in self.clients
+            if not player.disconnected
+            and not player.is_bot
+        ]
 
-    def wait_for_window(self, name: str, loaded=True, timeout=8) -> None:
-        """Wait for a window to load/close"""
-        for client in self.clients:
-            if client.is_bot:
-                continue
+        def players_finished() -> bool:
+            if self.server.shutting_down:
+                return True
 
-            window = client.get_window(name)
-            start_time = time.time()
+            return all(
+                condition(player) or player.disconnected
+                for player in players
+            )
 
-            while window.loaded != loaded:
-                if client.disconnected:
-                    break
+        if not self.wait_until(players_finished, timeout):
+            self.logger.warning(f'Player Timeout: {players}')
 
-                if time.time() - start_time > timeout:
-                    self.logger.warning(f'Window Timeout: {name}')
-                    break
+    def wait_for_animations(self, timeout=8) -> None:
+        """Wait for all animations to finish"""
+        self.callbacks.wait_for_animations(timeout)
+
+    def wait_for_window(self, window: str | WindowStates, loaded=True, timeout=8) -> None:
+        """Wait for the window of every player to load/close, or for the states returned by a broadcast"""
+        if isinstance(window, str):
+            window = WindowStates([
+                WindowState(player.get_window(window), loaded)
+                for player in self.clients
+                if not player.is_bot
+            ])
 
-            time.sleep(0.05)
+        def windows_finished() -> bool:
+            return self.server.shutting_down or window.done
+
+        if not self.wait_until(windows_finished, timeout):
+            self.logger.warning(f'Window Timeout: {window}')
 
     def wait_for_timer(self) -> None:
         """Wait for the timer to finish"""
@@ -515,6 +605,7 @@ class Game:
             )
             for x, y in rock_positions
         ]
+        self.grid.update_obstacles()
 
         for rock in self.rocks:
             rock.place_object()
@@ -653,7 +744,7 @@ class Game:
                     # Unlock "Heal 15" stamp
                     self.snow.unlock_stamp(477)
 
-                time.sleep(1)
+                self.sleep(1)
 
     def do_powercard_attacks(self) -> None:
         ninjas_with_cards = [
@@ -683,7 +774,7 @@ class Game:
 
         for ninja in ninjas_with_cards:
             ninja.use_powercard(is_combo)
-            time.sleep(1)
+            self.sleep(1)
 
     def do_ninja_revive(self) -> None:
         ninjas_with_member_cards = [
@@ -692,30 +783,29 @@ class Game:
         ]
 
         if ninjas_with_member_cards:
-            for client in self.clients:
-                if client.disconnected:
-                    continue
-
-                revive_splash = client.get_window('cardjitsu_snowrevive.swf')
-                revive_splash.load(
-                    xPercent=0.2,
-                    yPercent=0
-                )
+            revive_splash = self.get_windows('cardjitsu_snowrevive.swf')
+            state = revive_splash.load(
+                xPercent=0.2,
+                yPercent=0
+            )
 
             # Wait for revive splash to load and close
-            self.wait_for_window('cardjitsu_snowrevive.swf', loaded=True)
+            self.wait_for_window(state)
             self.wait_for_window('cardjitsu_snowrevive.swf', loaded=False)
 
             for ninja in ninjas_with_member_cards:
                 ninja.member_card.consume()
-                time.sleep(1)
+                self.sleep(1)
 
     def do_enemy_actions(self) -> None:
         if config.DISABLE_ENEMY_AI:
             return
 
+        # Ninjas don't move during the enemy phase
+        self.pathfinder.update()
+
         for enemy in self.enemies:
-            time.sleep(0.5)
+            self.sleep(0.5)
 
             if enemy.hp <= 0:
                 # Enemy is dead
@@ -772,22 +862,21 @@ class Game:
             enemy.idle_animation()
 
     def show_ui(self) -> None:
-        for client in self.clients:
-            snow_ui = client.get_window('cardjitsu_snowui.swf')
-            snow_ui.layer = 'bottomLayer'
-            snow_ui.load(
-                {
-                    'cardsAssetPath': config.CARDS_ASSET_LOCATION,
-                    'element': client.element,
-                    'isMember': client.is_member,
-                },
-                loadDescription="",
-                assetPath="",
-                xPercent=0.5,
-                yPercent=1
-            )
+        snow_ui = self.get_windows('cardjitsu_snowui.swf')
+        snow_ui.layer = 'bottomLayer'
+        state = snow_ui.load(
+            {'cardsAssetPath': config.CARDS_ASSET_LOCATION},
+            per_client=lambda client: {
+                'element': client.element,
+                'isMember': client.is_member
+            },
+            loadDescription="",
+            assetPath="",
+            xPercent=0.5,
+            yPercent=1
+        )
 
-        self.wait_for_window('cardjitsu_snowui.swf', loaded=True)
+        self.wait_for_window(state)
 
     def send_tip(self, phase: TipPhase, client: "Penguin" | None = None) -> None:
         clients = [client] if client else self.clients
@@ -816,14 +905,12 @@ class Game:
         client.hide_tip()
 
     def enable_cards(self) -> None:
-        for client in self.clients:
-            snow_ui = client.get_window('cardjitsu_snowui.swf')
-            snow_ui.send_payload('enableCards')
+        snow_ui = self.get_windows('cardjitsu_snowui.swf')
+        snow_ui.send_payload('enableCards')
 
     def disable_cards(self) -> None:
-        for client in self.clients:
-            snow_ui = client.get_window('cardjitsu_snowui.swf')
-            snow_ui.send_payload('disableCards')
+        snow_ui = self.get_windows('cardjitsu_snowui.swf')
+        snow_ui.send_payload('disableCards')
 
     def update_cards(self) -> None:
         for client in self.clients:
@@ -834,43 +921,37 @@ class Game:
             client.unlock_stamp(id)
 
     def display_round_title(self) -> None:
-        round_time = ((self.game_start + 300) - time.time()) * 1000
-
-        for client in self.clients:
-            round_title = client.get_window('cardjitsu_snowrounds.swf')
-            round_title.layer = 'bottomLayer'
-            round_title.load(
-                {
-                    'bonusCriteria': self.bonus_criteria,
-                    'remainingTime': max(0, round_time),
-                    'roundNumber': self.round
-                },
-                loadDescription="",
-                assetPath="",
-                xPercent=0.15,
-                yPercent=0.15
-            )
+        round_time = ((self.game_start + 300) - self.now()) * 1000
+
+        round_title = self.get_windows('cardjitsu_snowrounds.swf')
+        round_title.layer = 'bottomLayer'
+        state = round_title.load(
+            {
+                'bonusCriteria': self.bonus_criteria,
+                'remainingTime': max(0, round_time),
+                'roundNumber': self.round
+            },
+            loadDescription="",
+            assetPath="",
+            xPercent=0.15,
+            yPercent=0.15
+        )
 
-        self.wait_for_window('cardjitsu_snowrounds.swf', loaded=True)
+        self.wait_for_window(state)
 
     def display_combo_title(self, elements: List[str]) -> None:
-        for client in self.clients:
-            combo_title = client.get_window('cardjitsu_snowcombos.swf')
-            combo_title.layer = 'bottomLayer'
-            combo_title.load(
-                {'data': elements},
-                loadDescription="",
-                assetPath="",
-                xPercent=0.5,
-                yPercent=0.5
-            )
-
-        self.wait_for_window(
-            'cardjitsu_snowcombos.swf',
-            loaded=True,
-            timeout=4
+        combo_title = self.get_windows('cardjitsu_snowcombos.swf')
+        combo_title.layer = 'bottomLayer'
+        state = combo_title.load(
+            {'data': elements},
+            loadDescription="",
+            assetPath="",
+            xPercent=0.5,
+            yPercent=0.5
         )
 
+        self.wait_for_window(state, timeout=4)
+
     def get_payout_round(self) -> int:
         """Get the round number for the payout screen"""
         if self.round >= 3:
@@ -884,6 +965,47 @@ class Game:
         # Players have been defeated
         return self.round + 1
 
+    def collected_stamps(self, client: "Penguin", group_stamps: List[Stamp], session=None) -> List[int]:
+        """Get the collected stamps of a group, including the ones of this match, which might not be written yet"""
+        if client.owned_stamps is not None:
+            return [
+                stamp.id for stamp in group_stamps
+                if stamp.id in client.owned_stamps
+            ]
+
+        group_ids = {stamp.id for stamp in group_stamps}
+        group_id = group_stamps[0].group_id if group_stamps else None
+
+        collected = [
+            stamp.id for stamp in
+            stamps.fetch_by_penguin_id(client.pid, group_id, session=session)
+        ] if group_id else []
+
+        collected.extend(
+            id for id in client.unlocked_stamps
+            if id in group_ids and id not in collected
+        )
+        return collected
+
+    def encode_stamp_list(self, group_stamps: List[Stamp]) -> str:
+        """Serialize the stamp list of the payout screen, which is the same for every client"""
+        return json.dumps({
+            "stampList": [
+                {
+                    "stamp_id": stamp.id,
+                    "name": f'global_content.stamps.{stamp.id}.name',
+                    "description": f'global_content.stamps.{stamp.id}.description',
+                    "rank_token": f'global_content.stamps.{stamp.id}.rank_token',
+                    "rank": stamp.rank,
+                    "is_member": stamp.member,
+                }
+                for stamp in group_stamps
+            ]
+        })
+
+    def completed_stamps(self, client: "Penguin", group_stamps: List[Stamp], session=None) -> bool:
+        return len(self.collected_stamps(client, group_stamps, session)) == len(group_stamps)
+
     def display_payout(self) -> None:
         if config.ENABLE_BETA:
             self.display_beta_payout()
@@ -891,6 +1013,7 @@ class Game:
 
         with app.session.database.managed_session() as session:
             snow_stamps = stamps.fetch_all_by_group(60, session=session)
+            stamp_list = self.encode_stamp_list(snow_stamps)
 
             for client in self.clients:
                 if client.disconnected:
@@ -914,14 +1037,14 @@ class Game:
                     exp_percentage = 100
 
                 # Enable double coins when player has unlocked all stamps
-                double_coins = stamps.completed_group(client.pid, 60, session=session)
+                double_coins = self.completed_stamps(client, snow_stamps, session)
                 coins = self.coins * (2 if double_coins else 1)
 
                 updates = {
-                    'coins': client.object.coins + coins,
                     'snow_ninja_rank': result_rank,
                     'snow_ninja_progress': exp_percentage  % 100
                 }
+                increments = {'coins': coins}
 
                 if result_rank >= 13:
                     # Unlock "Snow Pro" stamp
@@ -930,10 +1053,10 @@ class Game:
                 if len(self.enemies) <= 0:
                     # Update win count
                     key = f'snow_progress_{client.element}_wins'
-                    wins = getattr(client.object, key, 0)
-                    updates[key] = wins + 1
+                    wins = getattr(client.object, key, 0) + 1
+                    increments[key] = 1
 
-                    if updates[key] >= 3:
+                    if wins >= 3:
                         stamp_ids = {
                             'fire': 470,
                             'water': 471,
@@ -948,10 +1071,8 @@ class Game:
 
                 if not config.DISABLE_REWARDS:
                     # Update penguin data
-                    penguins.update(
-                        client.pid, updates,
-                        session=session
-                    )
+                    app.session.writer.update_penguin(client.pid, updates)
+                    app.session.writer.increment_penguin(client.pid, increments)
 
                     if result_rank != client.object.snow_ninja_rank:
                         self.logger.info(f'{client} ranked up from {client.object.snow_ninja_rank} to {result_rank}')
@@ -961,10 +1082,7 @@ class Game:
                             continue
 
                         # Add item to inventory
-                        items.add(
-                            client.pid, item,
-                            session=session
-                        )
+                        app.session.writer.add_item(client.pid, item)
 
                         self.logger.info(f'{client} unlocked item {item}')
 
@@ -980,27 +1098,17 @@ class Game:
                         "rank": client.object.snow_ninja_rank + 1,
                         "round": self.get_payout_round(),
                         "showItems": 0,
-                        "stampList": [
-                            {
-                                "stamp_id": stamp.id,
-                                "name": f'global_content.stamps.{stamp.id}.name',
-                                "description": f'global_content.stamps.{stamp.id}.description',
-                                "rank_token": f'global_content.stamps.{stamp.id}.rank_token',
-                                "rank": stamp.rank,
-                                "is_member": stamp.member,
-                            }
-                            for stamp in snow_stamps
-                        ],
                         "stamps": [
                             {
-                                "_id": stamp.id,
-                                "new": stamp.id in client.unlocked_stamps
+                                "_id": stamp_id,
+                                "new": stamp_id in client.unlocked_stamps
                             }
-                            for stamp in stamps.fetch_by_penguin_id(client.pid, 60)
+                            for stamp_id in self.collected_stamps(client, snow_stamps, session)
                         ],
                         "xpStart": client.object.snow_ninja_progress,
                         "xpEnd": exp_percentage if result_rank < 24 else 100,
                     },
+                    shared_payload=stamp_list,
                     loadDescription="",
                     assetPath="",
                     xPercent=0.08,
@@ -1008,52 +1116,47 @@ class Game:
                 )
 
     def display_beta_payout(self) -> None:
-        with app.session.database.managed_session() as session:
-            for client in self.clients:
-                if client.disconnected:
-                    continue
+        for client in self.clients:
+            if client.disconnected:
+                continue
 
-                # Calculate percentage based on round
-                exp_gained = (self.get_payout_round() * 11) + 1
-                beta_reward_item = 1600
+            # Calculate percentage based on round
+            exp_gained = (self.get_payout_round() * 11) + 1
+            beta_reward_item = 1600
 
-                if not config.DISABLE_REWARDS:
+            if not config.DISABLE_REWARDS:
 
-                    if exp_gained >= 100:
-                        # Add item to inventory
-                        items.add(
-                            client.pid,
-                            item_id=beta_reward_item,
-                            session=session
-                        )
+                if exp_gained >= 100:
+                    # Add item to inventory
+                    app.session.writer.add_item(client.pid, beta_reward_item)
 
-                        self.logger.info(f'{client} unlocked item {beta_reward_item}')
+                    self.logger.info(f'{client} unlocked item {beta_reward_item}')
 
-                # Display payout swf window
-                payout = client.get_window('cardjitsu_snowpayoutbeta.swf')
-                payout.layer = 'bottomLayer'
-                payout.load(
-                    {
-                        "coinsEarned": 0,
-                        "doubleCoins": False,
-                        "damage": 0, # Only important for tusk battle
-                        "isBoss": 0,
-                        "rank": 24,
-                        "round": self.get_payout_round(),
-                        "showItems": 0, # Only important for tusk battle
-                        "stampList": [],
-                        "stamps": [],
-                        "xpStart": 0,
-                        "xpEnd": exp_gained
-                    },
-                    loadDescription="",
-                    assetPath="",
-                    xPercent=0.08,
-                    yPercent=0.05
-                )
+            # Display payout swf window
+            payout = client.get_window('cardjitsu_snowpayoutbeta.swf')
+            payout.layer = 'bottomLayer'
+            payout.load(
+                {
+                    "coinsEarned": 0,
+                    "doubleCoins": False,
+                    "damage": 0, # Only important for tusk battle
+                    "isBoss": 0,
+                    "rank": 24,
+                    "round": self.get_payout_round(),
+                    "showItems": 0, # Only important for tusk battle
+                    "stampList": [],
+                    "stamps": [],
+                    "xpStart": 0,
+                    "xpEnd": exp_gained
+                },
+                loadDescription="",
+                assetPath="",
+                xPercent=0.08,
+                yPercent=0.05
+            )
 
     def display_win_sequence(self) -> None:
-        time.sleep(2)
+        self.sleep(2)
 
         if all(ninja.hp <= 0 for ninja in self.ninjas):
             return
@@ -1067,4 +1170,4 @@ class Game:
 
             ninja.win_animation()
 
-        time.sleep(3.5)
+        self.sleep(3.5)
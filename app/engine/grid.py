@@ -1,7 +1,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Tuple, Iterator
+from typing import TYPE_CHECKING, ClassVar, Dict, FrozenSet, List, Tuple, Iterator
 from app.objects.enemies import Enemy
 from app.objects.ninjas import Ninja
 from app.objects import GameObject
@@ -11,49 +11,136 @@ if TYPE_CHECKING:
     from app.engine.penguin import Penguin
     from app.engine.game import Game
 
+from threading import RLock
+
 import random
 import math
 
 class Grid:
+    # Distances between all tiles, for every obstacle layout
+    distance_tables: ClassVar[Dict[Tuple[int, int, FrozenSet[Tuple[int, int]]], List[int | float]]] = {}
+
     def __init__(self, x_range: int, y_range: int, game: "Game") -> None:
-        self.array: List[List[GameObject | None]] = [[None] * y_range for _ in range(x_range)]
+        self.width = x_range
+        self.height = y_range
+        self.cells: List[GameObject | None] = [None] * (x_range * y_range)
+        self.tile_cells: List[GameObject | None] = [None] * (x_range * y_range)
+        self.positions: Dict[int, int] = {}
+        self.occupied: int = 0
+        self.lock = RLock()
         self.tiles: List[GameObject] = []
         self.x_range = range(x_range)
         self.y_range = range(y_range)
         self.game = game
 
+        self._objects: Tuple[GameObject, ...] | None = ()
+        self._obstacles: FrozenSet[Tuple[int, int]] | None = None
+        self._distances: List[int | float] | None = None
+
     def __repr__(self) -> str:
         return f"<Grid ({self.array})>"
 
     def __getitem__(self, index: Tuple[int, int]) -> GameObject | None:
         if self.is_valid(*index):
-            return self.array[index[0]][index[1]]
+            return self.cells[self.index(*index)]
 
     def __setitem__(self, index: Tuple[int, int], value: GameObject | None) -> None:
         if not self.is_valid(*index):
             return
 
-        self.array[index[0]][index[1]] = value
+        cell = self.index(*index)
+
+        # The grid is changed by both the reactor and the game thread
+        with self.lock:
+            if (previous := self.cells[cell]) is not None:
+                # The previous object is no longer on the grid
+                self.positions.pop(id(previous), None)
 
-        if value is not None:
-            value.x, value.y = index[0], index[1]
+            if value is not None:
+                if (position := self.positions.get(id(value))) is not None:
+                    # Object was moved from another tile
+                    self.clear(position)
+
+                self.positions[id(value)] = cell
+                self.occupied |= 1 << cell
+                value.x, value.y = index[0], index[1]
+            else:
+                self.occupied &= ~(1 << cell)
+
+            self.cells[cell] = value
+            self._objects = None
+
+    @property
+    def array(self) -> List[List[GameObject | None]]:
+        """Get the grid as a 2D array, indexed by x and y"""
+        return [
+            self.cells[x * self.height:(x + 1) * self.height]
+            for x in self.x_range
+        ]
 
     @property
-    def obstacles(self) -> List[Tuple[int, int]]:
+    def obstacles(self) -> FrozenSet[Tuple[int, int]]:
         """Get all "obstacles" on the grid"""
-        return (
-            [(obj.x, obj.y) for obj in self.game.rocks]
-            # TODO: Should ninjas & enemies be obstacles?
-        )
+        if self._obstacles is None:
+            self._obstacles = frozenset(
+                (obj.x, obj.y) for obj in self.game.rocks
+                # TODO: Should ninjas & enemies be obstacles?
+            )
+
+        return self._obstacles
 
     @property
-    def objects(self) -> List[GameObject]:
+    def distances(self) -> List[int | float]:
+        """Get the distances between all tiles for the current obstacles, indexed by `start * size + target`"""
+        if self._distances is not None:
+            return self._distances
+
+        key = (self.width, self.height, self.obstacles)
+
+        if key not in self.distance_tables:
+            tiles = [(x, y) for x in self.x_range for y in self.y_range]
+
+            self.distance_tables[key] = [
+                self.calculate_distance_with_obstacles(start, target)
+                for start in tiles
+                for target in tiles
+            ]
+
+        self._distances = self.distance_tables[key]
+        return self._distances
+
+    def update_obstacles(self) -> None:
+        """Invalidate the cached obstacles, after the rocks have changed"""
+        self._obstacles = None
+        self._distances = None
+
+    @property
+    def objects(self) -> Tuple[GameObject, ...]:
         """Get all objects on the grid"""
-        return [
-            obj for row in self.array
-            for obj in row
-            if obj is not None
-        ]
+        if (objects := self._objects) is not None:
+            return objects
+
+        with self.lock:
+            # Cache the snapshot only while no other thread changes the grid
+            objects = tuple(obj for obj in self.cells if obj is not None)
+            self._objects = objects
+
+        return objects
+
+    def index(self, x: int, y: int) -> int:
+        """Get the index of a tile inside of the flat cell array"""
+        return int(x) * self.height + int(y)
+
+    def clear(self, cell: int) -> None:
+        """Remove the object at a cell index"""
+        with self.lock:
+            if (previous := self.cells[cell]) is None:
+                return
+
+            self.positions.pop(id(previous), None)
+            self.occupied &= ~(1 << cell)
+            self.cells[cell] = None
+            self._objects = None
 
     def add(self, obj: GameObject) -> None:
         """Add a game object to the grid"""
@@ -61,22 +148,25 @@ class Grid:
 
     def remove(self, obj: GameObject) -> None:
         """Remove a game object from the grid"""
-        x, y = self.coordinates(obj)
-        self[x, y] = None
+        with self.lock:
+            if (cell := self.positions.get(id(obj))) is None:
+                return
+
+            if self.cells[cell] is obj:
+                self.clear(cell)
 
     def move(self, obj: GameObject, x: int, y: int) -> None:
         """Move a game object to a new location"""
-        self.remove(obj)
-        self[x, y] = obj
+        with self.lock:
+            self.remove(obj)
+            self[x, y] = obj
 
     def coordinates(self, obj: GameObject) -> Tuple[int, int]:
         """Get the coordinates of an object"""
-        for x in range(9):
-            for y in range(5):
-                if self[x, y] != obj:
-                    continue
-                return (x, y)
-        return (-1, -1)
+        if (cell := self.positions.get(id(obj))) is None:
+            return (-1, -1)
+
+        return divmod(cell, self.height)
 
     def distance(self, start: Tuple[int, int], target: Tuple[int, int]) -> int:
         """Get the manhatten distance between two tiles"""
@@ -84,6 +174,14 @@ class Grid:
 
     def distance_with_obstacles(self, start: Tuple[int, int], target: Tuple[int, int]) -> int | float:
         """Get the Manhattan distance between two tiles, accounting for obstacles"""
+        if not self.is_valid(*start) or not self.is_valid(*target):
+            return self.calculate_distance_with_obstacles(start, target)
+
+        size = len(self.cells)
+        return self.distances[self.index(*start) * size + self.index(*target)]
+
+    def calculate_distance_with_obstacles(self, start: Tuple[int, int], target: Tuple[int, int]) -> int | float:
+        """Calculate the Manhattan distance between two tiles, accounting for obstacles"""
         if target in self.obstacles:
             return math.inf
 
@@ -134,7 +232,7 @@ class Grid:
         if not self.is_valid(x, y):
             return False
 
-        return self[x, y] is None
+        return not self.occupied >> self.index(x, y) & 1
 
     def can_move_to_tile(self, ninja: Ninja, x: int, y: int) -> bool:
         """Check if a ninja can move to a tile"""
@@ -165,6 +263,7 @@ class Grid:
                     y_offset=0.9998
                 )
                 self.tiles.append(tile)
+                self.tile_cells[self.index(x, y)] = tile
                 tile.place_object()
 
     def show_tiles(self) -> None:
@@ -251,7 +350,8 @@ class Grid:
 
     def get_tile(self, x: int, y: int) -> GameObject | None:
         """Get a tile by its coordinates"""
-        return next((tile for tile in self.tiles if tile.x == x and tile.y == y), None)
+        if self.is_valid(x, y):
+            return self.tile_cells[self.index(x, y)]
 
     def on_tile_click(self, client: "Penguin", tile: GameObject, *args) -> None:
         if client.selected_card:
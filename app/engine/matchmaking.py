@@ -1,10 +1,18 @@
 
 from __future__ import annotations
 
-from twisted.internet import reactor
-from typing import List
+from twisted.internet.defer import Deferred, gatherResults
+from twisted.internet.task import LoopingCall
+from typing import TYPE_CHECKING, Dict, List, Set, Tuple
+from collections import defaultdict
+from bisect import bisect_left, insort
+from itertools import count
+
+if TYPE_CHECKING:
+    from .cluster import Cluster
 
 from ..objects.collections import Players
+from .shards import ShardClient, run_game
 from .penguin import Penguin
 from .tusk import TuskGame
 from .ai import PenguinAI
@@ -12,67 +20,209 @@ from .game import Game
 
 import logging
 import config
+import math
 import time
 
 class MatchmakingQueue:
+    """
+    Keeps one queue per battle mode & element, ordered by snow ninja rank.
+    Matches are formed from the closest ranks within a rank window, that
+    widens the longer a player has been waiting. A single periodic sweep
+    retries waiting players and force-starts matches after the timeout.
+    """
+
     def __init__(self) -> None:
         self.players = Players()
+        self.queues: Dict[Tuple[int, str], List[Tuple[int, float, int, Penguin]]] = defaultdict(list)
+        self.entries: Dict[Penguin, Tuple[int, float, int, Penguin]] = {}
+        self.locations: Dict[Penguin, Tuple[int, str]] = {}
+        self.sequence = count()
+        self.sweeper = LoopingCall(self.sweep)
+        self.cluster: "Cluster" | None = None
+        self.claiming: Set[Penguin] = set()
         self.logger = logging.getLogger('Matchmaking')
 
+    def start(self, interval: float = 1) -> None:
+        self.sweeper.start(interval, now=False)
+
+    def stop(self) -> None:
+        if self.sweeper.running:
+            self.sweeper.stop()
+
     def add(self, player: Penguin) -> None:
+        if player in self.players:
+            # Player might have selected a different element
+            self.dequeue(player)
+
         self.players.add(player)
 
         player.logger.info(f'Joined matchmaking queue with "{player.element}"')
         player.queue_time = time.time()
         player.in_queue = True
 
-        if len(match := self.find_match(player)) >= 3:
-            self.logger.info(f'Found match: {match}')
+        entry = (
+            player.object.snow_ninja_rank,
+            player.queue_time,
+            next(self.sequence),
+            player
+        )
+        location = (player.battle_mode, player.element)
+        insort(self.queues[location], entry)
+        self.entries[player] = entry
+        self.locations[player] = location
 
-            match_types = {
-                0: self.create_normal_game,
-                1: self.create_tusk_game
-            }
+        if not self.cluster:
+            self.try_match(player)
+            return
 
-            return match_types[player.battle_mode](*match)
+        def pushed(_) -> None:
+            if player in self.entries:
+                self.try_match(player)
 
-        reactor.callLater(  # type: ignore
-            config.MATCHMAKING_TIMEOUT,
-            self.fill_queue, player
-        )
+        # Make the player visible to the other nodes, before claiming a match
+        self.cluster.push(player).addCallback(pushed)
 
     def remove(self, player: Penguin) -> None:
         if player in self.players:
+            self.dequeue(player)
             self.players.remove(player)
 
             player.logger.info('Left matchmaking queue')
             player.in_queue = False
 
-    def find_match(self, player: Penguin) -> List[Penguin]:
+    def dequeue(self, player: Penguin) -> None:
+        if not (entry := self.entries.pop(player, None)):
+            return
+
+        queue = self.queues[self.locations.pop(player)]
+        index = bisect_left(queue, entry)
+
+        if index < len(queue) and queue[index] is entry:
+            del queue[index]
+
+        if self.cluster:
+            self.cluster.withdraw(player)
+
+    def sweep(self) -> None:
+        """Retry matching for all queued players, oldest first"""
+        for entry in sorted(self.entries.values(), key=lambda entry: entry[1]):
+            player = entry[3]
+
+            if player not in self.entries:
+                # Player was matched during this sweep
+                continue
+
+            if self.try_match(player):
+                continue
+
+            if (time.time() - player.queue_time) >= config.MATCHMAKING_TIMEOUT:
+                self.fill_queue(player)
+
+    def try_match(self, player: Penguin) -> bool:
+        if self.cluster:
+            return self.try_cluster_match(player)
+
+        if len(match := self.find_match(player, self.rank_window(player))) < 3:
+            return False
+
+        self.logger.info(f'Found match: {match}')
+
+        match_types = {
+            0: self.create_normal_game,
+            1: self.create_tusk_game
+        }
+        match_types[player.battle_mode](*match)
+        return True
+
+    def try_cluster_match(self, player: Penguin) -> bool:
+        """Claim a match from the shared queue. The result arrives later, so the player counts as handled."""
+        if player in self.claiming:
+            # Previous claim has not finished yet
+            return True
+
+        self.claiming.add(player)
+
+        deferred = self.cluster.claim(player, self.rank_window(player))
+        deferred.addCallback(self.cluster_match_claimed, player)
+        deferred.addErrback(self.cluster_match_failed)
+        deferred.addBoth(lambda _: self.claiming.discard(player))
+        return True
+
+    def cluster_match_claimed(self, match: List[Penguin] | None, player: Penguin) -> Deferred | None:
+        if match is None:
+            if player in self.players and (time.time() - player.queue_time) >= config.MATCHMAKING_TIMEOUT:
+                return self.fill_queue(player)
+
+            return None
+
+        if not match:
+            # Every local player has left, while the match was claimed
+            return None
+
+        # Local players might have left, after they were claimed
+        match = self.get_none_players(match)
+        self.logger.info(f'Found match across nodes: {match}')
+
+        match_types = {
+            0: self.create_normal_game,
+            1: self.create_tusk_game
+        }
+        match_types[player.battle_mode](*match)
+        return None
+
+    def cluster_match_failed(self, failure) -> None:
+        self.logger.error(f'Failed to create match: {failure.getErrorMessage()}', exc_info=failure.value)
+
+    def rank_window(self, player: Penguin) -> float:
+        """Get the accepted rank difference, based on how long a player has been waiting"""
+        waiting_time = time.time() - player.queue_time
+        widening_time = max(config.MATCHMAKING_TIMEOUT / 2, 1)
+
+        # The window covers every rank, once the player
+        # could be force-started by the fill_queue method
+        return config.MATCHMAKING_RANK_WINDOW + 24 * (waiting_time / widening_time)
+
+    def closest_rank(self, player: Penguin, element: str) -> Penguin | None:
+        """Get the player with the closest rank, that is queued with the given element"""
+        queue = self.queues.get((player.battle_mode, element))
+
+        if not queue:
+            return None
+
+        rank = player.object.snow_ninja_rank
+        index = bisect_left(queue, (rank,))
+        candidates = []
+
+        if index < len(queue):
+            candidates.append(queue[index])
+
+        if index > 0:
+            # Prefer the longest waiting player of the next lower rank
+            lower_rank = queue[index - 1][0]
+            candidates.append(queue[bisect_left(queue, (lower_rank,))])
+
+        closest = min(candidates, key=lambda entry: (abs(entry[0] - rank), entry[1]))
+        return closest[3]
+
+    def find_match(self, player: Penguin, rank_window: float = math.inf) -> List[Penguin]:
         elements = ['snow', 'water', 'fire']
         elements.remove(player.element)
 
         players = [player]
 
         for element in elements:
-            matches = self.players.with_element(
-                element,
-                player.battle_mode
-            )
-
-            if not matches:
+            if not (match := self.closest_rank(player, element)):
                 continue
 
-            # Sort by closest rank
-            matches.sort(
-                key=lambda other: abs(
-                    player.object.snow_ninja_rank -
-                    other.object.snow_ninja_rank
-                )
+            rank_difference = abs(
+                player.object.snow_ninja_rank -
+                match.object.snow_ninja_rank
             )
 
-            # Add closest match
-            players.append(matches[0])
+            if rank_difference > max(rank_window, self.rank_window(match)):
+                continue
+
+            players.append(match)
 
         players.sort(key=lambda x: x.element)
         return players
@@ -120,6 +270,10 @@ class MatchmakingQueue:
             # Player has found a match
             return
 
+        if player not in self.players:
+            # Player has left the queue
+            return
+
         # Find other players in queue
         players = self.find_match(player)
 
@@ -131,6 +285,43 @@ class MatchmakingQueue:
             if (time.time() - p.queue_time) >= required_time
         ]
 
+        if self.cluster:
+            return self.fill_cluster_queue(player, players)
+
+        self.start_filled_match(player, players)
+
+    def fill_cluster_queue(self, player: Penguin, players: List[Penguin]) -> Deferred:
+        """Withdraw the players from the shared queue, before they get force-started"""
+        others = [p for p in players if p is not player]
+
+        def others_withdrawn(results: List[bool]) -> None:
+            self.start_filled_match(
+                player,
+                [player, *(p for p, withdrawn in zip(others, results) if withdrawn)]
+            )
+
+        def player_withdrawn(withdrawn: bool) -> Deferred | None:
+            if not withdrawn:
+                # Player has been claimed by another node
+                return None
+
+            deferred = gatherResults([self.cluster.withdraw(p) for p in others])
+            deferred.addCallback(others_withdrawn)
+            return deferred
+
+        return self.cluster.withdraw(player).addCallback(player_withdrawn)
+
+    def start_filled_match(self, player: Penguin, players: List[Penguin]) -> None:
+        # Players might have left the queue, while they were withdrawn
+        players = [p for p in players if p in self.players and not p.in_game]
+
+        if player not in players:
+            if self.cluster:
+                for p in players:
+                    # Make the other players visible again
+                    self.cluster.push(p)
+            return
+
         if config.ENABLE_NINJA_AI:
             # Fill up missing players with bots
             players = self.insert_ai_players(players)
@@ -147,10 +338,17 @@ class MatchmakingQueue:
         match_types[player.battle_mode](*players)
 
     def create_normal_game(self, fire: Penguin | None, snow: Penguin | None, water: Penguin | None) -> None:
-        game = Game(fire, snow, water)
-        game.server.games.add(game)
+        self.create_game(0, fire, snow, water)
+
+    def create_tusk_game(self, fire: Penguin | None, snow: Penguin | None, water: Penguin | None) -> None:
+        self.create_game(1, fire, snow, water)
+
+    def create_game(self, battle_mode: int, fire: Penguin | None, snow: Penguin | None, water: Penguin | None) -> None:
+        players = [fire, snow, water]
+        clients = [player for player in players if player is not None]
+        server = clients[0].server
 
-        for client in game.clients:
+        for client in clients:
             player_select = client.get_window(config.PLAYERSELECT_SWF)
             player_select.send_payload(
                 'matchFound',
@@ -164,26 +362,17 @@ class MatchmakingQueue:
             # Remove from matchmaking queue
             self.remove(client)
 
-        # Start game loop
-        game.server.runThread(game.start)
-
-    def create_tusk_game(self, fire: Penguin | None, snow: Penguin | None, water: Penguin | None) -> None:
-        game = TuskGame(fire, snow, water)
-        game.server.games.add(game)
+        relayed = any(isinstance(client, ShardClient) for client in clients)
 
-        for client in game.clients:
-            player_select = client.get_window(config.PLAYERSELECT_SWF)
-            player_select.send_payload(
-                'matchFound',
-                {
-                    1: fire.name if fire else None,
-                    2: water.name if water else None,
-                    4: snow.name if snow else None
-                }
-            )
+        if server.shards.available and not relayed:
+            # Let a worker process host the game
+            server.shards.start_game(battle_mode, players)
+            return
 
-            # Remove from matchmaking queue
-            self.remove(client)
+        game_class = TuskGame if battle_mode == 1 else Game
+        game = game_class(fire, snow, water)
+        game.load_players()
+        server.games.add(game)
 
         # Start game loop
-        game.server.runThread(game.start)
+        server.runThread(run_game, game)
@@ -0,0 +1,99 @@
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Tuple
+from collections import deque
+
+if TYPE_CHECKING:
+    from app.objects.ninjas import Ninja
+    from app.engine.grid import Grid
+
+import math
+
+class DistanceField:
+    """Walking distances from an origin tile to every tile of the grid, computed with a breadth-first search"""
+
+    def __init__(self, grid: "Grid", origin: Tuple[int, int], blocked: FrozenSet[Tuple[int, int]]) -> None:
+        self.grid = grid
+        self.origin = origin
+        self.distances: List[int | float] = [math.inf] * len(grid.cells)
+        self.search(blocked)
+
+    def __repr__(self) -> str:
+        return f'<DistanceField {self.origin}>'
+
+    def __getitem__(self, index: Tuple[int, int]) -> int | float:
+        if not self.grid.is_valid(*index):
+            return math.inf
+
+        return self.distances[self.grid.index(*index)]
+
+    def search(self, blocked: FrozenSet[Tuple[int, int]]) -> None:
+        if not self.grid.is_valid(*self.origin):
+            return
+
+        self.distances[self.grid.index(*self.origin)] = 0
+        queue = deque([self.origin])
+
+        while queue:
+            x, y = queue.popleft()
+            distance = self.distances[self.grid.index(x, y)] + 1
+
+            for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if not self.grid.is_valid(*neighbour):
+                    continue
+
+                if neighbour in blocked:
+                    continue
+
+                index = self.grid.index(*neighbour)
+
+                if self.distances[index] <= distance:
+                    continue
+
+                self.distances[index] = distance
+                queue.append(neighbour)
+
+class Pathfinder:
+    """
+    Keeps a distance field for every living ninja, which all enemies can share.
+    Only static obstacles (rocks) block paths, since ninjas & enemies will move.
+    """
+
+    def __init__(self, grid: "Grid") -> None:
+        self.grid = grid
+        self.fields: Dict["Ninja", DistanceField] | None = None
+        self.origins: Dict[Tuple[Tuple[int, int], FrozenSet[Tuple[int, int]]], DistanceField] = {}
+
+    def update(self) -> None:
+        """Recompute the distance fields, e.g. at the start of the enemy phase"""
+        self.origins = {}
+        self.fields = {
+            ninja: DistanceField(self.grid, (ninja.x, ninja.y), self.grid.obstacles)
+            for ninja in self.grid.game.ninjas
+            if ninja.hp > 0
+        }
+
+    def invalidate(self) -> None:
+        self.fields = None
+        self.origins = {}
+
+    def walking_distance(self, start: Tuple[int, int], target: Tuple[int, int]) -> int | float:
+        """Get the walking distance between two tiles, e.g. to check if an enemy can reach a tile"""
+        key = (start, self.grid.obstacles)
+
+        if (field := self.origins.get(key)) is None:
+            field = DistanceField(self.grid, start, self.grid.obstacles)
+            self.origins[key] = field
+
+        return field[target]
+
+    def distance_to_ninja(self, x: int, y: int) -> int | float:
+        """Get the walking distance from a tile to the closest living ninja"""
+        if self.fields is None:
+            self.update()
+
+        return min(
+            (field[x, y] for field in self.fields.values()),
+            default=math.inf
+        )
@@ -1,20 +1,21 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, List
+from typing import TYPE_CHECKING, Any, List, Set
 
 if TYPE_CHECKING:
     from app.server import SnowflakeWorld
     from app.objects.ninjas import Ninja
     from app.engine.game import Game
+    from app.engine.shards import ShardWorker
 
 from twisted.internet.address import IPv4Address, IPv6Address
 from twisted.python.failure import Failure
 from sqlalchemy.orm import Session
 
-from app.engine.cards import CardObject, MemberCard
+from app.engine.cards import CardObject, MemberCard, Deck
 from app.protocols import MetaplaceProtocol
-from app.data import stamps, cards
+from app.data import stamps
 from app.data import (
     Penguin as PenguinObject,
     EventType,
@@ -23,7 +24,6 @@ from app.data import (
 )
 
 import app.session
-import random
 import config
 
 class Penguin(MetaplaceProtocol):
@@ -48,15 +48,20 @@ class Penguin(MetaplaceProtocol):
         self.member_card: MemberCard | None = None
         self.selected_card: CardObject | None = None
         self.power_card_slots: List[CardObject] = []
-        self.power_cards: List[CardObject] = []
+        self.power_cards: Deck = Deck()
         self.unlocked_stamps: List[int] = []
+        self.owned_stamps: Set[int] | None = None
         self.power_card_stamina: int = 0
         self.played_cards: int = 0
 
+        self.shard: "ShardWorker" | None = None
+        self.relay_id: int = 0
+
         self.login_time: int = 0
         self.queue_time: int = 0
 
         self.mute_sounds: bool = False
+        self.login_pending: bool = False
         self.in_queue: bool = False
         self.is_ready: bool = False
         self.is_bot: bool = False
@@ -66,12 +71,39 @@ class Penguin(MetaplaceProtocol):
         return f"<{self.name} ({self.pid})>"
 
     @property
-    def is_member(self) -> bool:
-        return True # TODO
+    def in_game(self) -> bool:
+        return getattr(self, 'game', None) is not None
 
     @property
-    def in_game(self) -> bool:
-        return self.game is not None
+    def is_ready(self) -> bool:
+        return self._is_ready
+
+    @is_ready.setter
+    def is_ready(self, value: bool) -> None:
+        self._is_ready = value
+        self.notify_game()
+
+    @property
+    def disconnected(self) -> bool:
+        return self._disconnected
+
+    @disconnected.setter
+    def disconnected(self, value: bool) -> None:
+        self._disconnected = value
+
+        if value and self.in_game:
+            # Release anything that is waiting on this client
+            self.game.callbacks.remove_events(self)
+
+        if value:
+            # Stop waiting for windows of this client
+            self.window_manager.notify()
+
+        self.notify_game()
+
+    @property
+    def is_member(self) -> bool:
+        return True # TODO
 
     @property
     def has_power_cards(self) -> bool:
@@ -85,6 +117,22 @@ class Penguin(MetaplaceProtocol):
     def placed_powercard(self) -> bool:
         return bool(self.selected_card and self.selected_card.x != -1 and self.selected_card.y != -1)
 
+    def notify_game(self) -> None:
+        """Wake up the game thread, so that it can re-check the client's state"""
+        if self.in_game:
+            self.game.notify()
+
+    def lineReceived(self, line: bytes) -> None:
+        if self.shard is not None:
+            # Game is hosted by a worker process
+            self.shard.forward(self, line)
+            return
+
+        super().lineReceived(line)
+
+    def parse_arguments(self, command: str, data: str) -> List[Any]:
+        return app.session.events.parse(command, data)
+
     def command_received(self, command: str, args: List[Any]):
         try:
             app.session.events.call(
@@ -111,6 +159,9 @@ class Penguin(MetaplaceProtocol):
         return super().close_connection()
 
     def connectionLost(self, reason: Failure | None = None) -> None:
+        if self.shard is not None:
+            self.shard.disconnect(self)
+
         if self.in_game and self.ninja and self.game.ninjas:
             self.ninja.set_health(0)
 
@@ -121,36 +172,20 @@ class Penguin(MetaplaceProtocol):
         self.server.players.remove(self)
         self.disconnected = True
 
-    def send_tag(self, tag: str, *args) -> None:
+    def send_encoded_tag(self, tag: str, data: bytes) -> None:
         if tag.startswith('FX') and self.mute_sounds:
             return
 
-        super().send_tag(tag, *args)
+        super().send_encoded_tag(tag, data)
 
-    def initialize_power_cards(self, session=None) -> None:
-        card_color = {
-            'snow': 'p',
-            'water': 'b',
-            'fire': 'r'
-        }[self.element]
-
-        element_name = {
+    @property
+    def card_element(self) -> str:
+        return {
             'snow': 's',
             'water': 'w',
             'fire': 'f'
         }[self.element]
 
-        power_cards = cards.fetch_power_cards_by_penguin_id(
-            self.pid,
-            element_name,
-            session=session
-        )
-
-        for card in power_cards:
-            card_object = CardObject(card, self)
-            card_object.color = card_color
-            self.power_cards.append(card_object)
-
     def next_power_card(self) -> CardObject | None:
         if not self.power_cards:
             # Client has no more power cards
@@ -160,9 +195,15 @@ class Penguin(MetaplaceProtocol):
             # Client cannot hold more than 4 power cards
             return
 
-        next_card = random.choice(self.power_cards)
+        card_color = {
+            'snow': 'p',
+            'water': 'b',
+            'fire': 'r'
+        }[self.element]
+
+        next_card = CardObject(self.power_cards.draw(), self)
+        next_card.color = card_color
         self.power_card_slots.append(next_card)
-        self.power_cards.remove(next_card)
         return next_card
 
     def power_card_by_id(self, card_id: int) -> Card | None:
@@ -252,6 +293,13 @@ class Penguin(MetaplaceProtocol):
         infotip = self.get_window('cardjitsu_snowinfotip.swf')
         infotip.send_payload('disable')
 
+    def owns_stamp(self, id: int, group_id: int, session: Session | None = None) -> bool:
+        if self.owned_stamps is not None and group_id == 60:
+            # Card-Jitsu Snow stamps get loaded at the start of a match
+            return id in self.owned_stamps
+
+        return stamps.exists(id, self.pid, session=session)
+
     def unlock_stamp(self, id: int, session: Session | None = None) -> None:
         if config.DISABLE_STAMPS:
             return
@@ -259,18 +307,23 @@ class Penguin(MetaplaceProtocol):
         if self.disconnected:
             return
 
+        if id in self.unlocked_stamps:
+            # Stamp might not be written yet
+            return
+
         if not (stamp := stamps.fetch_one(id, session=session)):
             return
 
-        if stamps.exists(id, self.pid, session=session):
+        if self.owns_stamp(stamp.id, stamp.group_id, session=session):
             return
 
         self.logger.info(f'{self} unlocked stamp: "{stamp.name}"')
         self.unlocked_stamps.append(stamp.id)
-        stamps.add(
-            id, self.pid,
-            session=session
-        )
+
+        if self.owned_stamps is not None:
+            self.owned_stamps.add(stamp.id)
+
+        app.session.writer.add_stamp(self.pid, stamp.id)
 
         window = self.get_window('stampearned.swf')
 
@@ -0,0 +1,486 @@
+
+from __future__ import annotations
+
+from twisted.internet.protocol import ProcessProtocol, ServerFactory, ClientFactory
+from twisted.internet.address import IPv4Address
+from twisted.protocols.basic import LineOnlyReceiver
+from twisted.python.failure import Failure
+from twisted.internet import reactor
+from typing import TYPE_CHECKING, Any, Dict, List
+from collections import defaultdict
+from itertools import count
+
+if TYPE_CHECKING:
+    from app.server import SnowflakeWorld
+
+from app.arguments import decode_json
+from app.protocols.metaplace import SWFWindow
+from app.protocols import MetaplaceProtocol
+from app.engine.place import SnowLobby, SnowBattle, TuskBattle
+from app.data import Penguin as PenguinObject, catalog, TipPhase
+
+from .penguin import Penguin
+from .tusk import TuskGame
+from .ai import PenguinAI
+from .game import Game
+
+import app.session
+import tempfile
+import shutil
+import logging
+import signal
+import config
+import json
+import sys
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(config.__file__)), 'shard.py')
+
+def encode_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+
+    return json.dumps(value).encode()
+
+class ShardChannel(LineOnlyReceiver):
+    """Exchanges json messages between the front & worker processes, one per line"""
+
+    delimiter = b'\n'
+    MAX_LENGTH = 16 * 1024 * 1024
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger('Shards')
+
+    def send_message(self, type: str, **data) -> None:
+        data['type'] = type
+        self.sendLine(encode_json(data))
+
+    def lineReceived(self, line: bytes) -> None:
+        message = decode_json(line)
+        handler = getattr(self, f'on_{message.pop("type", None)}', None)
+
+        if handler is None:
+            self.logger.warning(f'Invalid message: "{line[:50]}"')
+            return
+
+        try:
+            handler(**message)
+        except Exception as e:
+            self.logger.error(f'Failed to handle message: {e}', exc_info=e)
+
+    def lineLengthExceeded(self, line: bytes) -> None:
+        self.logger.error('Message too long, closing channel')
+        self.transport.loseConnection()
+
+def penguin_state(penguin: PenguinObject) -> Dict[str, Any]:
+    """Serialize the columns of a penguin, so that the worker doesn't have to query them again"""
+    state = {}
+
+    for column in PenguinObject.__table__.columns:
+        value = getattr(penguin, column.key)
+
+        if column.key == 'password':
+            continue
+
+        if value is None or isinstance(value, (bool, int, str)):
+            # Timestamps are not used by the games
+            state[column.key] = value
+
+    return state
+
+def client_state(client: Penguin) -> Dict[str, Any]:
+    """Serialize everything a worker needs to know about a client, to host its game"""
+    return {
+        'id': client.relay_id,
+        'bot': client.is_bot,
+        'object': penguin_state(client.object),
+        'pid': client.pid,
+        'name': client.name,
+        'token': client.token,
+        'element': client.element,
+        'battle_mode': client.battle_mode,
+        'screen_size': client.screen_size,
+        'asset_url': client.asset_url,
+        'tip_mode': client.tip_mode,
+        'mute_sounds': client.mute_sounds,
+        'displayed_tips': [tip.value for tip in client.displayed_tips],
+        'place': client.place.name if client.place else None,
+        'host': client.address.host,
+        'port': client.address.port,
+        'window_manager': {
+            'loaded': client.window_manager.loaded,
+            'ready': client.window_manager.ready
+        },
+        'windows': [
+            {
+                'name': window.name,
+                'url': window.url,
+                'layer': window.layer,
+                'loaded': window.loaded
+            }
+            for window in client.window_manager.values()
+        ]
+    }
+
+class ShardWorker(ShardChannel):
+    """Connection to a worker process, as seen from the front process"""
+
+    def __init__(self, manager: "ShardManager") -> None:
+        super().__init__()
+        self.clients: Dict[int, Penguin] = {}
+        self.manager = manager
+        self.index = -1
+        self.games = 0
+
+    def connectionLost(self, reason: Failure | None = None) -> None:
+        self.manager.worker_lost(self)
+
+        for client in list(self.clients.values()):
+            # The game of these clients is gone
+            client.shard = None
+            client.close_connection()
+
+        self.clients.clear()
+
+    def start_game(self, battle_mode: int, players: List[Penguin | None]) -> None:
+        for player in players:
+            if player is None or player.is_bot:
+                continue
+
+            player.relay_id = next(self.manager.relay_ids)
+            player.shard = self
+            self.clients[player.relay_id] = player
+
+        self.games += 1
+        self.send_message(
+            'game',
+            battle_mode=battle_mode,
+            players=[client_state(player) if player else None for player in players]
+        )
+
+    def forward(self, client: Penguin, line: bytes) -> None:
+        self.send_message('line', client=client.relay_id, data=line.decode('utf-8', 'replace'))
+
+    def disconnect(self, client: Penguin) -> None:
+        if self.clients.pop(client.relay_id, None) is None:
+            return
+
+        client.shard = None
+        self.send_message('disconnect', client=client.relay_id)
+
+    def on_hello(self, index: int) -> None:
+        self.index = index
+        self.manager.worker_ready(self)
+
+    def on_write(self, client: int, data: str) -> None:
+        if not (player := self.clients.get(client)):
+            return
+
+        if not player.transport:
+            return
+
+        # Keep the order with anything the front process has queued
+        player.flush()
+        player.transport.write(data.encode())
+
+    def on_close(self, client: int) -> None:
+        if not (player := self.clients.pop(client, None)):
+            return
+
+        # The worker has already sent the client back to the room
+        player.shard = None
+        MetaplaceProtocol.close_connection(player)
+
+    def on_finished(self, clients: List[int]) -> None:
+        self.games -= 1
+
+        for id in clients:
+            if player := self.clients.pop(id, None):
+                player.shard = None
+
+class ShardProcess(ProcessProtocol):
+    def __init__(self, manager: "ShardManager", index: int) -> None:
+        self.manager = manager
+        self.index = index
+
+    def processEnded(self, reason: Failure) -> None:
+        self.manager.process_ended(self.index, reason)
+
+class ShardManager(ServerFactory):
+    """
+    Spawns worker processes that host the games, while the front process keeps
+    the listeners, logins & matchmaking. Clients stay connected to the front process,
+    which relays their traffic to the worker that hosts their game.
+    """
+
+    def __init__(self, server: "SnowflakeWorld") -> None:
+        self.server = server
+        self.workers: Dict[int, ShardWorker] = {}
+        self.processes: Dict[int, ShardProcess] = {}
+        self.relay_ids = count(1)
+        self.socket_directory: str | None = None
+        self.socket_path: str | None = None
+        self.listener = None
+        self.stopping = False
+        self.logger = logging.getLogger('Shards')
+
+    @property
+    def available(self) -> bool:
+        return bool(self.workers)
+
+    def buildProtocol(self, addr) -> ShardWorker:
+        return ShardWorker(self)
+
+    def start(self, worker_count: int) -> None:
+        # Only this user may connect, as the socket carries the traffic of every client
+        self.socket_directory = tempfile.mkdtemp(prefix='snowflake-')
+        self.socket_path = os.path.join(self.socket_directory, 'shards.sock')
+        self.listener = reactor.listenUNIX(self.socket_path, self, mode=0o600)  # type: ignore
+
+        for index in range(worker_count):
+            self.spawn(index)
+
+    def stop(self) -> None:
+        if self.stopping:
+            return
+
+        self.stopping = True
+
+        for worker in self.workers.values():
+            worker.send_message('shutdown')
+
+        if self.listener:
+            self.listener.stopListening()
+
+        if self.socket_directory:
+            shutil.rmtree(self.socket_directory, ignore_errors=True)
+
+    def spawn(self, index: int) -> None:
+        if self.stopping:
+            return
+
+        process = ShardProcess(self, index)
+        self.processes[index] = process
+
+        reactor.spawnProcess(  # type: ignore
+            process,
+            sys.executable,
+            [sys.executable, WORKER_SCRIPT, self.socket_path, str(index)],
+            env=os.environ,
+            path=os.path.dirname(WORKER_SCRIPT),
+            childFDs={0: 'w', 1: 1, 2: 2}
+        )
+
+    def process_ended(self, index: int, reason: Failure) -> None:
+        self.processes.pop(index, None)
+
+        if self.stopping:
+            return
+
+        self.logger.error(f'Worker {index} exited: {reason.getErrorMessage()}')
+        reactor.callLater(1, self.spawn, index)  # type: ignore
+
+    def worker_ready(self, worker: ShardWorker) -> None:
+        self.logger.info(f'Worker {worker.index} is ready')
+        self.workers[worker.index] = worker
+
+    def worker_lost(self, worker: ShardWorker) -> None:
+        if self.workers.get(worker.index) is worker:
+            del self.workers[worker.index]
+
+    def start_game(self, battle_mode: int, players: List[Penguin | None]) -> None:
+        worker = min(self.workers.values(), key=lambda worker: worker.games)
+        worker.start_game(battle_mode, players)
+
+class RelayTransport:
+    """Stands in for the transport of a client, that is connected to the front process"""
+
+    def __init__(self, channel: "ShardHost", id: int) -> None:
+        self.channel = channel
+        self.id = id
+
+    def write(self, data: bytes) -> None:
+        reactor.callFromThread(  # type: ignore
+            self.channel.send_message,
+            'write', client=self.id, data=data.decode()
+        )
+
+    def loseConnection(self) -> None:
+        reactor.callFromThread(  # type: ignore
+            self.channel.send_message,
+            'close', client=self.id
+        )
+
+class ShardClient(Penguin):
+    """A client of the front process, whose game is hosted by this worker"""
+
+    def __init__(self, server: "SnowflakeWorld", channel: "ShardHost", state: Dict[str, Any]) -> None:
+        super().__init__(server, IPv4Address('TCP', state['host'], state['port']))
+        self.relay_id = state['id']
+        self.channel = channel
+        self.transport = RelayTransport(channel, self.relay_id)
+
+        self.object = PenguinObject(**state['object'])
+        self.pid = state['pid']
+        self.name = state['name']
+        self.token = state['token']
+        self.element = state['element']
+        self.battle_mode = state['battle_mode']
+        self.screen_size = state['screen_size']
+        self.asset_url = state['asset_url']
+        self.tip_mode = state['tip_mode']
+        self.mute_sounds = state['mute_sounds']
+        self.displayed_tips = [TipPhase(tip) for tip in state['displayed_tips']]
+        self.place = server.places.get(state['place'])
+        self.logger = logging.getLogger(self.name)
+        self.logged_in = True
+
+        self.window_manager.loaded = state['window_manager']['loaded']
+        self.window_manager.ready = state['window_manager']['ready']
+
+        for window in state['windows']:
+            swf = SWFWindow(self, window['url'], window['name'], window['layer'])
+            swf.loaded = window['loaded']
+            self.window_manager[swf.name] = swf
+
+    def connectionLost(self, reason: Failure | None = None) -> None:
+        self.channel.clients.pop(self.relay_id, None)
+        super().connectionLost(reason)
+
+class ShardHost(ShardChannel):
+    """Connection to the front process, as seen from a worker process"""
+
+    def __init__(self, server: "SnowflakeWorld", index: int) -> None:
+        super().__init__()
+        self.clients: Dict[int, ShardClient] = {}
+        self.server = server
+        self.index = index
+
+    def connectionMade(self) -> None:
+        self.send_message('hello', index=self.index)
+
+    def connectionLost(self, reason: Failure | None = None) -> None:
+        if not self.server.shutting_down:
+            self.logger.warning('Lost connection to the front process')
+
+        shutdown(self.server)
+
+    def create_client(self, state: Dict[str, Any]) -> Penguin:
+        if state['bot']:
+            return PenguinAI(
+                self.server,
+                state['element'],
+                state['battle_mode'],
+                object=PenguinObject(**state['object'])
+            )
+
+        client = ShardClient(self.server, self, state)
+        self.clients[client.relay_id] = client
+        self.server.players.add(client)
+        return client
+
+    def game_finished(self, ids: List[int]) -> None:
+        for id in ids:
+            if client := self.clients.pop(id, None):
+                self.server.players.remove(client)
+
+        self.send_message('finished', clients=ids)
+
+    def on_game(self, battle_mode: int, players: List[Dict[str, Any] | None]) -> None:
+        fire, snow, water = (
+            self.create_client(state) if state else None
+            for state in players
+        )
+
+        game_class = TuskGame if battle_mode == 1 else Game
+        game = game_class(fire, snow, water)
+        game.load_players()
+        self.server.games.add(game)
+        self.server.runThread(run_game, game)
+
+    def on_line(self, client: int, data: str) -> None:
+        if player := self.clients.get(client):
+            player.lineReceived(data.encode())
+
+    def on_disconnect(self, client: int) -> None:
+        if not (player := self.clients.pop(client, None)):
+            return
+
+        # Connection is already closed on the front process
+        player.transport = None
+        player.connectionLost()
+
+    def on_shutdown(self) -> None:
+        shutdown(self.server)
+
+class ShardHostFactory(ClientFactory):
+    def __init__(self, server: "SnowflakeWorld", index: int) -> None:
+        self.server = server
+        self.index = index
+
+    def buildProtocol(self, addr) -> ShardHost:
+        return ShardHost(self.server, self.index)
+
+    def clientConnectionFailed(self, connector, reason: Failure) -> None:
+        logging.getLogger('Shards').error(f'Failed to connect to the front process: {reason.getErrorMessage()}')
+        reactor.stop()  # type: ignore
+
+def run_game(game: Game) -> None:
+    """Run a game, and hand its relayed clients back to their front process afterwards"""
+    try:
+        game.start()
+    finally:
+        reactor.callFromThread(release_clients, game)  # type: ignore
+
+def release_clients(game: Game) -> None:
+    channels: Dict[ShardHost, List[int]] = defaultdict(list)
+
+    for client in game.clients:
+        if isinstance(client, ShardClient):
+            channels[client.channel].append(client.relay_id)
+
+    for channel, ids in channels.items():
+        channel.game_finished(ids)
+
+def shutdown(server: "SnowflakeWorld") -> None:
+    """Let the hosted games finish, before the worker stops"""
+    if server.shutting_down:
+        return
+
+    server.shutting_down = True
+
+    for game in server.games:
+        # Wake up games that are waiting for their players
+        game.notify()
+
+    reactor.callLater(0.1, reactor.stop)  # type: ignore
+
+def run_worker(socket_path: str, index: int) -> None:
+    from app.server import SnowflakeWorld
+
+    server = SnowflakeWorld()
+    server.register_place(SnowLobby())
+    server.register_place(SnowBattle())
+    server.register_place(TuskBattle())
+
+    reactor.connectUNIX(  # type: ignore
+        socket_path,
+        ShardHostFactory(server, index)
+    )
+
+    # Every worker needs its own journal
+    app.session.writer.start(f'{config.WRITE_JOURNAL}.{index}')
+    catalog.reload()
+
+    signal.signal(signal.SIGINT, lambda *args: reactor.callFromThread(shutdown, server))  # type: ignore
+    reactor.run()  # type: ignore
+
+    for thread in server.threads:
+        thread.join()
+
+    app.session.writer.stop()
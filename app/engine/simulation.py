@@ -0,0 +1,232 @@
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple, Type
+from dataclasses import dataclass
+from itertools import count
+
+if TYPE_CHECKING:
+    from app.server import SnowflakeWorld
+    from app.engine.penguin import Penguin
+    from app.protocols.metaplace import WindowStates
+
+from app.data import Penguin as PenguinObject
+from app.engine.place import SnowBattle, TuskBattle
+from app.engine.callbacks import CallbackHandler, ActionType
+
+from .cards import MemberCard
+from .tusk import TuskGame
+from .ai import PenguinAI
+from .game import Game
+
+import argparse
+import logging
+import random
+import heapq
+import time
+
+@dataclass
+class SimulationResult:
+    won: bool
+    round: int
+    turns: int
+    coins: int
+    exp: int
+    duration: float
+
+class SimulatedCallbackHandler(CallbackHandler):
+    """Acknowledges every animation, sound & event instantly, since there are no clients to wait for"""
+
+    def register_action(
+        self,
+        name: str,
+        type: ActionType,
+        object_id: int,
+        callback: Callable | None = None
+    ) -> int:
+        if callback is not None:
+            self.game.call_later(0, callback, self.game.objects.by_id(object_id))
+
+        return self.next_id()
+
+    def wait_for_client(self, event: str, client: "Penguin", timeout=8) -> None:
+        ...
+
+    def wait_for_event(self, event: str, timeout=8) -> None:
+        ...
+
+    def wait_for_animations(self, timeout=8) -> None:
+        # Run callbacks of the finished animations
+        self.game.sleep(0)
+
+class Simulation:
+    """
+    Runs a game on a virtual clock, without any network or database access.
+    Sleeping advances the clock instantly, and delayed calls are run in order
+    once the clock passes their due time, which makes a match take only as
+    long as the game logic itself.
+    """
+
+    # Give up on matches where neither side can win
+    max_turns = 500
+
+    # Decided once the game loop has ended
+    won = False
+
+    def setup_clock(self) -> None:
+        self.clock: float = 0.0
+        self.tasks: List[Tuple[float, int, Callable, Tuple, Dict[str, Any]]] = []
+        self.sequence = count()
+        self.finished = False
+
+    def now(self) -> float:
+        return self.clock
+
+    def sleep(self, seconds: float) -> None:
+        deadline = self.clock + seconds
+
+        while self.tasks and self.tasks[0][0] <= deadline:
+            self.run_next_task()
+
+        self.clock = max(self.clock, deadline)
+
+    def call_later(self, seconds: float, func: Callable, *args, **kwargs) -> None:
+        heapq.heappush(
+            self.tasks,
+            (self.clock + seconds, next(self.sequence), func, args, kwargs)
+        )
+
+    def wait_until(self, predicate: Callable[[], bool], timeout: float) -> bool:
+        deadline = self.clock + timeout
+
+        while not predicate():
+            if not self.tasks or self.tasks[0][0] > deadline:
+                self.clock = max(self.clock, deadline)
+                return predicate()
+
+            self.run_next_task()
+
+        return True
+
+    def run_next_task(self) -> None:
+        due_time, _, func, args, kwargs = heapq.heappop(self.tasks)
+        self.clock = max(self.clock, due_time)
+        func(*args, **kwargs)
+
+    def wait_for_window(self, window: str | WindowStates, loaded=True, timeout=8) -> None:
+        ...
+
+    def initialize_clients(self) -> None:
+        for client in self.clients:
+            client.game = self
+            client.member_card = MemberCard(client)
+
+    def load_players(self) -> None:
+        # Bots don't own any power cards or stamps
+        ...
+
+    def initialize_players(self) -> None:
+        ...
+
+    def display_payout(self) -> None:
+        # Results are returned by `run` instead, but the
+        # enemies are removed before the game finishes
+        self.won = not self.enemies
+
+    def check_round_completion(self) -> bool:
+        if self.turn >= self.max_turns:
+            self.logger.warning(f'Match did not finish after {self.turn} turns')
+            raise SystemExit
+
+        return super().check_round_completion()
+
+    def close(self) -> None:
+        # Simulated games are only played by bots, which would
+        # otherwise close the game after the first round
+        self.finished = True
+
+    def run(self) -> SimulationResult:
+        try:
+            self.start()
+        except SystemExit:
+            pass
+        finally:
+            self.server.games.remove(self)
+
+        return SimulationResult(
+            won=self.won,
+            round=self.round,
+            turns=self.turn,
+            coins=self.coins,
+            exp=self.exp,
+            duration=self.clock
+        )
+
+class SimulatedGame(Simulation, Game):
+    def __init__(self, fire: "Penguin", snow: "Penguin", water: "Penguin") -> None:
+        self.setup_clock()
+        super().__init__(fire, snow, water)
+        self.callbacks = SimulatedCallbackHandler(self)
+
+class SimulatedTuskGame(Simulation, TuskGame):
+    def __init__(self, fire: "Penguin", snow: "Penguin", water: "Penguin") -> None:
+        self.setup_clock()
+        super().__init__(fire, snow, water)
+        self.callbacks = SimulatedCallbackHandler(self)
+
+def create_server() -> "SnowflakeWorld":
+    """Create a world server, that is only used to host simulated games"""
+    from app.server import SnowflakeWorld
+
+    server = SnowflakeWorld()
+    server.register_place(SnowBattle())
+    server.register_place(TuskBattle())
+    return server
+
+def simulate(server: "SnowflakeWorld", tusk: bool = False) -> SimulationResult:
+    """Play a full match with three bots"""
+    battle_mode = int(tusk)
+    game_class: Type[SimulatedGame | SimulatedTuskGame] = (
+        SimulatedTuskGame if tusk else SimulatedGame
+    )
+
+    fire, snow, water = (
+        PenguinAI(
+            server, element, battle_mode,
+            object=PenguinObject(id=-1, nickname=f'{element.capitalize()} Bot')
+        )
+        for element in ('fire', 'snow', 'water')
+    )
+
+    game = game_class(fire, snow, water)
+    server.games.add(game)
+    return game.run()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run simulated matches with bots only')
+    parser.add_argument('matches', type=int, nargs='?', default=100)
+    parser.add_argument('--tusk', action='store_true', help='Simulate tusk battles')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    random.seed(args.seed)
+
+    server = create_server()
+    start_time = time.perf_counter()
+    results = [simulate(server, args.tusk) for _ in range(args.matches)]
+    elapsed = time.perf_counter() - start_time
+
+    wins = sum(result.won for result in results)
+    rounds = sum(result.round for result in results) / len(results)
+    turns = sum(result.turns for result in results) / len(results)
+
+    print(
+        f'{len(results)} matches in {elapsed:.2f}s '
+        f'({len(results) / elapsed * 60:.0f} matches/min), '
+        f'{wins / len(results):.1%} won, '
+        f'{rounds:.2f} rounds & {turns:.1f} turns on average'
+    )
+
+if __name__ == '__main__':
+    main()
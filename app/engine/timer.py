@@ -5,8 +5,6 @@ from app.data import TipPhase
 if TYPE_CHECKING:
     from .game import Game
 
-import time
-
 class Timer:
     def __init__(self, game: "Game") -> None:
         self.game = game
@@ -29,63 +27,68 @@ class Timer:
         self.tick = 10
         self.hide()
 
-    def update_tick(self, seconds: int = 1, interval: int = 0.25) -> None:
-        while seconds > 0:
-            time.sleep(interval)
-            seconds -= interval
+    def update_tick(self, seconds: int = 1) -> None:
+        if self.tick == 3:
+            for client in self.game.clients:
+                if client.is_ready:
+                    continue
 
-            if self.game.server.shutting_down:
-                self.game.close()
-                return
+                self.game.send_tip(TipPhase.CONFIRM, client)
 
-            if all(client.disconnected for client in self.game.clients):
-                self.game.close()
-                return
+        # Sleep until the next tick, unless the game state changes
+        self.game.wait_until(self.interrupted, timeout=seconds)
 
-            if all(client.is_ready for client in self.game.clients if not client.disconnected):
-                self.tick = 0
-                return
+        if self.game.server.shutting_down:
+            self.game.close()
+            return
 
-            if self.tick == 3:
-                for client in self.game.clients:
-                    if client.is_ready:
-                        continue
+        if all(client.disconnected for client in self.game.clients):
+            self.game.close()
+            return
 
-                    self.game.send_tip(TipPhase.CONFIRM, client)
+        if all(client.is_ready for client in self.game.clients if not client.disconnected):
+            self.tick = 0
+            return
 
         self.tick -= 1
         self.update()
 
+    def interrupted(self) -> bool:
+        """Check if the timer should stop before the next tick"""
+        if self.game.server.shutting_down:
+            return True
+
+        return all(
+            client.is_ready or client.disconnected
+            for client in self.game.clients
+        )
+
     def load(self) -> None:
-        for client in self.game.clients:
-            timer = client.get_window('cardjitsu_snowtimer.swf')
-            timer.layer = 'bottomLayer'
-            timer.load(
-                {'element': client.element},
-                loadDescription="",
-                assetPath="",
-                xPercent=0.5,
-                yPercent=0
-            )
-
-        self.game.wait_for_window('cardjitsu_snowtimer.swf', loaded=True)
+        timer = self.game.get_windows('cardjitsu_snowtimer.swf')
+        timer.layer = 'bottomLayer'
+        state = timer.load(
+            per_client=lambda client: {'element': client.element},
+            loadDescription="",
+            assetPath="",
+            xPercent=0.5,
+            yPercent=0
+        )
+
+        self.game.wait_for_window(state)
 
     def update(self) -> None:
-        for client in self.game.clients:
-            timer = client.get_window('cardjitsu_snowtimer.swf')
-            timer.send_payload(
-                'update',
-                {'tick': self.tick}
-            )
+        timer = self.game.get_windows('cardjitsu_snowtimer.swf')
+        timer.send_payload(
+            'update',
+            {'tick': self.tick}
+        )
 
     def show(self) -> None:
-        for client in self.game.clients:
-            timer = client.get_window('cardjitsu_snowtimer.swf')
-            timer.send_payload('Timer_Start')
-            timer.send_payload('enableConfirm')
+        timer = self.game.get_windows('cardjitsu_snowtimer.swf')
+        timer.send_payload('Timer_Start')
+        timer.send_payload('enableConfirm')
 
     def hide(self) -> None:
-        for client in self.game.clients:
-            timer = client.get_window('cardjitsu_snowtimer.swf')
-            timer.send_payload('skipToTransitionOut')
-            timer.send_payload('disableConfirm')
+        timer = self.game.get_windows('cardjitsu_snowtimer.swf')
+        timer.send_payload('skipToTransitionOut')
+        timer.send_payload('disableConfirm')
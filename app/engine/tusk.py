@@ -1,5 +1,7 @@
 
 from __future__ import annotations
+from concurrent.futures import Future
+from threading import Condition
 from typing import List
 
 from app.objects.ninjas import WaterNinja, FireNinja, SnowNinja, Sensei
@@ -10,20 +12,19 @@ from app.objects.ninjas import Ninja
 from app.objects.sound import Sound
 
 from app.data import TipPhase, ExpRequirements, SnowRewards
-from app.data import stamps, penguins, items
+from app.data import stamps
 
 from .callbacks import CallbackHandler
-from .cards import MemberCard
 from .penguin import Penguin
 from .timer import Timer
 from .game import Game
+from .pathfinding import Pathfinder
 from .grid import Grid
 
 import app.session
 import logging
 import random
 import config
-import time
 
 class TuskGame(Game):
     def __init__(self, fire: Penguin, snow: Penguin, water: Penguin) -> None:
@@ -36,15 +37,19 @@ class TuskGame(Game):
         self.tusk: Tusk | None = None
 
         self.total_combos = 0
+        self.turn = 0
         self.damage = 0
         self.coins = 0
         self.round = 4
         self.exp = 0
 
-        self.game_start = time.time()
+        self.game_start = self.now()
+        self.player_data: Future | None = None
+        self.condition = Condition()
         self.callbacks = CallbackHandler(self)
         self.objects = ObjectCollection(offset=1000)
         self.grid = Grid(9, 5, self)
+        self.pathfinder = Pathfinder(self.grid)
         self.timer = Timer(self)
 
         self.server = self.clients[0].server
@@ -61,18 +66,11 @@ class TuskGame(Game):
         return False
 
     def start(self) -> None:
-        with app.session.database.managed_session() as session:
-            for client in self.clients:
-                client.game = self
-
-                # Initialize member card
-                client.member_card = MemberCard(client)
-
-                # Initialize power cards
-                client.initialize_power_cards(session=session)
+        self.initialize_clients()
 
         # Wait for "prepare to battle" screen to end
-        time.sleep(3)
+        self.sleep(3)
+        self.initialize_players()
 
         # Close player select window
         for client in self.clients:
@@ -87,7 +85,7 @@ class TuskGame(Game):
 
         # Wait for loading screen to finish
         self.callbacks.wait_for_event('roomToRoomMinTime')
-        time.sleep(1)
+        self.sleep(1)
 
         # Wait for players to finish loading assets
         self.wait_for_players(lambda player: player.is_ready, timeout=20)
@@ -101,26 +99,25 @@ class TuskGame(Game):
         self.spawn_enemies()
         self.wait_for_animations()
 
-        for client in self.clients:
-            # Close loading screen
-            player_select = client.get_window(config.PLAYERSELECT_SWF)
-            player_select.send_action('closeCjsnowRoomToRoom')
-
-            # Load exit button
-            close_button = client.get_window('cardjitsu_snowclose.swf')
-            close_button.layer = 'bottomLayer'
-            close_button.load(
-                loadDescription="",
-                assetPath="",
-                xPercent=1,
-                yPercent=0
-            )
+        # Close loading screen
+        player_select = self.get_windows(config.PLAYERSELECT_SWF)
+        player_select.send_action('closeCjsnowRoomToRoom')
+
+        # Load exit button
+        close_button = self.get_windows('cardjitsu_snowclose.swf')
+        close_button.layer = 'bottomLayer'
+        close_button.load(
+            loadDescription="",
+            assetPath="",
+            xPercent=1,
+            yPercent=0
+        )
 
         # Wait for windows
-        time.sleep(1)
+        self.sleep(1)
 
         # Reset game time
-        self.game_start = time.time() + 1
+        self.game_start = self.now() + 1
 
         self.display_round_title()
         self.wait_for_window('cardjitsu_snowrounds.swf', loaded=False)
@@ -250,29 +247,29 @@ class TuskGame(Game):
             self.callbacks.wait_for_event('comboScreenComplete', timeout=6)
 
         self.sensei.update_state()
-        time.sleep(1)
+        self.sleep(1)
 
         for ninja in ninjas_with_cards:
             ninja.use_powercard(is_combo)
-            time.sleep(1)
+            self.sleep(1)
 
     def display_round_title(self) -> None:
-        for client in self.clients:
-            round_title = client.get_window('cardjitsu_snowrounds.swf')
-            round_title.layer = 'bottomLayer'
-            round_title.load(
-                {'roundNumber': self.round},
-                loadDescription="",
-                assetPath="",
-                xPercent=0.15,
-                yPercent=0.15
-            )
-
-        self.wait_for_window('cardjitsu_snowrounds.swf', loaded=True)
+        round_title = self.get_windows('cardjitsu_snowrounds.swf')
+        round_title.layer = 'bottomLayer'
+        state = round_title.load(
+            {'roundNumber': self.round},
+            loadDescription="",
+            assetPath="",
+            xPercent=0.15,
+            yPercent=0.15
+        )
+
+        self.wait_for_window(state)
 
     def display_payout(self) -> None:
         with app.session.database.managed_session() as session:
             snow_stamps = stamps.fetch_all_by_group(60, session=session)
+            stamp_list = self.encode_stamp_list(snow_stamps)
 
             for client in self.clients:
                 if client.disconnected:
@@ -296,27 +293,24 @@ class TuskGame(Game):
                     exp_percentage = 100
 
                 # Enable double coins when player has unlocked all stamps
-                double_coins = stamps.completed_group(client.pid, 60, session=session)
+                double_coins = self.completed_stamps(client, snow_stamps, session)
                 coins = self.coins * (2 if double_coins else 1)
 
                 updates = {
-                    'coins': client.object.coins + coins,
                     'snow_ninja_rank': result_rank,
                     'snow_ninja_progress': exp_percentage % 100
                 }
+                increments = {'coins': coins}
 
                 if len(self.enemies) <= 0:
                     # Update win count
                     key = f'snow_progress_{client.element}_wins'
-                    wins = getattr(client.object, key, 0)
-                    updates[key] = wins + 1
+                    increments[key] = 1
 
                 if not config.DISABLE_REWARDS:
                     # Update penguin data
-                    penguins.update(
-                        client.pid, updates,
-                        session=session
-                    )
+                    app.session.writer.update_penguin(client.pid, updates)
+                    app.session.writer.increment_penguin(client.pid, increments)
 
                     if result_rank != client.object.snow_ninja_rank:
                         self.logger.info(f'{client} ranked up from {client.object.snow_ninja_rank} to {result_rank}')
@@ -326,19 +320,13 @@ class TuskGame(Game):
                             continue
 
                         # Add item to inventory
-                        items.add(
-                            client.pid, item,
-                            session=session
-                        )
+                        app.session.writer.add_item(client.pid, item)
 
                         self.logger.info(f'{client} unlocked item {item}')
 
                     if not self.enemies:
                         # Award "Tusk's Cloak" item
-                        items.add(
-                            client.pid, 3160,
-                            session=session
-                        )
+                        app.session.writer.add_item(client.pid, 3160)
 
                         self.logger.info(f'{client} unlocked item 3160')
 
@@ -354,27 +342,17 @@ class TuskGame(Game):
                         "rank": client.object.snow_ninja_rank + 1,
                         "round": self.get_payout_round(),
                         "showItems": 1,
-                        "stampList": [
-                            {
-                                "stamp_id": stamp.id,
-                                "name": f'global_content.stamps.{stamp.id}.name',
-                                "description": f'global_content.stamps.{stamp.id}.description',
-                                "rank_token": f'global_content.stamps.{stamp.id}.rank_token',
-                                "rank": stamp.rank,
-                                "is_member": stamp.member,
-                            }
-                            for stamp in snow_stamps
-                        ],
                         "stamps": [
                             {
-                                "_id": stamp.id,
-                                "new": stamp.id in client.unlocked_stamps
+                                "_id": stamp_id,
+                                "new": stamp_id in client.unlocked_stamps
                             }
-                            for stamp in stamps.fetch_by_penguin_id(client.pid, 60)
+                            for stamp_id in self.collected_stamps(client, snow_stamps, session)
                         ],
                         "xpStart": client.object.snow_ninja_progress,
                         "xpEnd": exp_percentage if result_rank < 24 else 100,
                     },
+                    shared_payload=stamp_list,
                     loadDescription="",
                     assetPath="",
                     xPercent=0.08,
@@ -382,7 +360,7 @@ class TuskGame(Game):
                 )
 
     def display_win_sequence(self) -> None:
-        time.sleep(2)
+        self.sleep(2)
 
         if all(ninja.hp <= 0 for ninja in self.ninjas):
             self.tusk.win_animation()
@@ -404,4 +382,4 @@ class TuskGame(Game):
 
         self.sensei.win_animation()
 
-        time.sleep(3.5)
+        self.sleep(3.5)
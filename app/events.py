@@ -1,5 +1,7 @@
 
-from typing import Callable, Dict, List, TYPE_CHECKING
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Sequence, TYPE_CHECKING
+from app.arguments import ArgumentSchema, parse_arguments
 import logging
 
 if TYPE_CHECKING:
@@ -8,8 +10,16 @@ if TYPE_CHECKING:
 class EventHandler:
     def __init__(self) -> None:
         self.handlers: Dict[str, Callable] = {}
+        self.schemas: Dict[str, ArgumentSchema] = {}
         self.logger = logging.getLogger("Events")
 
+    def parse(self, type: str, data: str) -> List[Any]:
+        if type not in self.schemas:
+            # Fall back to guessing the argument types
+            return parse_arguments(data)
+
+        return self.schemas[type].parse(data)
+
     def call(self, client: "Penguin", type: str, args: List[str]) -> None:
         if type != '/framework':
             self.logger.debug(f'{type}: {args}')
@@ -20,7 +30,12 @@ class EventHandler:
 
         self.logger.warning(f'Unknown event: "{type}"')
 
-    def register(self, type: str, login_required: bool = True) -> Callable:
+    def register(
+        self,
+        type: str,
+        login_required: bool = True,
+        args: Sequence[Callable[[str], Any]] | None = None
+    ) -> Callable:
         def wrapper(handler: Callable) -> Callable:
             def login_wrapper(client: "Penguin", *args):
                 if not client.logged_in: return
@@ -32,6 +47,9 @@ class EventHandler:
             else:
                 self.handlers[type] = handler
 
+            if args is not None:
+                self.schemas[type] = ArgumentSchema(*args)
+
             self.logger.info(f'Registered event: "{type}"')
             return self.handlers[type]
         return wrapper
@@ -1,8 +1,9 @@
 
 from app.engine import Penguin
+from app.arguments import JSON
 from app import session
 
-@session.events.register("/framework")
+@session.events.register("/framework", args=(JSON,))
 def framework(client: Penguin, json: dict):
     session.framework.call(json['triggerName'], client, json)
 
@@ -1,5 +1,6 @@
 
 from app.engine import Penguin
+from app.arguments import number
 from app import session
 
 def local_use_handler(client: Penguin, object_id: int, x: int, y: int, local_x: float, local_y: float):
@@ -13,7 +14,7 @@ def local_use_handler(client: Penguin, object_id: int, x: int, y: int, local_x:
 
     object.on_click(client, object, x, y, local_x, local_y)
 
-@session.events.register('/use')
+@session.events.register('/use', args=(int, number, number, number, number))
 def use_handler(client: Penguin, object_id: int, x: int, y: int, local_x: float, local_y: float):
     """Sent by the client after clicking on a game object"""
     object = client.game.objects.by_id(object_id)
@@ -1,7 +1,12 @@
 
+from twisted.internet import defer, threads
+from twisted.python.failure import Failure
+
 from app.protocols import MetaplaceProtocol
 from app.engine.penguin import Penguin
+from app.data import Penguin as PenguinObject
 from app.data import penguins, cards
+from app.arguments import string
 from app import session
 
 import urllib.parse
@@ -9,11 +14,11 @@ import logging
 import config
 import time
 
-@session.events.register('/version', login_required=False)
+@session.events.register('/version', login_required=False, args=())
 def version_handler(client: Penguin):
     client.send_version(config.VERSION)
 
-@session.events.register("/place_context", login_required=False)
+@session.events.register("/place_context", login_required=False, args=(string, string))
 def context_handler(client: Penguin, place_name: str, param_string: str):
     params = urllib.parse.parse_qs(param_string)
 
@@ -36,11 +41,11 @@ def context_handler(client: Penguin, place_name: str, param_string: str):
     client.asset_url = asset_url[0]
     client.place = place
 
-@session.events.register('/login', login_required=False)
+@session.events.register('/login', login_required=False, args=(string, int, string))
 def login_handler(client: Penguin, server_type: str, pid: int, token: str):
     client.send_login_message('Got /login command from user')
 
-    if client.logged_in:
+    if client.logged_in or client.login_pending:
         client.logger.warning('Login attempt failed: Already logged in')
         client.send_login_error()
         client.close_connection()
@@ -52,16 +57,63 @@ def login_handler(client: Penguin, server_type: str, pid: int, token: str):
         client.close_connection()
         return
 
-    if not (penguin := penguins.fetch_by_id(pid)):
+    client.login_pending = True
+
+    # Fetch the penguin & session token in the background,
+    # so that other clients don't have to wait for them
+    lookups = [
+        threads.deferToThread(penguins.fetch_by_id, pid),
+        (
+            session.tokens.fetch(pid, expected=token)
+            if not config.DISABLE_AUTHENTICATION else
+            defer.succeed(None)
+        )
+    ]
+
+    deferred = defer.gatherResults(lookups, consumeErrors=True)
+    deferred.addCallback(lambda results: finish_login(client, pid, token, *results))
+    deferred.addErrback(lambda failure: login_failed(client, pid, failure))
+
+def login_failed(client: Penguin, pid: int, failure: Failure):
+    client.login_pending = False
+    session.tokens.invalidate(pid)
+    client.logger.error(f'Login attempt failed: {failure.getErrorMessage()}')
+    client.send_login_error()
+    client.close_connection()
+
+def finish_login(client: Penguin, pid: int, token: str, penguin: PenguinObject | None, session_token: str | None):
+    client.login_pending = False
+
+    # The token was fetched for this login, so the next one has to look it up again
+    session.tokens.invalidate(pid)
+
+    if client.disconnected:
+        return
+
+    if not penguin:
         client.logger.warning('Login attempt failed: Penguin not found')
         client.send_login_error()
         client.close_connection()
         return
 
+    if not config.DISABLE_AUTHENTICATION:
+        if not session_token:
+            client.logger.warning('Login attempt failed: Session token expired')
+            client.send_login_error()
+            client.close_connection()
+            return
+
+        if token != session_token:
+            client.logger.warning('Login attempt failed: Invalid session token')
+            client.send_login_error()
+            client.close_connection()
+            return
+
     client.pid = pid
     client.token = token
     client.name = penguin.nickname
     client.object = penguin
+    client.server.players.reindex(client)
 
     if not penguin.approval_en or penguin.rejection_en:
         client.name = f'P{pid}'
@@ -75,21 +127,6 @@ def login_handler(client: Penguin, server_type: str, pid: int, token: str):
             player.logger.warning('Closing duplicate connection.')
             player.close_connection()
 
-    if not config.DISABLE_AUTHENTICATION:
-        session_token = session.redis.get(f'{pid}.mpsession')
-
-        if not session_token:
-            client.logger.warning('Login attempt failed: Session token expired')
-            client.send_login_error()
-            client.close_connection()
-            return
-
-        if token != session_token.decode():
-            client.logger.warning('Login attempt failed: Invalid session token')
-            client.send_login_error()
-            client.close_connection()
-            return
-
     if client.battle_mode == 1 and penguin.snow_ninja_rank < 13:
         client.logger.warning('Login attempt failed: Tried to access tusk battle without snow gem')
         client.close_connection()
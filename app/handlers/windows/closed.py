@@ -8,6 +8,7 @@ def on_window_closed(client: Penguin, data: dict):
 
     window = client.get_window(window_name)
     window.loaded = False
+    client.notify_game()
 
     if window.on_close:
         window.on_close(client)
@@ -8,6 +8,7 @@ def on_window_ready(client: Penguin, data: dict):
 
     window = client.get_window(window_name)
     window.loaded = True
+    client.notify_game()
 
     if window.on_load:
         window.on_load(client)
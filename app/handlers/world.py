@@ -4,7 +4,7 @@ from app.objects.gameobject import LocalGameObject
 from app.engine.penguin import Penguin
 from app import session
 
-@session.events.register('/ready')
+@session.events.register('/ready', args=())
 def ready_handler(client: Penguin):
     if not client.window_manager.loaded:
         # Initialize window manager
@@ -44,7 +44,7 @@ def ready_handler(client: Penguin):
     client.setup_physics(client.place.physics)
     client.send_tag('P_ASSETSCOMPLETE')
 
-@session.events.register('/place_ready')
+@session.events.register('/place_ready', args=())
 def on_place_ready(client: Penguin):
     client.setup_camera(*client.place.camera.position)
     client.set_zoom(client.place.camera.zoom)
@@ -1,13 +1,18 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from app import session
 
 @dataclass
 class Asset:
     index: int
     name: str
+    reference: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Formatted reference, that is used inside of tags
+        self.reference = f'0:{self.index}'
 
     def __eq__(self, asset: "Asset") -> bool:
         return self.index == asset.index
@@ -9,63 +9,135 @@ if TYPE_CHECKING:
     from .ninjas import Ninja
     from .asset import Asset
 
-from typing import Set, List, TypeVar, Iterator, Generic
+from typing import Set, Dict, List, Tuple, TypeVar, Iterable, Iterator, Generic
+from collections import defaultdict
 from threading import Lock
+from itertools import count, chain
 
 import logging
 
 T = TypeVar('T')
 
-class LockedSet(Set, Generic[T]):
-    """A thread-safe set implementation."""
+class LockedSet(Generic[T]):
+    """
+    A thread-safe set implementation, using copy-on-write snapshots.
+    Writers replace the snapshot while holding the lock, so readers can
+    iterate over the current snapshot without locking or copying.
+    """
 
     def __init__(self):
         self.lock = Lock()
-        super().__init__()
+        self.snapshot: Dict[T, None] = {}
 
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} ({len(self)})>'
 
     def __iter__(self) -> Iterator[T]:
-        with self.lock:
-            items = iter(list(super().__iter__()))
-        return items
+        return iter(self.snapshot)
 
     def __len__(self) -> int:
-        with self.lock:
-            return len(list(super().__iter__()))
+        return len(self.snapshot)
 
     def __contains__(self, item: T) -> bool:
-        with self.lock:
-            return super().__contains__(item)
+        return item in self.snapshot
 
     def add(self, item: T) -> None:
-        return super().add(item)
+        with self.lock:
+            if item in self.snapshot:
+                return
+
+            snapshot = dict(self.snapshot)
+            snapshot[item] = None
+            self.snapshot = snapshot
+            self.on_add(item)
 
     def remove(self, item: T) -> None:
-        try:
-            return super().remove(item)
-        except (ValueError, KeyError):
-            pass
+        with self.lock:
+            if item not in self.snapshot:
+                return
+
+            snapshot = dict(self.snapshot)
+            del snapshot[item]
+            self.snapshot = snapshot
+            self.on_remove(item)
+
+    def on_add(self, item: T) -> None:
+        """Called with the lock held, after an item was added"""
+        ...
+
+    def on_remove(self, item: T) -> None:
+        """Called with the lock held, after an item was removed"""
+        ...
 
 class Players(LockedSet["Penguin"]):
+    def __init__(self):
+        super().__init__()
+        self.pids: Dict[int, Tuple["Penguin", ...]] = {}
+        self.tokens: Dict[str, Tuple["Penguin", ...]] = {}
+        self.keys: Dict["Penguin", Tuple[int, str]] = {}
+
+    def add(self, player: "Penguin") -> None:
+        if player in self:
+            # Indexed attributes might have changed
+            return self.reindex(player)
+
+        return super().add(player)
+
+    def reindex(self, player: "Penguin") -> None:
+        """Update the indexes of a player, after its pid or token changed"""
+        with self.lock:
+            if player not in self.snapshot:
+                return
+
+            self.on_remove(player)
+            self.on_add(player)
+
+    def on_add(self, player: "Penguin") -> None:
+        keys = (player.pid, player.token)
+        self.keys[player] = keys
+
+        for index, key in zip(self.indexes, keys):
+            if not key:
+                # Connections that haven't logged in yet would all share the same key
+                continue
+
+            index[key] = index.get(key, ()) + (player,)
+
+    def on_remove(self, player: "Penguin") -> None:
+        keys = self.keys.pop(player)
+
+        for index, key in zip(self.indexes, keys):
+            if not key:
+                continue
+
+            players = tuple(p for p in index.get(key, ()) if p is not player)
+
+            if players:
+                index[key] = players
+            else:
+                index.pop(key, None)
+
+    @property
+    def indexes(self) -> Tuple[Dict, Dict]:
+        return (self.pids, self.tokens)
+
     def by_id(self, id: int) -> "Penguin" | None:
-        return next((player for player in self if player.pid == id), None)
+        return next(iter(self.pids.get(id, ())), None)
 
     def by_name(self, name: str) -> "Penguin" | None:
         return next((player for player in self if player.name == name), None)
 
     def by_token(self, token: str) -> "Penguin" | None:
-        return next((player for player in self if player.token == token), None)
+        return next(iter(self.tokens.get(token, ())), None)
 
     def with_id(self, id: int) -> List["Penguin"]:
-        return [player for player in self if player.pid == id]
+        return list(self.pids.get(id, ()))
 
     def with_name(self, name: str) -> List["Penguin"]:
         return [player for player in self if player.name == name]
 
     def with_token(self, token: str) -> List["Penguin"]:
-        return [player for player in self if player.token == token]
+        return list(self.tokens.get(token, ()))
 
     def with_element(self, element: str, battle_mode: int = 0) -> List["Penguin"]:
         return [player for player in self if player.element == element and player.battle_mode == battle_mode]
@@ -80,15 +152,20 @@ class Games(LockedSet["Game"]):
         return next((game for game in self if game.id == id), None)
 
     def with_player(self, player: "Penguin") -> "Game" | None:
-        return next([game for game in self if player in game.clients], None)
+        return next((game for game in self if player in game.clients), None)
 
     def next_id(self) -> int:
         return max([game.id for game in self] or [0]) + 1
 
 class AssetCollection(Set["Asset"]):
+    """A set of assets, indexed by their index and name."""
+
     def __init__(self, initial_data: List["Asset"] = []) -> None:
         super().__init__()
-        super().update(initial_data)
+        self.indexes: Dict[int, "Asset"] = {}
+        self.names: Dict[str, "Asset"] = {}
+        self.version = 0
+        self.update(initial_data)
 
     def __eq__(self, other: "AssetCollection") -> bool:
         return super().__eq__(other)
@@ -97,48 +174,111 @@ class AssetCollection(Set["Asset"]):
         return hash(tuple(self))
 
     def add(self, asset: "Asset") -> None:
-        return super().add(asset)
+        if asset in self:
+            return
+
+        super().add(asset)
+        self.indexes[asset.index] = asset
+        # Some names are used by multiple assets, the first one is kept
+        self.names.setdefault(asset.name, asset)
+        self.version += 1
+
+    def update(self, *assets: Iterable["Asset"]) -> None:
+        for asset in chain(*assets):
+            self.add(asset)
 
     def remove(self, asset: "Asset") -> None:
-        return super().remove(asset)
+        super().remove(asset)
+        asset = self.indexes.pop(asset.index)
+        self.version += 1
+
+        if self.names.get(asset.name) is not asset:
+            return
+
+        # Fall back to the next asset with the same name
+        del self.names[asset.name]
+
+        for other in self:
+            if other.name == asset.name:
+                self.names[asset.name] = other
+                break
+
+    def discard(self, asset: "Asset") -> None:
+        if asset in self:
+            self.remove(asset)
+
+    def clear(self) -> None:
+        super().clear()
+        self.indexes.clear()
+        self.names.clear()
+        self.version += 1
 
     def by_index(self, index: int) -> "Asset" | None:
-        return next((asset for asset in self if asset.index == index), None)
+        return self.indexes.get(index)
 
     def by_name(self, name: str) -> "Asset" | None:
-        return next((asset for asset in self if asset.name == name), None)
+        return self.names.get(name)
+
+class ObjectCollection:
+    """A thread-safe collection of game objects, indexed by id and name."""
 
-class ObjectCollection(LockedSet["GameObject"]):
     def __init__(self, initial_data: List["GameObject"] = [], offset: int = 0) -> None:
-        super().__init__()
-        super().update(initial_data)
+        self.lock = Lock()
         self.offset = offset
+        self.next_ids = count(offset + 1)
+        self.objects: Dict[int, "GameObject"] = {}
+        self.names: Dict[str, Dict[int, "GameObject"]] = defaultdict(dict)
+        self.update(initial_data)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} ({len(self)})>'
+
+    def __iter__(self) -> Iterator["GameObject"]:
+        with self.lock:
+            return iter(list(self.objects.values()))
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def __contains__(self, object: "GameObject") -> bool:
+        return getattr(object, 'id', None) in self.objects
 
     def add(self, object: "GameObject") -> None:
-        object.id = self.get_id()
-        return super().add(object)
+        with self.lock:
+            object.id = self.get_id()
+            self.objects[object.id] = object
+            self.names[object.name][object.id] = object
 
     def update(self, objects: List["GameObject"]) -> None:
         for object in objects:
-            object.id = self.get_id()
-
-        super().update(objects)
+            self.add(object)
 
     def remove(self, object: "GameObject") -> None:
-        if object in self:
-            return super().remove(object)
+        with self.lock:
+            if not (object := self.objects.pop(object.id, None)):
+                return
+
+            named_objects = self.names[object.name]
+            named_objects.pop(object.id, None)
+
+            if not named_objects:
+                del self.names[object.name]
 
     def by_id(self, id: int) -> "GameObject" | Ninja | None:
-        return next((object for object in self if object.id == id), None)
+        return self.objects.get(id)
 
     def by_name(self, name: str) -> "GameObject" | Ninja | None:
-        return next((object for object in self if object.name == name), None)
+        return next(iter(self.with_name(name)), None)
 
     def with_id(self, id: int) -> List["GameObject" | Ninja]:
-        return [object for object in self if object.id == id]
+        return [object] if (object := self.objects.get(id)) else []
 
     def with_name(self, name: str) -> List["GameObject" | Ninja]:
-        return [object for object in self if object.name == name]
+        with self.lock:
+            if name not in self.names:
+                return []
+
+            return list(self.names[name].values())
 
     def get_id(self) -> int:
-        return max([object.id for object in self] or [self.offset]) + 1
+        return next(self.next_ids)
@@ -8,8 +8,6 @@ if TYPE_CHECKING:
 from app.data import MirrorMode, OriginMode
 from app.objects import GameObject
 
-import time
-
 class Effect(GameObject):
     def __init__(
         self,
@@ -118,7 +116,7 @@ class AttackTileField:
                 self.tiles.append(tile := AttackTile(self.game, x, y))
                 tile.play()
 
-        time.sleep(0.25)
+        self.game.sleep(0.25)
         self.remove()
 
     def remove(self):
@@ -412,7 +410,7 @@ class ScrapImpactSurroundings:
                 impact.play()
                 tile.play()
 
-        time.sleep(0.35)
+        self.game.sleep(0.35)
         self.remove()
 
     def remove(self):
@@ -496,7 +494,7 @@ class ScrapProjectileImpact:
         self.effects.append(projectile := ScrapProjectile(self.game, self.center_x, self.center_y))
         projectile.play_northeast(self.center_x - 1, self.center_y + 0.8)
 
-        time.sleep(self.duration)
+        self.game.sleep(self.duration)
         for effect in self.effects:
             effect.remove_object()
 
@@ -761,7 +759,7 @@ class TuskIcicleRow:
         for x in x_range:
             TuskIcicle(self.game, x, self.first_row).play()
             TuskIcicle(self.game, x, self.second_row).play()
-            time.sleep(0.09)
+            self.game.sleep(0.09)
 
 class TuskPushRock(Effect):
     def __init__(self, game: "Game", x: int, y: int) -> None:
@@ -30,7 +30,7 @@ from app.objects.effects import (
 
 import itertools
 import random
-import time
+import math
 
 class Enemy(GameObject):
     name: str = 'Enemy'
@@ -178,7 +178,7 @@ class Enemy(GameObject):
             return
 
         # This seems to fix the mirror mode?
-        time.sleep(0.25)
+        self.game.sleep(0.25)
 
         self.attack_animation()
         target.set_health(target.hp - self.attack)
@@ -213,7 +213,8 @@ class Enemy(GameObject):
             if not self.game.grid.can_move(tile.x, tile.y):
                 continue
 
-            distance = self.game.grid.distance_with_obstacles(
+            # Use the walking distance, so that the enemy only moves to tiles it can reach
+            distance = self.game.pathfinder.walking_distance(
                 (self.x, self.y),
                 (tile.x, tile.y)
             )
@@ -223,7 +224,14 @@ class Enemy(GameObject):
 
     def attackable_tiles(self, target_x: int, target_y: int, range: int | None = None) -> Iterator[GameObject]:
         """Get all tiles that the enemy can attack from its current position"""
-        for tile in self.game.grid.tiles:
+        # Only ninjas can be attacked, so there is no need to check every tile
+        ninja_tiles = sorted(
+            (tile for ninja in self.game.ninjas
+             if (tile := self.game.grid.get_tile(ninja.x, ninja.y))),
+            key=lambda tile: self.game.grid.index(tile.x, tile.y)
+        )
+
+        for tile in ninja_tiles:
             target_object = self.game.grid[tile.x, tile.y]
 
             if not target_object:
@@ -302,34 +310,31 @@ class Enemy(GameObject):
         return next_move, targets[0]
 
     def closest_move(self) -> GameObject | None:
-        """Get the closest tile to a ninja, that the enemy can move to"""
-
-        # TODO: This method can sometimes lead to the enemy being stuck
-        #       if the target is behind an obstacle. We should probably
-        #       implement a pathfinding algorithm to fix this.
-
+        """Get the tile closest to a ninja, that the enemy can move to"""
         if not (tiles := list(self.movable_tiles())):
             # Enemy can't move
             return
 
-        # Get all ninja tiles, and sort them by distance to enemy
-        tiles = [
-            min(
-                tiles,
-                key=lambda tile: abs(tile.x - ninja.x) + abs(tile.y - ninja.y)
-            )
-            for ninja in self.game.ninjas
-            if ninja.hp > 0
-        ]
+        pathfinder = self.game.pathfinder
 
-        if not tiles:
-            # No available tiles
+        # Use the walking distance to the closest ninja, so that
+        # the enemy doesn't get stuck behind an obstacle
+        distances = {
+            tile: pathfinder.distance_to_ninja(tile.x, tile.y)
+            for tile in tiles
+        }
+
+        if all(distance == math.inf for distance in distances.values()):
+            # No reachable ninjas
             return
 
-        # Return tile that is closest to enemy
+        # Prefer the tile that is closest to the enemy
         return min(
             tiles,
-            key=lambda tile: abs(tile.x - self.x) + abs(tile.y - self.y)
+            key=lambda tile: (
+                distances[tile],
+                abs(tile.x - self.x) + abs(tile.y - self.y)
+            )
         )
 
     def simulate_damage(self, x_position: int, y_position: int, target: GameObject) -> int:
@@ -398,7 +403,7 @@ class Sly(Enemy):
             return
 
         # This seems to fix the mirror mode?
-        time.sleep(0.25)
+        self.game.sleep(0.25)
 
         distance = abs(self.x - target.x) + abs(self.y - target.y)
 
@@ -429,7 +434,7 @@ class Sly(Enemy):
         if self.x < x:
             self.mirror_mode = MirrorMode.X
 
-        time.sleep(0.25)
+        self.game.sleep(0.25)
         self.animate_object(
             'sly_attack_anim',
             play_style='play_once',
@@ -439,11 +444,11 @@ class Sly(Enemy):
         self.idle_animation()
         self.attack_sound()
 
-        time.sleep(1.45)
+        self.game.sleep(1.45)
         projectile = SlyProjectile(self.game, self.x, self.y)
         projectile.play(x, y)
 
-        time.sleep(0.5)
+        self.game.sleep(0.5)
         self.impact_sound()
         projectile.remove_object()
 
@@ -515,7 +520,7 @@ class Scrap(Enemy):
             return
 
         # This seems to fix the mirror mode?
-        time.sleep(0.25)
+        self.game.sleep(0.25)
 
         self.attack_animation(target.x, target.y)
         target.set_health(target.hp - self.attack)
@@ -579,13 +584,13 @@ class Scrap(Enemy):
         )
         self.idle_animation()
 
-        time.sleep(0.7)
+        self.game.sleep(0.7)
         self.attack_sound()
 
         distance = abs(self.x - x) + abs(self.y - y)
         impact_time = 0.9 + (distance * 0.1)
 
-        time.sleep(impact_time)
+        self.game.sleep(impact_time)
         self.impact_sound()
 
         ScrapImpact(self.game, x, y).play()
@@ -680,7 +685,7 @@ class Tank(Enemy):
             return
 
         # This seems to fix the mirror mode?
-        time.sleep(0.25)
+        self.game.sleep(0.25)
 
         self.attack_animation(target.x, target.y)
         target.set_health(target.hp - self.attack)
@@ -724,7 +729,7 @@ class Tank(Enemy):
         for attack_tile in effects:
             attack_tile.play()
 
-        time.sleep(0.25)
+        self.game.sleep(0.25)
 
         for attack_tile in effects:
             attack_tile.remove_object()
@@ -758,7 +763,7 @@ class Tank(Enemy):
             reset=True
         )
         self.idle_animation()
-        time.sleep(0.15)
+        self.game.sleep(0.15)
 
     def ko_animation(self) -> None:
         self.animate_object(
@@ -921,7 +926,7 @@ class Tusk(Enemy):
 
             ninja_positions.append((result_x, ninja.y))
 
-        time.sleep(attack_delay)
+        self.game.sleep(attack_delay)
         x_range = list(self.game.grid.x_range)
         x_range.reverse()
 
@@ -950,7 +955,7 @@ class Tusk(Enemy):
                     base_y
                 ).play()
 
-            time.sleep((push_duration / len(x_range)) / 2)
+            self.game.sleep((push_duration / len(x_range)) / 2)
 
             for base_x, base_y in last_positions:
                 if x - base_x < 0:
@@ -962,13 +967,13 @@ class Tusk(Enemy):
                     base_y
                 ).play()
 
-            time.sleep((push_duration / len(x_range)) / 2)
+            self.game.sleep((push_duration / len(x_range)) / 2)
 
         self.game.wait_for_animations()
 
     def icicle_attack_random(self) -> None:
         self.icicle_attack_animation()
-        time.sleep(1.1)
+        self.game.sleep(1.1)
 
         # NOTE: The actual algorithm for this attack is unknown
         #       I am just going to improvise for now
@@ -1002,19 +1007,19 @@ class Tusk(Enemy):
         for x, y in positions:
             TuskIcicle(self.game, x, y).play()
 
-        time.sleep(1.5)
+        self.game.sleep(1.5)
         self.game.wait_for_animations()
 
     def icicle_attack_paired(self) -> None:
         self.icicle_attack_animation()
-        time.sleep(1.1)
+        self.game.sleep(1.1)
         effect = TuskIcicleRow(
             self.game,
             next(self.icicle_pairs)
         )
         effect.play()
 
-        time.sleep(1)
+        self.game.sleep(1)
         self.game.wait_for_animations()
 
     def set_health(self, hp: int, wait=True) -> None:
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Callable
-from twisted.internet import reactor
 
 if TYPE_CHECKING:
     from app.engine.penguin import Penguin
@@ -10,6 +9,7 @@ if TYPE_CHECKING:
 
 from app.engine.callbacks import ActionType
 from app.data.constants import OriginMode, MirrorMode
+from .tags import O_HERE, O_SLIDE, O_ANIM, O_SPRITE
 from .sound import Sound
 
 class GameObject:
@@ -116,28 +116,20 @@ class GameObject:
         )
 
     def do_later(self, seconds: int, func: Callable, *args) -> None:
-        reactor.callLater(seconds, func, *args)  # type: ignore
+        self.game.call_later(seconds, func, *args)
 
     def place_object(self) -> None:
         x = self.x
         y = self.y
 
-        self.target.send_tag(
-            'O_HERE',
-            self.id,
-            '0:1',  # TODO
-            x + self.x_offset,
-            y + self.y_offset,
-            0,      # TODO
-            1,      # TODO
-            0,      # TODO
-            0,      # TODO
-            0,      # TODO
-            self.name,
-            '0:1',  # TODO
-            0,      # TODO
-            1,      # TODO
-            0       # TODO
+        self.target.send_encoded_tag(
+            O_HERE.tag,
+            O_HERE.encode(
+                self.id,
+                x + self.x_offset,
+                y + self.y_offset,
+                self.name
+            )
         )
 
         # Apply sprite settings if they are not default
@@ -161,13 +153,14 @@ class GameObject:
         if self.grid:
             self.game.grid.move(self, x, y)
 
-        self.target.send_tag(
-            'O_SLIDE',
-            self.id,
-            x + self.x_offset,
-            y + self.y_offset,
-            128, # Z Coordinate
-            duration
+        self.target.send_encoded_tag(
+            O_SLIDE.tag,
+            O_SLIDE.encode(
+                self.id,
+                x + self.x_offset,
+                y + self.y_offset,
+                duration
+            )
         )
 
     def remove_object(self) -> None:
@@ -203,16 +196,18 @@ class GameObject:
                 callback=callback
             )
 
-        self.target.send_tag(
-            'O_ANIM',
-            self.id,
-            f'0:{asset.index}',
-            play_style,
-            duration or '',
-            time_scale,
-            int(not reset),
-            self.id,
-            handle_id
+        self.target.send_encoded_tag(
+            O_ANIM.tag,
+            O_ANIM.encode(
+                self.id,
+                asset.reference,
+                play_style,
+                duration or '',
+                time_scale,
+                int(not reset),
+                self.id,
+                handle_id
+            )
         )
 
     def set_camera_target(self) -> None:
@@ -222,12 +217,12 @@ class GameObject:
         asset = self.target.server.assets.by_name(name)
         target = target or self.target
 
-        target.send_tag(
-            'O_SPRITE',
-            self.id,
-            f'0:{asset.index}',
-            0, # TODO
-            '' # TODO
+        target.send_encoded_tag(
+            O_SPRITE.tag,
+            O_SPRITE.encode(
+                self.id,
+                asset.reference
+            )
         )
 
     def load_sprite(self, name: str) -> None:
@@ -235,7 +230,7 @@ class GameObject:
 
         self.target.send_tag(
             'S_LOADSPRITE',
-            f'0:{asset.index}'
+            asset.reference
         )
 
     def animate_sprite(
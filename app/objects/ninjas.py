@@ -31,7 +31,6 @@ from app.objects.enemies import Enemy, Tusk
 from app.objects import GameObject
 
 import app.engine.cards
-import time
 
 class Ninja(GameObject):
     name: str = 'Ninja'
@@ -328,7 +327,7 @@ class Ninja(GameObject):
 
     def attack_target(self, target: Enemy):
         # This delay seems to fix the mirror mode?
-        time.sleep(0.25)
+        self.game.sleep(0.25)
 
         self.attack_animation(target.x, target.y)
         self.client.update_cards()
@@ -360,7 +359,7 @@ class Ninja(GameObject):
         self.heals += 1
         self.heal_animation()
         self.client.update_cards()
-        time.sleep(0.4)
+        self.game.sleep(0.4)
 
         if self.rage:
             self.rage.use(target.x, target.y)
@@ -630,7 +629,7 @@ class WaterNinja(Ninja):
         )
         self.idle_animation()
 
-        time.sleep(0.45)
+        self.game.sleep(0.45)
         self.attack_sound()
 
     def win_animation(self) -> None:
@@ -687,7 +686,7 @@ class WaterNinja(Ninja):
         )
         self.idle_animation()
         self.powercard_sound()
-        time.sleep(0.65)
+        self.game.sleep(0.65)
 
     def attack_sound(self) -> None:
         self.play_sound('sfx_mg_2013_cjsnow_attackwater')
@@ -754,14 +753,14 @@ class SnowNinja(Ninja):
         )
         self.idle_animation()
 
-        time.sleep(0.3)
+        self.game.sleep(0.3)
         self.projectile_animation(x, y)
 
     def projectile_animation(self, x: int, y: int) -> None:
         # This is kinda jank lol
         projectile = SnowProjectile(self.game, self.x, self.y)
         projectile.play(x, y)
-        time.sleep(0.2)
+        self.game.sleep(0.2)
         projectile.remove_object()
 
         projectile = SnowProjectile(self.game, self.x, self.y)
@@ -830,7 +829,7 @@ class SnowNinja(Ninja):
         )
         self.idle_animation()
         self.powercard_sound()
-        time.sleep(0.45)
+        self.game.sleep(0.45)
 
     def attack_sound(self) -> None:
         self.play_sound('sfx_mg_2013_cjsnow_attacksnow')
@@ -897,7 +896,7 @@ class FireNinja(Ninja):
         )
         self.idle_animation()
 
-        time.sleep(1.45)
+        self.game.sleep(1.45)
         self.projectile_animation(x, y)
 
     def projectile_animation(self, x: int, y: int) -> None:
@@ -963,7 +962,7 @@ class FireNinja(Ninja):
         )
         self.idle_animation()
         self.powercard_sound()
-        time.sleep(1)
+        self.game.sleep(1)
 
     def move_sound(self) -> None:
         self.play_sound('sfx_mg_2013_cjsnow_footsteppenguinfire')
@@ -1019,10 +1018,10 @@ class Sensei(GameObject):
         if not self.game.enemies:
             return
 
-        time.sleep(0.5)
+        self.game.sleep(0.5)
         self.attack_animation()
         self.attack_sound()
-        time.sleep(0.5)
+        self.game.sleep(0.5)
 
         beam_class = {
             'fire': FirePowerBeam,
@@ -1040,7 +1039,7 @@ class Sensei(GameObject):
         beam.x_offset = beam_offset[0]
         beam.y_offset = beam_offset[1]
         beam.play()
-        time.sleep(0.65)
+        self.game.sleep(0.65)
 
         positions = [
             (1, 2),
@@ -1053,12 +1052,12 @@ class Sensei(GameObject):
 
         for x, y in positions:
             impacts.append(self.place_card(x, y))
-            time.sleep(delay)
+            self.game.sleep(delay)
 
         if self.element_state == 'snow':
             self.snow_impact_sound()
 
-        time.sleep(impacts[0][1].duration - delay)
+        self.game.sleep(impacts[0][1].duration - delay)
 
         beam.remove_object()
         self.idle_animation()
@@ -83,7 +83,7 @@ class Sound(Asset):
 
         target.send_tag(
             'FX_PLAYSOUND',
-            f'0:{self.index}',
+            self.reference,
             handle_id,
             int(self.looping),
             self.volume,
@@ -0,0 +1,86 @@
+
+from __future__ import annotations
+from typing import Any, List
+
+VARIABLE = ...
+
+class TagTemplate:
+    """
+    A pre-compiled encoder for a tag with mostly constant arguments.
+    Constant arguments are formatted once, so only the variable fields
+    (marked with `VARIABLE`) have to be formatted when encoding the tag.
+    """
+
+    def __init__(self, tag: str, *args: Any) -> None:
+        self.tag = tag
+        self.fields = sum(1 for a in args if a is VARIABLE)
+
+        segments: List[str] = [f'[{tag}]']
+
+        for argument in args:
+            if argument is VARIABLE:
+                segments.append('{}')
+                continue
+
+            # Escape braces, so that constants are not treated as fields
+            segments.append(str(argument).replace('{', '{{').replace('}', '}}'))
+
+        self.format = '|'.join(segments) + '|'
+
+    def __repr__(self) -> str:
+        return f'<TagTemplate "{self.tag}" ({self.fields})>'
+
+    def encode(self, *values: Any) -> bytes:
+        return self.format.format(*values).encode()
+
+O_HERE = TagTemplate(
+    'O_HERE',
+    VARIABLE, # Object id
+    '0:1',    # TODO
+    VARIABLE, # X
+    VARIABLE, # Y
+    0,        # TODO
+    1,        # TODO
+    0,        # TODO
+    0,        # TODO
+    0,        # TODO
+    VARIABLE, # Name
+    '0:1',    # TODO
+    0,        # TODO
+    1,        # TODO
+    0         # TODO
+)
+
+O_SLIDE = TagTemplate(
+    'O_SLIDE',
+    VARIABLE, # Object id
+    VARIABLE, # X
+    VARIABLE, # Y
+    128,      # Z Coordinate
+    VARIABLE  # Duration
+)
+
+O_ANIM = TagTemplate(
+    'O_ANIM',
+    VARIABLE, # Object id
+    VARIABLE, # Asset
+    VARIABLE, # Play style
+    VARIABLE, # Duration
+    VARIABLE, # Time scale
+    VARIABLE, # Queue animation
+    VARIABLE, # Response object id
+    VARIABLE  # Handle id
+)
+
+O_SPRITE = TagTemplate(
+    'O_SPRITE',
+    VARIABLE, # Object id
+    VARIABLE, # Asset
+    0,        # TODO
+    ''        # TODO
+)
+
+S_LOADSPRITE = TagTemplate(
+    'S_LOADSPRITE',
+    VARIABLE  # Asset
+)
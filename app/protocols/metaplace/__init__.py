@@ -1,5 +1,5 @@
 
 from .places import Place, Camera3D, Camera, Physics, Render, MapBlocks
-from .windows import WindowManager, SWFWindow
+from .windows import WindowManager, WindowBroadcast, WindowStates, WindowState, SWFWindow
 from .protocol import MetaplaceProtocol
 from .world import MetaplaceWorldServer
@@ -1,7 +1,11 @@
 
+from __future__ import annotations
+
+from app.objects.tags import S_LOADSPRITE
 from app.objects import AssetCollection
 from dataclasses import dataclass
 from app.data import ViewMode
+from typing import Tuple
 
 # Inspiration taken from solero/tusk:
 # https://github.com/solero/tusk/blob/master/tusk/places/__init__.py
@@ -85,3 +89,22 @@ class Place:
     sound_assets = AssetCollection()
     draggable: bool = False
     object_lock: bool = False
+
+    def preload(self, delimiter: bytes = b'\r\n') -> bytes:
+        """Encoded "S_LOADSPRITE" tags for all assets & sounds of this place"""
+        key = (
+            delimiter,
+            id(self.assets), self.assets.version,
+            id(self.sound_assets), self.sound_assets.version
+        )
+        cache: Tuple[tuple, bytes] | None = self.__dict__.get('preload_cache')
+
+        if cache and cache[0] == key:
+            return cache[1]
+
+        data = delimiter.join(
+            S_LOADSPRITE.encode(asset.reference)
+            for asset in (*self.assets, *self.sound_assets)
+        )
+        self.preload_cache = (key, data)
+        return data
@@ -4,12 +4,15 @@ from __future__ import annotations
 from twisted.internet.address import IPv4Address, IPv6Address
 from twisted.protocols.basic import LineOnlyReceiver
 from twisted.python.failure import Failure
+from twisted.internet import reactor
 from typing import List, Any, TYPE_CHECKING
+from threading import Lock
 
 if TYPE_CHECKING:
     from app.protocols import MetaplaceWorldServer
 
 from app.protocols.metaplace import Place, Camera3D, Physics, WindowManager
+from app.arguments import parse_arguments
 from app.objects import ObjectCollection
 from app.data import (
     InputModifier,
@@ -23,8 +26,6 @@ from app.data import (
 
 import logging
 import time
-import json
-import ast
 
 class MetaplaceProtocol(LineOnlyReceiver):
     def __init__(self, server: "MetaplaceWorldServer", address: IPv4Address | IPv6Address) -> None:
@@ -44,6 +45,10 @@ class MetaplaceProtocol(LineOnlyReceiver):
         self.window_manager = WindowManager(self)
         self.local_objects = ObjectCollection()
 
+        self.write_buffer: List[bytes] = []
+        self.write_lock = Lock()
+        self.flush_scheduled = False
+
     def dataReceived(self, data: bytes):
         # NOTE: The socket policy file usually gets requested on a separate server
         #       This is just used as a fallback, in case the policy file server is down
@@ -74,27 +79,15 @@ class MetaplaceProtocol(LineOnlyReceiver):
         if not data:
             return
 
+        command, _, arguments = data.partition(' ')
+
         try:
-            # TODO: Add argument length validation
-            parsed = data.split()
-            command, *args = parsed
-        except (ValueError, UnicodeDecodeError):
-            self.logger.warning(f'Invalid request: "{data}"')
+            args = self.parse_arguments(command, arguments)
+        except (ValueError, SyntaxError) as e:
+            self.logger.warning(f'Invalid arguments for "{command}": {e}')
             self.close_connection()
             return
 
-        for index, argument in enumerate(args):
-            try:
-                if argument.startswith('{'):
-                    # We received a json string
-                    args = [json.loads(' '.join(args))]
-                    break
-
-                # Try to convert the argument to a Python object
-                args[index] = ast.literal_eval(argument)
-            except (ValueError, SyntaxError, json.JSONDecodeError):
-                pass
-
         self.command_received(command, args)
 
     def connectionLost(self, reason: Failure | None = None) -> None:
@@ -108,34 +101,67 @@ class MetaplaceProtocol(LineOnlyReceiver):
         if not self.transport:
             return
 
+        self.flush()
         self.transport.loseConnection()
         self.connectionLost()
 
+    @staticmethod
+    def encode_tag(tag: str, *args) -> bytes:
+        encoded_arguments = '|'.join(str(a) for a in args)
+        return f'[{tag}]|{encoded_arguments}|'.encode()
+
     def send_tag(self, tag: str, *args) -> None:
         if not self.transport:
             return
 
-        self.logger.debug(f'<- "{tag}": {args}')
+        self.send_encoded_tag(tag, self.encode_tag(tag, *args))
 
-        encoded_arguments = '|'.join(str(a) for a in args)
-        self.sendLine(f'[{tag}]|{encoded_arguments}|'.encode())
+    def send_encoded_tag(self, tag: str, data: bytes) -> None:
+        """Send a tag, that was already encoded with `encode_tag`"""
+        if not self.transport:
+            return
+
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f'<- "{tag}": {data}')
+
+        self.write(data)
+
+    def write(self, line: bytes) -> None:
+        """Queue a line, which will be written together with all other queued lines"""
+        if not self.transport:
+            return
+
+        with self.write_lock:
+            self.write_buffer.append(line)
+
+            if self.flush_scheduled:
+                return
+
+            self.flush_scheduled = True
+
+        # Flush the buffer in the next reactor iteration, which is
+        # also safe to do when called from inside of a game thread
+        reactor.callFromThread(self.flush)  # type: ignore
+
+    def flush(self) -> None:
+        """Write all queued lines to the transport, in a single call"""
+        with self.write_lock:
+            lines, self.write_buffer = self.write_buffer, []
+            self.flush_scheduled = False
+
+        if not lines or not self.transport:
+            return
+
+        lines.append(b'')
+        self.transport.write(self.delimiter.join(lines))
 
     def switch_place(self, place: Place) -> None:
         self.set_place(place.id)
 
-        # Load sprites
-        for asset in place.assets:
-            self.send_tag(
-                'S_LOADSPRITE',
-                f'0:{asset.index}'
-            )
-
-        # Load sounds
-        for sound in place.sound_assets:
-            self.send_tag(
-                'S_LOADSPRITE',
-                f'0:{sound.index}'
-            )
+        # Load sprites & sounds
+        if preload := place.preload(self.delimiter):
+            self.logger.debug(f'<- "S_LOADSPRITE": {len(place.assets) + len(place.sound_assets)} assets')
+            self.write(preload)
 
         self.send_tag('W_ASSETSCOMPLETE', self.pid)
 
@@ -270,6 +296,10 @@ class MetaplaceProtocol(LineOnlyReceiver):
             int(settings.net_friction), int(settings.net_bounce)
         )
 
+    def parse_arguments(self, command: str, data: str) -> List[Any]:
+        """This method can be overridden, to parse the arguments of a command with a schema."""
+        return parse_arguments(data)
+
     def command_received(self, command: str, args: List[Any]):
         """This method should be overridden by the protocol implementation."""
         ...
@@ -1,6 +1,7 @@
 
 from __future__ import annotations
-from typing import Dict, Callable
+from typing import Dict, Callable, List
+from threading import Condition
 
 from app.data import WindowAction, MessageType, EventType
 from app import protocols
@@ -9,6 +10,50 @@ import config
 import json
 import time
 
+def merge_json(*objects: str) -> str:
+    """Merge multiple json objects, that were already serialized with `json.dumps`"""
+    members = [object[1:-1] for object in objects if object != '{}']
+    return '{' + ', '.join(members) + '}'
+
+class WindowState:
+    """Returned when loading/closing a window, to wait until the client has loaded/closed it"""
+
+    def __init__(self, window: SWFWindow, loaded: bool) -> None:
+        self.window = window
+        self.loaded = loaded
+
+    def __repr__(self) -> str:
+        return f"<SWF State ({self.window.name}, loaded={self.loaded})>"
+
+    @property
+    def done(self) -> bool:
+        return self.window.loaded == self.loaded or self.window.client.disconnected
+
+    def wait(self, timeout: float = 8) -> bool:
+        return self.window.wait(self.loaded, timeout)
+
+class WindowStates:
+    """Returned when loading/closing a window for multiple clients, to wait until every client has loaded/closed it"""
+
+    def __init__(self, states: List[WindowState]) -> None:
+        self.states = states
+
+    def __repr__(self) -> str:
+        names = sorted({state.window.name for state in self.states})
+        return f"<SWF States ({', '.join(names)}, {len(self.states)} windows)>"
+
+    @property
+    def done(self) -> bool:
+        return all(state.done for state in self.states)
+
+    def wait(self, timeout: float = 8) -> bool:
+        deadline = time.monotonic() + timeout
+
+        return all(
+            state.wait(max(0, deadline - time.monotonic()))
+            for state in self.states
+        )
+
 class SWFWindow:
     """
     This class represents a swf window inside the game. The window can be loaded, using the WindowManager class.
@@ -38,7 +83,8 @@ class SWFWindow:
         self.client = client
         self.layer = layer # TODO: topLayer, bottomLayer, toolLayer
         self.asset_path = '' # TODO
-        self.loaded = False
+        self.condition = Condition()
+        self._loaded = False
 
         self.on_load: Callable | None = None
         self.on_close: Callable | None = None
@@ -46,62 +92,198 @@ class SWFWindow:
     def __repr__(self) -> str:
         return f"<SWF ({self.name})>"
 
-    def send(self, content: dict = {}, message_type = MessageType.RECEIVED_JSON, **kwargs):
-        content.update(kwargs)
-        self.client.send_tag(
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @loaded.setter
+    def loaded(self, value: bool) -> None:
+        with self.condition:
+            self._loaded = value
+            self.condition.notify_all()
+
+    def notify(self) -> None:
+        """Wake up everything that is waiting for this window, e.g. after the client has disconnected"""
+        with self.condition:
+            self.condition.notify_all()
+
+    def wait(self, loaded: bool = True, timeout: float = 8) -> bool:
+        """Block until the window was loaded/closed by the client, or the timeout expires"""
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: self.loaded == loaded or self.client.disconnected,
+                timeout
+            )
+
+    def send(self, content: dict | None = None, message_type = MessageType.RECEIVED_JSON, **kwargs):
+        if not self.client.transport:
+            return
+
+        self.send_encoded(self.encode({**(content or {}), **kwargs}, message_type))
+
+    def send_encoded(self, data: bytes) -> None:
+        """Send an event, that was already encoded with `encode`"""
+        self.client.send_encoded_tag('UI_CLIENTEVENT', data)
+
+    def encode(self, content: dict | str, message_type = MessageType.RECEIVED_JSON) -> bytes:
+        if isinstance(content, dict):
+            content = json.dumps(content)
+
+        return protocols.MetaplaceProtocol.encode_tag(
             'UI_CLIENTEVENT',
             self.client.server.world_id,
             message_type.value,
-            json.dumps(content)
+            content
         )
 
-    def load(self, initial_payload: dict = None, **kwargs):
+    def load(self, initial_payload: dict = None, shared_payload: str | None = None, **kwargs) -> WindowState:
+        """
+        Load the window. `shared_payload` can contain fields of the initialization payload,
+        that were already serialized with `json.dumps`, e.g. because all clients receive them.
+        """
+        event = self.load_event(initial_payload, **kwargs)
+
+        if shared_payload is None:
+            self.send(event)
+            return WindowState(self, loaded=True)
+
+        if not self.client.transport:
+            return WindowState(self, loaded=True)
+
+        del event['initializationPayload']
+        payload = merge_json(json.dumps(initial_payload or {}), shared_payload)
+
+        self.send_encoded(
+            self.encode(merge_json(
+                json.dumps(event),
+                f'{{"initializationPayload": {payload}}}'
+            ))
+        )
+        return WindowState(self, loaded=True)
+
+    def close(self, **kwargs) -> WindowState:
+        self.send(self.close_event(**kwargs))
+        return WindowState(self, loaded=False)
+
+    def send_payload(self, trigger_name: str, payload: dict = None, type = EventType.IMMEDIATE, **kwargs):
+        self.send(self.payload_event(trigger_name, payload, type, **kwargs))
+
+    def send_action(self, action: str, type = EventType.IMMEDIATE, **kwargs):
+        self.send(self.action_event(action, type, **kwargs))
+
+    def load_event(self, initial_payload: dict = None, **kwargs) -> dict:
         if config.APPLY_WINDOWMANAGER_OFFSET:
             kwargs['xPercent'] = kwargs.get('xPercent', 0) - 0.5
             kwargs['yPercent'] = kwargs.get('yPercent', 0) - 0.5
 
-        self.send(
-            {
-                'windowUrl': self.url,
-                'layerName': self.layer,
-                'assetPath': self.asset_path,
-                'initializationPayload': initial_payload,
-                'action': WindowAction.LOAD_WINDOW.value,
-                'type': EventType.PLAY_ACTION.value
-            },
+        return {
+            'windowUrl': self.url,
+            'layerName': self.layer,
+            'assetPath': self.asset_path,
+            'initializationPayload': initial_payload,
+            'action': WindowAction.LOAD_WINDOW.value,
+            'type': EventType.PLAY_ACTION.value,
             **kwargs
-        )
+        }
 
-    def close(self, **kwargs):
-        self.send(
-            {
-                'targetWindow': self.url,
-                'action': WindowAction.CLOSE_WINDOW.value,
-                'type': EventType.PLAY_ACTION.value,
-            },
+    def close_event(self, **kwargs) -> dict:
+        return {
+            'targetWindow': self.url,
+            'action': WindowAction.CLOSE_WINDOW.value,
+            'type': EventType.PLAY_ACTION.value,
             **kwargs
-        )
-
-    def send_payload(self, trigger_name: str, payload: dict = {}, type = EventType.IMMEDIATE, **kwargs):
-        self.send(
-            {
-                'jsonPayload': payload,
-                'targetWindow': self.url,
-                'triggerName': trigger_name,
-                'action': WindowAction.JSON_PAYLOAD.value,
-                'type': type.value
-            },
+        }
+
+    def payload_event(self, trigger_name: str, payload: dict = None, type = EventType.IMMEDIATE, **kwargs) -> dict:
+        return {
+            'jsonPayload': payload if payload is not None else {},
+            'targetWindow': self.url,
+            'triggerName': trigger_name,
+            'action': WindowAction.JSON_PAYLOAD.value,
+            'type': type.value,
             **kwargs
-        )
+        }
 
-    def send_action(self, action: str, type = EventType.IMMEDIATE, **kwargs):
-        self.send(
-            {
-                'action': action,
-                'type': type.value
-            },
+    def action_event(self, action: str, type = EventType.IMMEDIATE, **kwargs) -> dict:
+        return {
+            'action': action,
+            'type': type.value,
             **kwargs
-        )
+        }
+
+class WindowBroadcast:
+    """
+    Sends the same events to a window of multiple clients, e.g. to every player inside of a game.
+    Events are only serialized once, and the encoded data is reused for every client.
+    """
+
+    def __init__(self, windows: List[SWFWindow]) -> None:
+        self.windows = windows
+
+    def __repr__(self) -> str:
+        return f"<SWF Broadcast ({len(self.windows)} windows)>"
+
+    @property
+    def layer(self) -> str | None:
+        return self.windows[0].layer if self.windows else None
+
+    @layer.setter
+    def layer(self, layer: str) -> None:
+        for window in self.windows:
+            window.layer = layer
+
+    @property
+    def recipients(self) -> List[SWFWindow]:
+        return [window for window in self.windows if window.client.transport]
+
+    def send(self, content: dict, message_type = MessageType.RECEIVED_JSON) -> None:
+        if not (recipients := self.recipients):
+            return
+
+        # Every window shares the same url & world, so the event is the same for every client
+        data = recipients[0].encode(content, message_type)
+
+        for window in recipients:
+            window.send_encoded(data)
+
+    def load(
+        self,
+        initial_payload: dict = None,
+        per_client: Callable[[protocols.MetaplaceProtocol], dict] | None = None,
+        **kwargs
+    ) -> WindowStates:
+        """
+        Load the window for every client. `per_client` can return additional fields
+        of the initialization payload, which are different for every client.
+        """
+        if not (recipients := self.recipients):
+            return WindowStates([])
+
+        if per_client is None:
+            self.send(recipients[0].load_event(initial_payload, **kwargs))
+            return WindowStates([WindowState(window, loaded=True) for window in recipients])
+
+        shared_payload = json.dumps(initial_payload or {})
+
+        return WindowStates([
+            window.load(per_client(window.client), shared_payload, **kwargs)
+            for window in recipients
+        ])
+
+    def close(self, **kwargs) -> WindowStates:
+        if not (recipients := self.recipients):
+            return WindowStates([])
+
+        self.send(recipients[0].close_event(**kwargs))
+        return WindowStates([WindowState(window, loaded=False) for window in recipients])
+
+    def send_payload(self, trigger_name: str, payload: dict = None, type = EventType.IMMEDIATE, **kwargs) -> None:
+        if self.windows:
+            self.send(self.windows[0].payload_event(trigger_name, payload, type, **kwargs))
+
+    def send_action(self, action: str, type = EventType.IMMEDIATE, **kwargs) -> None:
+        if self.windows:
+            self.send(self.windows[0].action_event(action, type, **kwargs))
 
 class WindowManager(Dict[str, SWFWindow]):
     """
@@ -170,14 +352,9 @@ class WindowManager(Dict[str, SWFWindow]):
         )
 
     def wait_for_window(self, window: SWFWindow, loaded: bool = True, timeout: int = 8):
-        start_time = time.time()
-
-        while window.loaded != loaded:
-            if self.client.disconnected:
-                return
-
-            if time.time() - start_time > timeout:
-                self.logger.warning(f'Window Timeout: {window.name}')
-                return
+        if not window.wait(loaded, timeout):
+            self.client.logger.warning(f'Window Timeout: {window.name}')
 
-            time.sleep(0.05)
+    def notify(self) -> None:
+        for window in list(self.values()):
+            window.notify()
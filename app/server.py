@@ -7,9 +7,12 @@ from threading import Thread
 from app.engine.place import SnowLobby, SnowBattle, TuskBattle
 from app.protocols.metaplace import MetaplaceWorldServer
 from app.engine.matchmaking import MatchmakingQueue
+from app.engine.cluster import Cluster, RedisBackend
+from app.engine.shards import ShardManager
 from app.data import ServerType, BuildType
 from app.engine.penguin import Penguin
 from app.objects import Games
+from app.data import catalog
 
 import app.session
 import logging
@@ -35,6 +38,7 @@ class SnowflakeWorld(MetaplaceWorldServer):
 
         self.matchmaking = MatchmakingQueue()
         self.games = Games()
+        self.shards = ShardManager(self)
 
         self.logger = logging.getLogger("Snowflake")
         self.threads: List[Thread] = []
@@ -44,14 +48,28 @@ class SnowflakeWorld(MetaplaceWorldServer):
         self.assets = app.session.assets
 
     def runThread(self, func: Callable, *args, **kwargs):
+        # Forget about threads that have already finished
+        self.threads = [thread for thread in self.threads if thread.is_alive()]
+
         thread = Thread(target=func, args=args, kwargs=kwargs)
         thread.start()
         self.threads.append(thread)
 
     def startFactory(self):
+        app.session.writer.start()
+        catalog.reload()
         self.register_place(SnowLobby())
         self.register_place(SnowBattle())
         self.register_place(TuskBattle())
+        self.matchmaking.start()
+
+        if config.SHARD_WORKERS > 0:
+            self.shards.start(config.SHARD_WORKERS)
+
+        if config.ENABLE_CLUSTER_MATCHMAKING:
+            backend = RedisBackend(app.session.redis)
+            self.matchmaking.cluster = Cluster(self, backend, config.NODE_ID)
+            self.matchmaking.cluster.start()
 
     def stopFactory(self):
         def force_exit(signal, frame):
@@ -59,6 +77,14 @@ class SnowflakeWorld(MetaplaceWorldServer):
             os._exit(0)
 
         signal.signal(signal.SIGINT, force_exit)
+        self.matchmaking.stop()
+        self.shards.stop()
+
+        if self.matchmaking.cluster:
+            self.matchmaking.cluster.stop()
 
         for thread in self.threads:
             thread.join()
+
+        # Write the rewards of the last games
+        app.session.writer.stop()
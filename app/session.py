@@ -2,6 +2,8 @@
 from app.events import EventHandler, FrameworkHandler
 from app.objects import AssetCollection
 from app.data.postgres import Postgres
+from app.data.tokens import SessionTokens
+from app.data.writer import WriteBehind
 from redis import Redis
 
 import config
@@ -26,3 +28,6 @@ redis = Redis(
     config.REDIS_DB,
     config.REDIS_PASSWORD
 )
+
+tokens = SessionTokens(redis)
+writer = WriteBehind(database, config.WRITE_JOURNAL)
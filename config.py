@@ -2,6 +2,7 @@
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 
+import socket
 import os
 
 load_dotenv(override=True)
@@ -31,9 +32,16 @@ try:
     MEDIA_DOMAIN = urlparse(MEDIA_LOCATION).hostname
 
     MATCHMAKING_TIMEOUT = int(os.environ.get('MATCHMAKING_TIMEOUT', '30'))
+    MATCHMAKING_RANK_WINDOW = int(os.environ.get('MATCHMAKING_RANK_WINDOW', '3'))
     ALLOW_FORCESTART_SNOW = os.environ.get('ALLOW_FORCESTART_SNOW', 'False').lower() == 'true'
     ALLOW_FORCESTART_TUSK = os.environ.get('ALLOW_FORCESTART_TUSK', 'True').lower() == 'true'
 
+    SHARD_WORKERS = int(os.environ.get('SHARD_WORKERS', '0'))
+    ENABLE_CLUSTER_MATCHMAKING = os.environ.get('ENABLE_CLUSTER_MATCHMAKING', 'False').lower() == 'true'
+    NODE_ID = os.environ.get('NODE_ID') or f'{socket.gethostname()}-{os.getpid()}'
+    WRITE_JOURNAL = os.environ.get('WRITE_JOURNAL', 'writes.journal')
+    CATALOG_TTL = int(os.environ.get('CATALOG_TTL', '3600'))
+
     POLICY_DOMAIN = os.environ.get('POLICY_DOMAIN', '*')
     POLICY_PORT = os.environ.get('POLICY_PORT', '*')
     ENABLE_POLICY_SERVER = os.environ.get('ENABLE_POLICY_SERVER', 'False').lower() == 'true'
@@ -24,6 +24,13 @@ def on_shutdown(*args):
     for player in world_server.players:
         player.send_to_room()
 
+    for game in world_server.games:
+        # Wake up games that are waiting for their players
+        game.notify()
+
+    # Let the worker processes finish their games
+    world_server.shards.stop()
+
     reactor.callLater(0.1, reactor.stop)  # type: ignore
 
 def main():
@@ -0,0 +1,16 @@
+from app.engine.shards import run_worker
+from app.logging import Console
+
+import logging
+import config
+import sys
+
+logging.basicConfig(
+    handlers=[Console],
+    level=logging.DEBUG if config.ENABLE_DEBUG_LOGGING else logging.INFO
+)
+
+if __name__ == "__main__":
+    # Worker processes are spawned by the main process,
+    # when "SHARD_WORKERS" is set in the configuration
+    run_worker(sys.argv[1], int(sys.argv[2]))
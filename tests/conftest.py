@@ -0,0 +1,23 @@
+import sqlalchemy
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The tests don't need a database server, but config.py expects credentials
+TEST_ENVIRONMENT = {
+    'POSTGRES_USER': 'snowflake',
+    'POSTGRES_PASSWORD': 'snowflake',
+    'POSTGRES_DBNAME': 'snowflake',
+    'POSTGRES_HOST': 'localhost',
+    'POSTGRES_PORT': '5432'
+}
+
+for key, value in TEST_ENVIRONMENT.items():
+    os.environ.setdefault(key, value)
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Connections are only opened lazily, except for the tables that get created on import
+sqlalchemy.MetaData.create_all = lambda *args, **kwargs: None
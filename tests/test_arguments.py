@@ -0,0 +1,13 @@
+from app.arguments import string
+
+import pytest
+
+def test_string() -> None:
+    assert string('snowflake') == 'snowflake'
+    assert string('"snow flake"') == 'snow flake'
+    assert string("'snow\\nflake'") == 'snow\nflake'
+
+@pytest.mark.parametrize('value', ['"abc', '"a", 1', "'a' + 'b'", '"""'])
+def test_invalid_string(value: str) -> None:
+    with pytest.raises(ValueError):
+        string(value)
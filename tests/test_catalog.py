@@ -0,0 +1,29 @@
+from app.data.catalog import CatalogTable
+from app.data import Card
+
+class Row:
+    def __init__(self, id: int, element: str) -> None:
+        self.id = id
+        self.element = element
+
+class Query:
+    def __init__(self, rows) -> None:
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+class Session:
+    def __init__(self, rows) -> None:
+        self.rows = rows
+
+    def query(self, model):
+        return Query(self.rows)
+
+def test_filter_after_reload() -> None:
+    table = CatalogTable(Card, ttl=60)
+    table.load(Session([Row(1, 'fire'), Row(2, 'snow')]))
+    assert [row.id for row in table.filter('element', 'fire')] == [1]
+
+    table.load(Session([Row(3, 'fire')]))
+    assert [row.id for row in table.filter('element', 'fire')] == [3]
@@ -0,0 +1,101 @@
+from twisted.internet.testing import StringTransport
+from twisted.internet.defer import Deferred
+from twisted.internet.address import IPv4Address
+from twisted.internet import reactor
+from typing import Any, List
+
+from app.engine.cluster import Cluster, MemoryBackend
+from app.engine.penguin import Penguin
+from app.server import SnowflakeWorld
+from app.data import objects
+
+import time
+
+def process_messages() -> None:
+    # Messages are delivered through reactor.callFromThread
+    while reactor.threadCallQueue:
+        reactor.runUntilCurrent()
+
+def test_relay_round_trip() -> None:
+    backend = MemoryBackend()
+    host = Cluster(SnowflakeWorld(), backend, 'a')
+    node = Cluster(SnowflakeWorld(), backend, 'b')
+    host.start()
+    node.start()
+
+    disconnected: List[int] = []
+    players = host.remote_players('b')
+    players.on_disconnect = lambda client: disconnected.append(client)
+
+    # Player is not queued on node "b", so it will reject the attach
+    players.send_message('attach', client=1, pid=5)
+    process_messages()
+
+    assert 'a' in node.hosts
+    assert disconnected == [1]
+
+def test_attach_queued_player() -> None:
+    backend = MemoryBackend()
+    host = Cluster(SnowflakeWorld(), backend, 'a')
+    node = Cluster(SnowflakeWorld(), backend, 'b')
+    host.start()
+    node.start()
+
+    player = Penguin(node.server, IPv4Address('TCP', '127.0.0.1', 0))
+    player.pid = 5
+    node.server.matchmaking.players.add(player)
+
+    players = host.remote_players('b')
+    players.send_message('attach', client=1, pid=5)
+    process_messages()
+
+    assert player.shard is node.hosts['a']
+    assert player.relay_id == 1
+    assert player not in node.server.matchmaking.players
+
+    # Traffic of the host is written to the player's connection
+    player.transport = StringTransport()
+    players.send_message('write', client=1, data='[S_VERSION]|1|')
+    process_messages()
+
+    assert player.transport.value() == b'[S_VERSION]|1|'
+
+def queued_player(server: SnowflakeWorld, pid: int, element: str, rank: int) -> Penguin:
+    player = Penguin(server, IPv4Address('TCP', '127.0.0.1', 0))
+    player.object = objects.Penguin(id=pid, snow_ninja_rank=rank)
+    player.pid = pid
+    player.name = f'Player {pid}'
+    player.element = element
+    player.battle_mode = 0
+    server.matchmaking.players.add(player)
+    return player
+
+def wait_for(deferred: Deferred) -> Any:
+    results = []
+    deferred.addBoth(results.append)
+
+    while not results:
+        # Results of the cluster thread are delivered through reactor.callFromThread
+        process_messages()
+        time.sleep(0.01)
+
+    return results[0]
+
+def test_claim_off_reactor() -> None:
+    cluster = Cluster(SnowflakeWorld(), MemoryBackend(), 'a')
+    cluster.start()
+
+    fire = queued_player(cluster.server, 1, 'fire', 5)
+    snow = queued_player(cluster.server, 2, 'snow', 6)
+    water = queued_player(cluster.server, 3, 'water', 4)
+
+    for player in (fire, snow, water):
+        wait_for(cluster.push(player))
+
+    assert wait_for(cluster.claim(fire, 2)) == [fire, snow, water]
+
+    # Claimed players are no longer in the shared queue
+    assert wait_for(cluster.withdraw(snow)) is False
+    assert wait_for(cluster.claim(water, 24)) is None
+
+    cluster.stop()
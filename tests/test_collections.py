@@ -0,0 +1,37 @@
+from app.objects.collections import Players
+
+class Player:
+    def __init__(self, pid: int = 0, token: str = '') -> None:
+        self.pid = pid
+        self.token = token
+        self.element = ''
+        self.battle_mode = 0
+
+def test_unset_keys_are_not_indexed() -> None:
+    players = Players()
+    connections = [Player() for _ in range(3)]
+
+    for connection in connections:
+        players.add(connection)
+
+    assert players.pids == {}
+    assert players.tokens == {}
+
+    connections[0].pid, connections[0].token = 1, 'token'
+    players.reindex(connections[0])
+
+    assert players.by_id(1) is connections[0]
+    assert players.by_token('token') is connections[0]
+
+    players.remove(connections[0])
+    assert players.by_id(1) is None
+    assert len(players) == 2
+
+def test_with_element() -> None:
+    players = Players()
+    player = Player(1)
+    players.add(player)
+
+    # Elements are selected after the player was added
+    player.element = 'fire'
+    assert players.with_element('fire') == [player]
@@ -0,0 +1,33 @@
+from twisted.internet import reactor
+
+from app.engine.tusk import TuskGame
+from app.engine.game import Game
+from app.engine.ai import PenguinAI
+from app.engine.cards import Deck
+from app.server import SnowflakeWorld
+from app.data import objects
+
+import pytest
+
+@pytest.mark.parametrize('battle_mode, game_class', [(0, Game), (1, TuskGame)])
+def test_load_players(monkeypatch, battle_mode: int, game_class: type) -> None:
+    server = SnowflakeWorld()
+    threads = []
+
+    # Players are loaded in the background, and the game loop runs in its own thread
+    monkeypatch.setattr(reactor, 'callInThread', lambda func, *args: func(*args))
+    monkeypatch.setattr(server, 'runThread', lambda func, *args: threads.append(args))
+
+    players = [
+        PenguinAI(server, element, battle_mode, objects.Penguin(id=index, nickname=element))
+        for index, element in enumerate(('fire', 'snow', 'water'), start=1)
+    ]
+    server.matchmaking.create_game(battle_mode, *players)
+
+    (game,), = threads
+    assert type(game) is game_class
+
+    game.initialize_players()
+
+    for player in players:
+        assert isinstance(player.power_cards, Deck)
@@ -0,0 +1,47 @@
+from app.objects import GameObject
+from app.engine.grid import Grid
+from threading import Thread
+
+class GameStub:
+    def __init__(self) -> None:
+        self.objects = set()
+        self.rocks = []
+
+def test_objects_snapshot() -> None:
+    game = GameStub()
+    grid = Grid(9, 5, game)
+    obj = GameObject(game, 'rock', 0, 0, grid=False)
+    grid[0, 0] = obj
+
+    objects = grid.objects
+    grid.remove(obj)
+
+    assert objects == (obj,)
+    assert grid.objects == ()
+    assert grid.can_move(0, 0)
+
+def test_concurrent_moves() -> None:
+    game = GameStub()
+    grid = Grid(9, 5, game)
+    columns = [
+        [GameObject(game, 'rock', x, y, grid=False) for y in grid.y_range]
+        for x in grid.x_range
+    ]
+
+    def move(objects) -> None:
+        for _ in range(200):
+            for obj in objects:
+                grid.move(obj, obj.x, obj.y)
+            for obj in objects:
+                grid.remove(obj)
+
+    threads = [Thread(target=move, args=(objects,)) for objects in columns]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert grid.occupied == 0
+    assert grid.objects == ()
@@ -0,0 +1,26 @@
+import subprocess
+import pytest
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRELUDE = 'import sqlalchemy; sqlalchemy.MetaData.create_all = lambda *args, **kwargs: None; '
+
+@pytest.mark.parametrize('module', [
+    'main',
+    'shard',
+    'app.objects',
+    'app.protocols',
+    'app.engine.simulation',
+    'app.engine.cluster'
+])
+def test_import(module: str) -> None:
+    # Every module is imported by a fresh interpreter, so that import cycles can't be hidden by other tests
+    result = subprocess.run(
+        [sys.executable, '-c', PRELUDE + f'import {module}'],
+        capture_output=True,
+        text=True,
+        cwd=ROOT
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,46 @@
+from twisted.internet.testing import StringTransport
+from twisted.internet.address import IPv4Address
+
+from app.handlers.login import finish_login
+from app.engine.penguin import Penguin
+from app.server import SnowflakeWorld
+from app.data import objects
+from app import session
+
+import config
+import time
+
+def connected_player(server: SnowflakeWorld) -> Penguin:
+    player = Penguin(server, IPv4Address('TCP', '127.0.0.1', 0))
+    player.makeConnection(StringTransport())
+    server.players.add(player)
+    return player
+
+def test_invalid_token_keeps_existing_session(monkeypatch) -> None:
+    monkeypatch.setattr(config, 'DISABLE_AUTHENTICATION', False)
+    server = SnowflakeWorld()
+
+    existing = connected_player(server)
+    existing.pid = 1
+    server.players.reindex(existing)
+
+    client = connected_player(server)
+    session.tokens.cache[1] = ('token', time.time() + 60)
+    penguin = objects.Penguin(id=1, nickname='Penguin', approval_en=True, rejection_en=False)
+
+    finish_login(client, 1, 'invalid', penguin, 'token')
+
+    assert client.disconnected
+    assert not existing.disconnected
+    assert 1 not in session.tokens.cache
+
+def test_unused_token_is_not_cached() -> None:
+    server = SnowflakeWorld()
+    client = connected_player(server)
+    session.tokens.cache[1] = ('token', time.time() + 60)
+
+    # Penguin was not found, so the token was never checked
+    finish_login(client, 1, 'token', None, 'token')
+
+    assert client.disconnected
+    assert 1 not in session.tokens.cache
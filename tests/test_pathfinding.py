@@ -0,0 +1,29 @@
+from app.objects.gameobject import GameObject
+from app.objects.enemies import Scrap
+from app.engine.ai import PenguinAI
+from app.engine.game import Game
+from app.server import SnowflakeWorld
+from app.data import objects
+
+def create_game() -> Game:
+    server = SnowflakeWorld()
+    players = [
+        PenguinAI(server, element, 0, objects.Penguin(id=index, nickname=element))
+        for index, element in enumerate(('fire', 'snow', 'water'), start=1)
+    ]
+    return Game(*players)
+
+def test_enemy_moves_around_rocks() -> None:
+    game = create_game()
+    game.grid.initialize_tiles()
+    game.rocks = [GameObject(game, 'rock', x, y, grid=True) for x, y in ((4, 1), (5, 2))]
+    game.grid.update_obstacles()
+
+    scrap = Scrap(game, 4, 2)
+    tiles = {(tile.x, tile.y) for tile in scrap.movable_tiles()}
+
+    # Both neighbours towards the tile are blocked, so it can't be reached in two steps
+    assert (5, 1) not in tiles
+    assert (3, 1) in tiles
+    assert (4, 3) in tiles
+    assert game.pathfinder.walking_distance((4, 2), (5, 1)) == 6
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from app.engine.shards import ShardManager, penguin_state, encode_json
+from app.data.objects import Penguin as PenguinObject
+from app.server import SnowflakeWorld
+
+import stat
+import os
+
+def test_penguin_state() -> None:
+    penguin = PenguinObject(
+        id=1,
+        username='snowflake',
+        nickname='Snowflake',
+        password='$2b$12$secret',
+        snow_ninja_rank=4,
+        registration_date=datetime.now()
+    )
+    state = penguin_state(penguin)
+
+    assert 'password' not in state
+    assert 'registration_date' not in state
+    encode_json(state)
+
+    # Workers rebuild the penguin, without querying the database
+    restored = PenguinObject(**state)
+    assert restored.nickname == 'Snowflake'
+    assert restored.snow_ninja_rank == 4
+
+def test_private_socket() -> None:
+    manager = ShardManager(SnowflakeWorld())
+    manager.start(0)
+
+    try:
+        assert stat.S_IMODE(os.stat(manager.socket_directory).st_mode) == 0o700
+        assert stat.S_IMODE(os.stat(manager.socket_path).st_mode) == 0o600
+    finally:
+        manager.stop()
+
+    assert not os.path.exists(manager.socket_directory)
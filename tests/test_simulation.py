@@ -0,0 +1,15 @@
+from app.engine.simulation import create_server, simulate
+
+import random
+
+def test_outcomes() -> None:
+    random.seed(1)
+    server = create_server()
+    results = [simulate(server) for _ in range(20)]
+
+    for result in results:
+        if result.won:
+            # Every round has to be cleared to win
+            assert result.round >= 2
+
+    assert not all(result.won for result in results)
@@ -0,0 +1,16 @@
+from app.data.tokens import SessionTokens
+
+import time
+
+def test_invalidated_token_is_fetched_again() -> None:
+    tokens = SessionTokens(redis=None)
+    tokens.cache[1] = ('token', time.time() + 60)
+
+    assert tokens.fetch(1, expected='token').called
+
+    tokens.invalidate(1)
+    deferred = tokens.fetch(1, expected='token')
+
+    assert not deferred.called
+    assert tokens.pending[1] == [deferred]
+    tokens.flush_call.cancel()
@@ -0,0 +1,34 @@
+from twisted.internet.testing import StringTransport
+from twisted.internet.address import IPv4Address
+
+from app.protocols.metaplace import WindowBroadcast
+from app.engine.penguin import Penguin
+from app.server import SnowflakeWorld
+
+def connected_player(server: SnowflakeWorld) -> Penguin:
+    player = Penguin(server, IPv4Address('TCP', '127.0.0.1', 0))
+    player.makeConnection(StringTransport())
+    return player
+
+def test_broadcast_states() -> None:
+    server = SnowflakeWorld()
+    players = [connected_player(server) for _ in range(2)]
+    windows = [player.get_window('cardjitsu_snowui.swf') for player in players]
+    broadcast = WindowBroadcast(windows)
+
+    state = broadcast.load(per_client=lambda client: {})
+    assert len(state.states) == 2
+    assert not state.done
+
+    windows[0].loaded = True
+    assert not state.wait(timeout=0)
+
+    windows[1].loaded = True
+    assert state.done
+
+    state = broadcast.close()
+    assert not state.done
+
+    windows[0].loaded = False
+    players[1].disconnected = True
+    assert state.wait(timeout=0)
@@ -0,0 +1,141 @@
+from typing import List, Set
+
+from app.data.writer import Entry, WriteBehind
+
+import app.data.writer
+import pytest
+import json
+import time
+
+class Session:
+    def commit(self) -> None: ...
+    def rollback(self) -> None: ...
+    def close(self) -> None: ...
+
+class Database:
+    @property
+    def session(self) -> Session:
+        return Session()
+
+class RecordingWriter(WriteBehind):
+    """Records the batches, instead of writing them to a database"""
+
+    def __init__(self, journal_path: str, recorded: Set[str] | None = None) -> None:
+        super().__init__(Database(), journal_path, interval=0, retries=1)
+        self.batches: List[List[Entry]] = []
+        self.recorded = recorded if recorded is not None else set()
+        self.fail = False
+
+    def applied(self, session: Session, ids: List[str]) -> Set[str]:
+        return self.recorded.intersection(ids)
+
+    def record(self, session: Session, ids: List[str]) -> None:
+        self.recorded.update(ids)
+
+    def forget(self, ids: List[str]) -> None:
+        self.recorded.difference_update(ids)
+
+    def apply(self, session: Session, batch: List[Entry]) -> None:
+        if self.fail:
+            raise ConnectionError('Database is unavailable')
+
+        self.batches.append(batch)
+
+def read_journal(path) -> List[list]:
+    with open(path, 'r', encoding='utf-8') as journal:
+        return [json.loads(line) for line in journal if line.strip()]
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(app.data.writer.time, 'sleep', lambda seconds: None)
+
+def test_written_entries_are_not_replayed(tmp_path) -> None:
+    journal_path = tmp_path / 'journal'
+
+    writer = RecordingWriter(str(journal_path))
+    writer.start()
+    writer.increment_penguin(1, {'coins': 50})
+    writer.add_stamp(1, 472)
+    writer.stop()
+
+    assert sum(len(batch) for batch in writer.batches) == 2
+    assert read_journal(journal_path) == []
+    assert writer.recorded == set()
+
+    restarted = RecordingWriter(str(journal_path))
+    restarted.start()
+    restarted.stop()
+
+    assert restarted.batches == []
+
+def test_applied_increments_are_skipped(tmp_path) -> None:
+    journal_path = tmp_path / 'journal'
+
+    # The server stopped after the batch was committed, but before the journal was compacted
+    journal_path.write_text(
+        json.dumps(['a', 'increment', 1, {'coins': 50}]) + '\n' +
+        json.dumps(['b', 'stamp', 1, 472]) + '\n'
+    )
+
+    restarted = RecordingWriter(str(journal_path), recorded={'a'})
+    restarted.start()
+    restarted.stop()
+
+    assert restarted.batches == [[('stamp', 1, 472)]]
+    assert read_journal(journal_path) == []
+
+def test_failed_entries_are_replayed(tmp_path) -> None:
+    journal_path = tmp_path / 'journal'
+
+    writer = RecordingWriter(str(journal_path))
+    writer.fail = True
+    writer.start()
+    writer.increment_penguin(1, {'coins': 50})
+    writer.stop()
+
+    # Entries are kept, but don't block the journal from being compacted
+    assert [entry[1:] for entry in read_journal(journal_path)] == [['increment', 1, {'coins': 50}]]
+
+    restarted = RecordingWriter(str(journal_path))
+    restarted.start()
+    restarted.add_item(1, 3160)
+    restarted.stop()
+
+    assert [entry for batch in restarted.batches for entry in batch] == [
+        ('increment', 1, {'coins': 50}),
+        ('item', 1, 3160)
+    ]
+    assert read_journal(journal_path) == []
+
+def test_failed_entries_are_retried(tmp_path) -> None:
+    writer = RecordingWriter(str(tmp_path / 'journal'))
+    writer.fail = True
+    writer.start()
+    writer.increment_penguin(1, {'coins': 50})
+
+    deadline = time.monotonic() + 5
+
+    while not writer.failed and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # The next batch includes the entries, that have failed before
+    writer.fail = False
+    writer.add_item(1, 3160)
+    writer.stop()
+
+    assert [entry for batch in writer.batches for entry in batch] == [
+        ('increment', 1, {'coins': 50}),
+        ('item', 1, 3160)
+    ]
+    assert writer.failed == {}
+
+def test_no_backoff_after_last_attempt(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    sleeps = []
+    monkeypatch.setattr(app.data.writer.time, 'sleep', sleeps.append)
+
+    writer = RecordingWriter(str(tmp_path / 'journal'))
+    writer.retries = 3
+    writer.fail = True
+    writer.commit([('a', ('stamp', 1, 472))])
+
+    assert sleeps == [2, 4]